@@ -1,14 +1,22 @@
+import atexit
 import os
 import logging
+import time
 from flask import Flask
 from .config import config
+from .data.bootstrap import bootstrap_database, check_schema_version
 from .data.models import db
-from sqlalchemy import text
+from .data.newsletters import newsletter_registry
+from .data.pool_metrics import init_pool_metrics
 
 logger = logging.getLogger(__name__)
 
 
+BOOT_STATS_KEY = "boot_stats"
+
+
 def create_app(config_name: str | None = None) -> Flask:
+    boot_start = time.perf_counter()
     if config_name is None:
         config_name = os.environ.get("FLASK_ENV", "development")
 
@@ -21,25 +29,19 @@ def create_app(config_name: str | None = None) -> Flask:
     app.config.from_object(config[config_name]())
 
     db.init_app(app)
+    init_pool_metrics(app)
+    newsletter_registry.configure(app.config["NEWSLETTER_STORAGE"])
 
+    schema_start = time.perf_counter()
     with app.app_context():
-        try:
-            from .data.models import User, Subscriber
-            
-            db.create_all()
-            logger.info("Database tables created successfully")
-        except Exception as e:
-            logger.warning(f"Could not create database tables: {e}")
-        
-        try:
-            _run_migration()
-        except Exception as e:
-            logger.warning(f"Migration failed: {e}")
-        
-        try:
-            _ensure_admin_user()
-        except Exception as e:
-            logger.warning(f"Admin user setup failed: {e}")
+        if app.config["FAST_BOOT"] and not _is_in_memory_db(app):
+            check_schema_version()
+        else:
+            try:
+                bootstrap_database()
+            except Exception as e:
+                logger.warning(f"Database bootstrap failed: {e}")
+    schema_ms = (time.perf_counter() - schema_start) * 1000
 
     from .presentation.routes.public import bp as public_bp
     app.register_blueprint(public_bp)
@@ -47,62 +49,53 @@ def create_app(config_name: str | None = None) -> Flask:
     from app.presentation.routes.admin import admin_bp
     app.register_blueprint(admin_bp)
 
+    from .presentation.cli import register_commands
+    register_commands(app)
+
+    from .business.services.result_cache import init_result_cache
+    init_result_cache(app)
+
+    from .presentation.asset_pipeline import init_assets
+    init_assets(app)
+
+    from .presentation.fragment_cache import init_template_caches
+    init_template_caches(app)
+
+    from .presentation.rate_limit import init_rate_limiter
+    init_rate_limiter(app)
+
+    from .data.async_db import init_async_db
+    init_async_db(app)
+
+    from .data.email_filter import init_email_filter
+    # In-memory SQLite is one connection shared by all threads; build inline
+    init_email_filter(app, background=not _is_in_memory_db(app))
+
+    from .business.services.subscription_queue import init_subscription_queue
+    subscription_queue = init_subscription_queue(app)
+    if subscription_queue is not None:
+        atexit.register(subscription_queue.stop)
+
+    from .presentation.page_cache import init_page_cache
+    # Last, since prerendering runs requests through everything above
+    init_page_cache(app)
+
+    from .presentation.compression import init_compression
+    # Outermost, so it sees every response; cached pages come already gzipped
+    init_compression(app)
+
+    boot_ms = (time.perf_counter() - boot_start) * 1000
+    app.extensions[BOOT_STATS_KEY] = {
+        "boot_ms": round(boot_ms, 1),
+        "schema_ms": round(schema_ms, 1),
+        "fast_boot": app.config["FAST_BOOT"],
+        "pid": os.getpid(),
+    }
+    logger.info(f"App booted in {boot_ms:.1f} ms (schema {schema_ms:.1f} ms, fast_boot={app.config['FAST_BOOT']})")
+
     return app
 
 
-def _run_migration():
-    """Run database migration to add missing columns."""
-    try:
-        result = db.session.execute(text("""
-            SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME = 'subscribers'
-            ORDER BY ORDINAL_POSITION
-        """))
-        columns = [row[0] for row in result]
-        
-        for col in ['nl_kost', 'nl_mindset', 'nl_kunskap', 'nl_veckans_pass', 'nl_jaine']:
-            if col not in columns:
-                logger.info(f"Adding missing column: {col}")
-                try:
-                    db.session.execute(text(f'ALTER TABLE subscribers ADD {col} BIT NOT NULL DEFAULT 0'))
-                    db.session.commit()
-                    logger.info(f"Successfully added column: {col}")
-                except Exception as e:
-                    db.session.rollback()
-                    logger.warning(f"Failed to add column {col}: {e}")
-    except Exception as e:
-        logger.warning(f"Migration check failed: {e}")
-
-
-def _ensure_admin_user():
-    """Ensure default admin user exists."""
-    from .data.models import User
-    import logging
-    
-    admin_username = os.environ.get("ADMIN_USERNAME", "admin")
-    admin_password = os.environ.get("ADMIN_PASSWORD", "admin123")
-    
-    try:
-        result = db.session.execute(text("""
-            SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES 
-            WHERE TABLE_NAME = 'users'
-        """))
-        table_exists = result.fetchone() is not None
-        logging.warning(f"Users table exists: {table_exists}")
-    except Exception as e:
-        logging.warning(f"Could not check users table: {e}")
-    
-    try:
-        existing_user = User.query.filter_by(username=admin_username).first()
-        if existing_user:
-            logging.warning(f"Admin user already exists: {admin_username}")
-            return
-        
-        admin_user = User(username=admin_username)
-        admin_user.set_password(admin_password)
-        db.session.add(admin_user)
-        db.session.commit()
-        logging.warning(f"Created default admin user: {admin_username}")
-    except Exception as e:
-        db.session.rollback()
-        logging.error(f"Failed to create admin user: {e}")
+def _is_in_memory_db(app: Flask) -> bool:
+    # Each process has its own in-memory database, so it always needs bootstrapping.
+    return app.config["SQLALCHEMY_DATABASE_URI"] == "sqlite:///:memory:"
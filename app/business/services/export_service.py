@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from typing import Iterator
+
+from app.data.repositories.subscriber_repository import SubscriberRepository
+
+EXPORT_FORMATS = ("csv", "ndjson", "outlook")
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "outlook": "text/plain",
+}
+EXPORT_EXTENSIONS = {
+    "csv": "csv",
+    "ndjson": "ndjson",
+    "outlook": "txt",
+}
+CSV_HEADER = ["email", "name", "subscribed_at", "newsletters"]
+
+# Rows are buffered into chunks of roughly this many bytes before yielding.
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+
+class ExportService:
+    """Streams subscribers as CSV, NDJSON or an Outlook '; '-joined list.
+
+    Rows come from a server-side cursor and are yielded as encoded chunks,
+    so memory stays flat regardless of list size. The CSV output uses the
+    same columns the importer reads.
+    """
+
+    def __init__(self, repository: SubscriberRepository | None = None):
+        self._repository = repository or SubscriberRepository()
+
+    def iter_export(
+        self,
+        fmt: str = "csv",
+        sort_by: str = "date_desc",
+        newsletter_filter: str | None = None,
+    ) -> Iterator[bytes]:
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        subscribers = self._repository.iter_all(sort_by, newsletter_filter)
+        buffer = io.StringIO()
+        write_row = self._row_writer(fmt, buffer)
+        for subscriber in subscribers:
+            write_row(subscriber)
+            if buffer.tell() >= EXPORT_BUFFER_SIZE:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    def _row_writer(self, fmt: str, buffer: io.StringIO):
+        if fmt == "csv":
+            writer = csv.writer(buffer)
+            writer.writerow(CSV_HEADER)
+            return lambda s: writer.writerow([
+                s.email,
+                s.name,
+                s.subscribed_at.isoformat() if s.subscribed_at else "",
+                ";".join(s.get_newsletters()),
+            ])
+
+        if fmt == "ndjson":
+            def write_json(s):
+                buffer.write(json.dumps({
+                    "id": s.id,
+                    "email": s.email,
+                    "name": s.name,
+                    "subscribed_at": s.subscribed_at.isoformat() if s.subscribed_at else None,
+                    "newsletters": s.get_newsletters(),
+                }, ensure_ascii=False))
+                buffer.write("\n")
+            return write_json
+
+        first = True
+
+        def write_outlook(s):
+            nonlocal first
+            if not first:
+                buffer.write("; ")
+            buffer.write(s.email)
+            first = False
+        return write_outlook
@@ -0,0 +1,201 @@
+import csv
+import io
+import json
+import re
+from dataclasses import dataclass, field
+from typing import IO, Callable, Iterable, Iterator
+
+from app.business.services.subscription_service import SubscriptionService
+from app.data.newsletters import newsletter_registry
+from app.data.repositories.subscriber_repository import DuplicateEmailError, SubscriberRepository
+
+IMPORT_FORMATS = ("csv", "ndjson")
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_MAX_ERRORS = 1000
+
+_TRUTHY = {"1", "true", "yes", "y", "x", "on"}
+_LIST_SEPARATORS = re.compile(r"[;,|\s]+")
+
+# (line number, row data, parse error)
+ParsedRow = tuple[int, dict, str]
+
+
+@dataclass
+class ImportRowError:
+    line: int
+    email: str
+    error: str
+
+
+@dataclass
+class ImportResult:
+    total: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+    errors_truncated: bool = False
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "imported": self.imported,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "errors": [vars(e) for e in self.errors],
+            "errors_truncated": self.errors_truncated,
+        }
+
+
+def detect_format(filename: str | None, default: str = "csv") -> str:
+    """Guess the import format from a file name extension."""
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl", ".json")):
+        return "ndjson"
+    if name.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def iter_rows(stream: IO[bytes], fmt: str) -> Iterator[ParsedRow]:
+    """Yield rows from a binary CSV or NDJSON stream without reading it whole."""
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row, ""
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, {}, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, {}, "Expected a JSON object"
+            continue
+        yield line_number, row, ""
+
+
+def row_newsletters(row: dict) -> dict[str, bool]:
+    """Read newsletters from a ``newsletters`` list/dict/string or per-key columns."""
+    selected: dict[str, bool] = {}
+    value = row.get("newsletters")
+    if isinstance(value, dict):
+        selected.update({key: _truthy(v) for key, v in value.items()})
+    elif isinstance(value, list):
+        selected.update({str(key): True for key in value})
+    elif isinstance(value, str):
+        selected.update({key: True for key in _LIST_SEPARATORS.split(value) if key})
+
+    for key in newsletter_registry.keys():
+        for column in (f"nl_{key}", key):
+            if column in row:
+                selected[key] = _truthy(row[column])
+    return selected
+
+
+def _truthy(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _TRUTHY
+    return bool(value)
+
+
+def _text(value) -> str:
+    return "" if value is None else str(value)
+
+
+class ImportService:
+    """Bulk subscriber import that streams rows and inserts them in batches.
+
+    Memory is bounded by the batch size: within-batch duplicates are caught
+    with a dict, and duplicates across batches are caught by the database
+    check because earlier batches are already committed.
+    """
+
+    def __init__(
+        self,
+        repository: SubscriberRepository | None = None,
+        subscription_service: SubscriptionService | None = None,
+    ):
+        self._repository = repository or SubscriberRepository()
+        self._subscription_service = subscription_service or SubscriptionService(self._repository)
+
+    def import_stream(self, stream: IO[bytes], fmt: str, **kwargs) -> ImportResult:
+        return self.import_rows(iter_rows(stream, fmt), **kwargs)
+
+    def import_rows(
+        self,
+        rows: Iterable[ParsedRow],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_errors: int = DEFAULT_MAX_ERRORS,
+        on_error: Callable[[ImportRowError], None] | None = None,
+    ) -> ImportResult:
+        """Validate, de-duplicate and insert rows; commits once per batch.
+
+        ``result.errors`` keeps at most ``max_errors`` entries; pass
+        ``on_error`` to receive every error, e.g. to write a full report.
+        """
+        result = ImportResult()
+
+        def report(line: int, email: str, error: str, duplicate: bool = False) -> None:
+            if duplicate:
+                result.duplicates += 1
+            else:
+                result.invalid += 1
+            row_error = ImportRowError(line=line, email=email, error=error)
+            if on_error is not None:
+                on_error(row_error)
+            if len(result.errors) < max_errors:
+                result.errors.append(row_error)
+            else:
+                result.errors_truncated = True
+
+        batch: dict[str, tuple[int, str, dict[str, bool]]] = {}
+        for line, row, parse_error in rows:
+            result.total += 1
+            raw_email = _text(row.get("email"))
+            if parse_error:
+                report(line, raw_email, parse_error)
+                continue
+
+            error, email, name = self._subscription_service.prepare_signup(raw_email, _text(row.get("name")))
+            if error:
+                report(line, raw_email, error)
+                continue
+            if email in batch:
+                report(line, email, "Duplicate email in file", duplicate=True)
+                continue
+
+            batch[email] = (line, name, row_newsletters(row))
+            if len(batch) >= batch_size:
+                self._flush(batch, result, report)
+                batch = {}
+
+        self._flush(batch, result, report)
+        return result
+
+    def _flush(self, batch: dict, result: ImportResult, report: Callable) -> None:
+        if not batch:
+            return
+        existing = self._repository.existing_emails(list(batch))
+        for email in sorted(existing, key=lambda e: batch[e][0]):
+            report(batch[email][0], email, "Email already subscribed", duplicate=True)
+
+        rows = [(email, name, newsletters) for email, (_, name, newsletters) in batch.items() if email not in existing]
+        try:
+            result.imported += self._repository.save_many(rows)
+        except DuplicateEmailError:
+            # A concurrent signup won the race for some email in this batch;
+            # fall back to row-by-row inserts so only that row is rejected.
+            for email, name, newsletters in rows:
+                try:
+                    self._repository.save(email, name, newsletters)
+                    result.imported += 1
+                except DuplicateEmailError:
+                    report(batch[email][0], email, "Email already subscribed", duplicate=True)
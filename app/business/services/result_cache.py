@@ -0,0 +1,221 @@
+"""Cache for SubscriptionService read results.
+
+Entries are keyed on the data version (see SubscriberRepository.data_version),
+which every repository write bumps in the same transaction. A write therefore
+invalidates every cached result at once, in every worker, without the cache
+having to know what changed: old keys are simply never asked for again and
+age out through LRU and TTL eviction.
+
+Two backends:
+
+* ``memory``: an OrderedDict per worker process.
+* ``sqlite``: one SQLite file shared by all workers on the host, so a result
+  computed by one gunicorn worker serves the others. It defaults to a 0700
+  directory under the instance folder, since values are unpickled.
+"""
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from flask import Flask, current_app, has_app_context
+
+from app.instance import private_instance_dir
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "result_cache"
+CACHE_BACKENDS = ("none", "memory", "sqlite")
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    evictions: int = 0
+
+
+class MemoryCacheBackend:
+    """Per-process LRU with a TTL on every entry."""
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """LRU + TTL cache in a SQLite file that every worker on the host opens.
+
+    Values are pickled. The file is a private scratch area of this app; do
+    not point it at a path other users can write.
+    """
+
+    def __init__(self, path: str, max_entries: int = 512, ttl_seconds: float = 300):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self._local = threading.local()
+        self.evictions = 0
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS result_cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+                " expires REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_result_cache_last_used ON result_cache (last_used)")
+
+    def after_fork(self) -> None:
+        # A SQLite connection must not be used across fork(); leave the parent's to the parent
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Any:
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute("SELECT value, expires FROM result_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return _MISSING
+        if row[1] < now:
+            conn.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+            return _MISSING
+        conn.execute("UPDATE result_cache SET last_used = ? WHERE key = ?", (now, key))
+        return pickle.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            "INSERT OR REPLACE INTO result_cache (key, value, expires, last_used) VALUES (?, ?, ?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now + self.ttl, now),
+        )
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM result_cache WHERE key IN"
+                " (SELECT key FROM result_cache ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM result_cache")
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM result_cache").fetchone()[0]
+
+
+class ResultCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get_or_compute(self, name: str, version: int | None, args: tuple, compute: Callable[[], Any]) -> Any:
+        """Return the cached result of ``compute`` for this name, version and args.
+
+        With no data version (counters not populated yet) nothing is cached.
+        Backend errors are logged and fall through to ``compute``.
+        """
+        if version is None:
+            return compute()
+        key = f"{name}:{version}:{args!r}"
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Result cache read failed: {e}")
+            value = _MISSING
+        with self._lock:
+            if value is _MISSING:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+        if value is not _MISSING:
+            return value
+
+        value = compute()
+        try:
+            self.backend.set(key, value)
+        except Exception as e:
+            logger.warning(f"Result cache write failed: {e}")
+        return value
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                entries=len(self.backend),
+                evictions=self.backend.evictions,
+            )
+
+
+def init_result_cache(app: Flask) -> ResultCache | None:
+    """Create the cache selected by RESULT_CACHE, or None for "none"."""
+    backend_name = app.config.get("RESULT_CACHE", "none")
+    if backend_name not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown result cache backend: {backend_name}")
+    if backend_name == "none":
+        return None
+
+    max_entries = app.config["RESULT_CACHE_MAX_ENTRIES"]
+    ttl = app.config["RESULT_CACHE_TTL"]
+    if backend_name == "sqlite":
+        path = app.config["RESULT_CACHE_PATH"] or os.path.join(private_instance_dir(app, "cache"), "result-cache.sqlite")
+        backend = SQLiteCacheBackend(path, max_entries, ttl)
+    else:
+        backend = MemoryCacheBackend(max_entries, ttl)
+
+    cache = ResultCache(backend)
+    app.extensions[EXTENSION_KEY] = cache
+    return cache
+
+
+def get_result_cache() -> ResultCache | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get(EXTENSION_KEY)
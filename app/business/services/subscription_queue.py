@@ -0,0 +1,243 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from flask import Flask, current_app, has_app_context
+
+from app.data.models import Subscriber
+from app.data.newsletters import newsletter_registry
+from app.data.repositories.subscriber_repository import DuplicateEmailError, SubscriberRepository
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "subscription_queue"
+_STOP = object()
+
+
+class QueueFull(Exception):
+    """Raised when the queue is at capacity or no longer accepting work."""
+
+
+@dataclass
+class PendingSubscription:
+    email: str
+    name: str
+    newsletters: dict[str, bool] | None
+    future: Future = field(default_factory=Future)
+
+
+@dataclass
+class QueueStats:
+    depth: int = 0
+    max_depth_seen: int = 0
+    submitted: int = 0
+    committed: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    batches: int = 0
+    last_batch_size: int = 0
+    running: bool = False
+
+
+class SubscriptionQueue:
+    """Write-behind queue that group-commits validated signups.
+
+    Request threads submit a normalized signup and wait on its Future while
+    a single background thread inserts pending rows in batches of
+    ``batch_size`` or every ``flush_interval_ms``, whichever comes first.
+    Duplicates (within a batch or against the database) resolve the Future
+    with the same "Email already subscribed" result as the direct path.
+
+    The subscriber on a successful result is a transient object carrying the
+    submitted values; it has no id because the row was inserted in bulk.
+    """
+
+    def __init__(
+        self,
+        app: Flask,
+        repository: SubscriberRepository | None = None,
+        batch_size: int = 100,
+        flush_interval_ms: int = 50,
+        max_depth: int = 10000,
+    ):
+        self._app = app
+        self._repository = repository or SubscriberRepository()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._queue: queue.Queue = queue.Queue(maxsize=max_depth)
+        self._lock = threading.Lock()
+        self._accepting = False
+        self._thread: threading.Thread | None = None
+        self._stats = QueueStats()
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def start(self) -> None:
+        with self._lock:
+            if self._accepting:
+                return
+            self._accepting = True
+            self._thread = threading.Thread(target=self._run, name="subscription-queue", daemon=True)
+            self._thread.start()
+
+    def after_fork(self) -> None:
+        """Give a forked worker its own queue and flush thread; threads do not survive fork()."""
+        running = self._accepting
+        self._queue = queue.Queue(maxsize=self._queue.maxsize)
+        self._lock = threading.Lock()
+        self._accepting = False
+        self._thread = None
+        self._stats = QueueStats()
+        if running:
+            self.start()
+
+    def stop(self, timeout: float | None = 10) -> None:
+        """Stop accepting work and flush everything already queued."""
+        with self._lock:
+            if not self._accepting:
+                return
+            self._accepting = False
+        # Outside the lock: on a full queue this waits for the flush thread, which needs the lock
+        self._queue.put(_STOP)
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, email: str, name: str, newsletters: dict[str, bool] | None = None) -> Future:
+        pending = PendingSubscription(email=email, name=name, newsletters=newsletters)
+        with self._lock:
+            if not self._accepting:
+                raise QueueFull("Subscription queue is stopped")
+            try:
+                self._queue.put_nowait(pending)
+            except queue.Full:
+                raise QueueFull("Subscription queue is full") from None
+            self._stats.submitted += 1
+            self._stats.max_depth_seen = max(self._stats.max_depth_seen, self._queue.qsize())
+        return pending.future
+
+    def stats(self) -> QueueStats:
+        with self._lock:
+            return QueueStats(**{**vars(self._stats), "depth": self._queue.qsize(), "running": self._accepting})
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+
+        # Drain anything that raced in before the stop marker was queued.
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        for i in range(0, len(leftover), self.batch_size):
+            self._flush(leftover[i:i + self.batch_size])
+
+    def _flush(self, batch: list[PendingSubscription]) -> None:
+        from app.business.services.subscription_service import SubscriptionResult
+
+        duplicate = SubscriptionResult(success=False, error="Email already subscribed")
+        pending: dict[str, PendingSubscription] = {}
+        duplicates = 0
+        # Claim every future before writing: a cancelled one is dropped, a running one can no longer be cancelled
+        batch = [item for item in batch if item.future.set_running_or_notify_cancel()]
+        for item in batch:
+            if item.email in pending:
+                item.future.set_result(duplicate)
+                duplicates += 1
+            else:
+                pending[item.email] = item
+
+        committed = 0
+        try:
+            with self._app.app_context():
+                existing = self._repository.existing_emails(list(pending))
+                for email in existing:
+                    pending.pop(email).future.set_result(duplicate)
+                    duplicates += 1
+
+                rows = [(p.email, p.name, p.newsletters) for p in pending.values()]
+                try:
+                    committed = self._repository.save_many(rows)
+                except DuplicateEmailError:
+                    # Lost a race with a direct insert; retry row by row, resolving each
+                    # row as it commits so a later failure cannot report it as failed.
+                    for p in pending.values():
+                        try:
+                            self._repository.save(p.email, p.name, p.newsletters)
+                        except DuplicateEmailError:
+                            p.future.set_result(duplicate)
+                            duplicates += 1
+                            continue
+                        committed += 1
+                        p.future.set_result(SubscriptionResult(success=True, subscriber=_transient_subscriber(p)))
+                else:
+                    for p in pending.values():
+                        p.future.set_result(SubscriptionResult(success=True, subscriber=_transient_subscriber(p)))
+        except Exception as e:
+            logger.error(f"Subscription batch failed: {e}", exc_info=True)
+            for p in pending.values():
+                if not p.future.done():
+                    p.future.set_exception(e)
+                    with self._lock:
+                        self._stats.failed += 1
+
+        with self._lock:
+            self._stats.committed += committed
+            self._stats.duplicates += duplicates
+            self._stats.batches += 1
+            self._stats.last_batch_size = len(batch)
+
+
+def _transient_subscriber(pending: PendingSubscription) -> Subscriber:
+    return Subscriber(
+        email=pending.email,
+        name=pending.name,
+        **newsletter_registry.column_values(pending.newsletters),
+    )
+
+
+def init_subscription_queue(app: Flask) -> SubscriptionQueue | None:
+    """Start the write-behind queue if SUBSCRIBE_WRITE_BEHIND is enabled."""
+    if not app.config.get("SUBSCRIBE_WRITE_BEHIND"):
+        return None
+    subscription_queue = SubscriptionQueue(
+        app,
+        batch_size=app.config["SUBSCRIBE_BATCH_SIZE"],
+        flush_interval_ms=app.config["SUBSCRIBE_FLUSH_MS"],
+        max_depth=app.config["SUBSCRIBE_QUEUE_MAX"],
+    )
+    subscription_queue.start()
+    app.extensions[EXTENSION_KEY] = subscription_queue
+    return subscription_queue
+
+
+def get_subscription_queue() -> SubscriptionQueue | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get(EXTENSION_KEY)
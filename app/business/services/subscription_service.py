@@ -1,8 +1,23 @@
+import asyncio
 import re
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from dataclasses import dataclass
 
+from flask import current_app
+
+from app.business.services.result_cache import ResultCache, get_result_cache
+from app.business.services.subscription_queue import QueueFull, get_subscription_queue
+from app.data.async_db import get_async_db
 from app.data.models import Subscriber
-from app.data.repositories.subscriber_repository import SubscriberRepository
+from app.data.newsletters import newsletter_registry
+from app.data.repositories.async_subscriber_repository import AsyncSubscriberRepository
+from app.data.repositories.subscriber_repository import (
+    DEFAULT_PAGE_SIZE,
+    DuplicateEmailError,
+    SubscriberPage,
+    SubscriberRepository,
+    SubscriberStats,
+)
 
 EMAIL_PATTERN = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
 
@@ -12,26 +27,75 @@ class SubscriptionResult:
     success: bool
     error: str = ""
     subscriber: Subscriber | None = None
+    # Queued but not confirmed within SUBSCRIBE_RESULT_TIMEOUT; the write-behind
+    # thread will still commit it (or find it is a duplicate)
+    pending: bool = False
+
+
+def accepted_result(email: str, name: str, newsletters: dict[str, bool] | None) -> SubscriptionResult:
+    """Result for a queued signup whose commit has not been confirmed yet."""
+    subscriber = Subscriber(email=email, name=name, **newsletter_registry.column_values(newsletters))
+    return SubscriptionResult(success=True, subscriber=subscriber, pending=True)
+
+
+def page_rows(page: SubscriberPage) -> tuple[list[dict], str | None, bool]:
+    """Plain column values of a page, safe to cache across sessions and processes."""
+    keys = Subscriber.__mapper__.column_attrs.keys()
+    return [{key: getattr(s, key) for key in keys} for s in page.items], page.next_cursor, page.has_more
+
+
+def page_from_rows(rows: list[dict], next_cursor: str | None, has_more: bool) -> SubscriberPage:
+    """A page of transient subscribers rebuilt from page_rows."""
+    return SubscriberPage(items=[Subscriber(**row) for row in rows], next_cursor=next_cursor, has_more=has_more)
 
 
 class SubscriptionService:
-    def __init__(self, repository: SubscriberRepository | None = None):
+    def __init__(self, repository: SubscriberRepository | None = None, cache: ResultCache | None = None):
         self._repository = repository or SubscriberRepository()
+        self._cache = cache
+
+    def data_version(self) -> int | None:
+        """Data version for caching and ETags; a primary-key lookup."""
+        return self._repository.data_version()
+
+    def _cached(self, name: str, args: tuple, compute):
+        cache = self._cache or get_result_cache()
+        if cache is None:
+            return compute()
+        return cache.get_or_compute(name, self.data_version(), args, compute)
 
     def subscribe(self, email: str, name: str, newsletters: dict[str, bool] | None = None) -> SubscriptionResult:
-        is_valid, error = self._validate_email(email)
-        if not is_valid:
+        error, normalized_email, normalized_name = self.prepare_signup(email, name)
+        if error:
             return SubscriptionResult(success=False, error=error)
 
-        normalized_email = self._normalize_email(email)
-        normalized_name = self._normalize_name(name)
-
-        if self._repository.exists(normalized_email):
+        subscription_queue = get_subscription_queue()
+        if subscription_queue is not None:
+            try:
+                future = subscription_queue.submit(normalized_email, normalized_name, newsletters)
+            except QueueFull:
+                pass
+            else:
+                try:
+                    return future.result(timeout=current_app.config["SUBSCRIBE_RESULT_TIMEOUT"])
+                except FutureTimeoutError:
+                    return accepted_result(normalized_email, normalized_name, newsletters)
+
+        # The unique email constraint is the duplicate check: one INSERT, no
+        # SELECT first, and concurrent signups cannot both succeed.
+        try:
+            subscriber = self._repository.save(normalized_email, normalized_name, newsletters)
+        except DuplicateEmailError:
             return SubscriptionResult(success=False, error="Email already subscribed")
-
-        subscriber = self._repository.save(normalized_email, normalized_name, newsletters)
         return SubscriptionResult(success=True, subscriber=subscriber)
 
+    def prepare_signup(self, email: str, name: str | None) -> tuple[str, str, str]:
+        """Validate and normalize signup input; returns (error, email, name)."""
+        is_valid, error = self._validate_email(email)
+        if not is_valid:
+            return error, "", ""
+        return "", self._normalize_email(email), self._normalize_name(name)
+
     def _validate_email(self, email: str) -> tuple[bool, str]:
         if not email or not email.strip():
             return False, "Email is required"
@@ -50,6 +114,26 @@ class SubscriptionService:
     def get_all_subscribers(self, sort_by: str = "date_desc", newsletter_filter: str | None = None) -> list[Subscriber]:
         return self._repository.get_all(sort_by, newsletter_filter)
 
+    def get_subscribers_page(
+        self,
+        sort_by: str = "date_desc",
+        newsletter_filter: str | None = None,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        search: str | None = None,
+    ) -> SubscriberPage:
+        args = (sort_by, newsletter_filter, cursor, limit, search)
+        # ORM instances belong to the session that loaded them, so the cache keeps column values
+        return page_from_rows(*self._cached("page", args, lambda: page_rows(self._repository.get_page(*args))))
+
+    def count_subscribers(self, newsletter_filter: str | None = None, search: str | None = None) -> int:
+        args = (newsletter_filter, search)
+        return self._cached("count", args, lambda: self._repository.count(*args))
+
+    def get_stats(self) -> SubscriberStats:
+        # Recent-signup counts depend on the clock, so stats also expire by TTL
+        return self._cached("stats", (), self._repository.stats)
+
     def get_subscriber(self, subscriber_id: int) -> Subscriber | None:
         return self._repository.find_by_id(subscriber_id)
 
@@ -65,7 +149,11 @@ class SubscriptionService:
         if existing and existing.id != subscriber_id:
             return SubscriptionResult(success=False, error="Email already in use")
 
-        subscriber = self._repository.update(subscriber_id, normalized_email, normalized_name, newsletters)
+        try:
+            subscriber = self._repository.update(subscriber_id, normalized_email, normalized_name, newsletters)
+        except DuplicateEmailError:
+            # Taken between the check above and the commit
+            return SubscriptionResult(success=False, error="Email already in use")
         if subscriber:
             return SubscriptionResult(success=True, subscriber=subscriber)
         return SubscriptionResult(success=False, error="Subscriber not found")
@@ -75,3 +163,50 @@ class SubscriptionService:
 
     def delete_subscriber(self, subscriber_id: int) -> bool:
         return self._repository.delete(subscriber_id)
+
+    def delete_subscribers_bulk(self, subscriber_ids: list[int]) -> int:
+        return self._repository.delete_bulk(subscriber_ids)
+
+
+class AsyncSubscriptionService:
+    """subscribe() for the event loop: database round trips are awaited, not waited on.
+
+    Used by the async signup view of asgi.py. Validation and results are
+    those of SubscriptionService.
+    """
+
+    def __init__(self, service: SubscriptionService | None = None):
+        self._service = service or SubscriptionService()
+
+    async def subscribe(self, email: str, name: str, newsletters: dict[str, bool] | None = None) -> SubscriptionResult:
+        error, normalized_email, normalized_name = self._service.prepare_signup(email, name)
+        if error:
+            return SubscriptionResult(success=False, error=error)
+
+        subscription_queue = get_subscription_queue()
+        if subscription_queue is not None:
+            try:
+                future = subscription_queue.submit(normalized_email, normalized_name, newsletters)
+            except QueueFull:
+                pass
+            else:
+                timeout = current_app.config["SUBSCRIBE_RESULT_TIMEOUT"]
+                try:
+                    # Shielded: a timeout must not cancel a signup the queue may already be committing
+                    return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+                except TimeoutError:
+                    return accepted_result(normalized_email, normalized_name, newsletters)
+
+        async_db = get_async_db()
+        if async_db is None:
+            # No asyncio driver for this database; keep the event loop free anyway
+            return await asyncio.to_thread(self._service.subscribe, email, name, newsletters)
+
+        async with async_db.session() as session:
+            try:
+                subscriber = await AsyncSubscriberRepository(session).save(
+                    normalized_email, normalized_name, newsletters
+                )
+            except DuplicateEmailError:
+                return SubscriptionResult(success=False, error="Email already subscribed")
+        return SubscriptionResult(success=True, subscriber=subscriber)
@@ -3,37 +3,167 @@ from dataclasses import dataclass, field
 from urllib.parse import quote_plus
 
 
+def _mssql_uri(db_server: str) -> str:
+    db_name = os.environ.get("DB_NAME", "")
+    db_username = os.environ.get("DB_USERNAME", "")
+    db_password = os.environ.get("DB_PASSWORD", "")
+
+    driver = os.environ.get("DB_DRIVER", "pymssql")
+    if driver == "pyodbc":
+        params = "driver=ODBC+Driver+18+for+SQL+Server&TrustServerCertificate=yes"
+        return f"mssql+pyodbc://{quote_plus(db_username)}:{quote_plus(db_password)}@{db_server}/{db_name}?{params}"
+    else:
+        return f"mssql+pymssql://{quote_plus(db_username)}:{quote_plus(db_password)}@{db_server}/{db_name}?charset=utf8"
+
+
 def get_database_uri() -> str:
     db_type = os.environ.get("DB_TYPE", "sqlite")
 
     if db_type == "mssql":
         db_server = os.environ.get("DB_SERVER", "")
-        db_name = os.environ.get("DB_NAME", "")
-        db_username = os.environ.get("DB_USERNAME", "")
-        db_password = os.environ.get("DB_PASSWORD", "")
-
         if db_server:
-            driver = os.environ.get("DB_DRIVER", "pymssql")
-            if driver == "pyodbc":
-                params = "driver=ODBC+Driver+18+for+SQL+Server&TrustServerCertificate=yes"
-                return f"mssql+pyodbc://{quote_plus(db_username)}:{quote_plus(db_password)}@{db_server}/{db_name}?{params}"
-            else:
-                return f"mssql+pymssql://{quote_plus(db_username)}:{quote_plus(db_password)}@{db_server}/{db_name}?charset=utf8"
+            return _mssql_uri(db_server)
 
+    sqlite_path = os.environ.get("SQLITE_PATH", "")
+    if sqlite_path:
+        return f"sqlite:///{sqlite_path}"
     return "sqlite:///:memory:"
 
 
+def get_replica_database_uri() -> str | None:
+    """URI of the optional read replica (DB_REPLICA_SERVER or SQLITE_REPLICA_PATH)."""
+    db_type = os.environ.get("DB_TYPE", "sqlite")
+
+    if db_type == "mssql":
+        replica_server = os.environ.get("DB_REPLICA_SERVER", "")
+        return _mssql_uri(replica_server) if replica_server else None
+
+    replica_path = os.environ.get("SQLITE_REPLICA_PATH", "")
+    return f"sqlite:///{replica_path}" if replica_path else None
+
+
+def get_async_database_uri() -> str:
+    """URI for the asyncio engine of asgi.py (ASYNC_DATABASE_URI), or "" if there is none.
+
+    SQLite maps to aiosqlite and pyodbc to aioodbc. pymssql has no asyncio
+    twin, and an in-memory database only exists on the sync engine's own
+    connection.
+    """
+    explicit = os.environ.get("ASYNC_DATABASE_URI", "")
+    if explicit:
+        return explicit
+    uri = get_database_uri()
+    if uri == "sqlite:///:memory:":
+        return ""
+    for sync_scheme, async_scheme in (("sqlite://", "sqlite+aiosqlite://"), ("mssql+pyodbc://", "mssql+aioodbc://")):
+        if uri.startswith(sync_scheme):
+            return async_scheme + uri[len(sync_scheme):]
+    return ""
+
+
+def get_database_binds() -> dict:
+    replica_uri = get_replica_database_uri()
+    return {"replica": replica_uri} if replica_uri else {}
+
+
+# Connection pool profiles; pick one with DB_POOL_PROFILE and override single
+# settings with DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT and DB_POOL_RECYCLE.
+# Connections per container = gunicorn workers x (pool_size + max_overflow).
+POOL_PROFILES = {
+    "default": {"pool_size": 5, "max_overflow": 10, "pool_timeout": 30, "pool_recycle": 300},
+    "small": {"pool_size": 2, "max_overflow": 3, "pool_timeout": 10, "pool_recycle": 300},
+    "production": {"pool_size": 10, "max_overflow": 10, "pool_timeout": 10, "pool_recycle": 300},
+}
+
+
+def get_engine_options(default_profile: str = "default") -> dict:
+    profile_name = os.environ.get("DB_POOL_PROFILE", default_profile)
+    if profile_name not in POOL_PROFILES:
+        raise ValueError(f"Unknown DB_POOL_PROFILE: {profile_name}")
+
+    options = {"pool_pre_ping": env_bool("DB_POOL_PRE_PING", True)}
+    # In-memory SQLite runs on a single static connection; sizing does not apply.
+    if get_database_uri() == "sqlite:///:memory:":
+        return options
+
+    profile = POOL_PROFILES[profile_name]
+    options.update({
+        "pool_size": env_int("DB_POOL_SIZE", profile["pool_size"]),
+        "max_overflow": env_int("DB_MAX_OVERFLOW", profile["max_overflow"]),
+        "pool_timeout": env_int("DB_POOL_TIMEOUT", profile["pool_timeout"]),
+        "pool_recycle": env_int("DB_POOL_RECYCLE", profile["pool_recycle"]),
+    })
+    return options
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
 @dataclass
 class Config:
     SECRET_KEY: str = field(default_factory=lambda: os.environ.get("SECRET_KEY", "dev-secret-key"))
     DEBUG: bool = False
     TESTING: bool = False
     SQLALCHEMY_DATABASE_URI: str = field(default_factory=get_database_uri)
+    SQLALCHEMY_BINDS: dict = field(default_factory=get_database_binds)
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
-    SQLALCHEMY_ENGINE_OPTIONS: dict = field(default_factory=lambda: {
-        "pool_pre_ping": True,
-        "pool_recycle": 300,
-    })
+    SQLALCHEMY_ENGINE_OPTIONS: dict = field(default_factory=get_engine_options)
+    # Signups served by asgi.py await the database through this engine; without
+    # one they run the sync path on a thread
+    ASYNC_DATABASE_URI: str = field(default_factory=get_async_database_uri)
+    # Threads per ASGI worker for the routes that stay synchronous
+    ASGI_WSGI_THREADS: int = field(default_factory=lambda: env_int("ASGI_WSGI_THREADS", 10))
+    # Skip schema bootstrap at boot and only check the schema version;
+    # run 'flask db upgrade' once per deploy instead.
+    FAST_BOOT: bool = field(default_factory=lambda: env_bool("FAST_BOOT"))
+    # "columns" reads the legacy nl_* flags, "bitmask" reads newsletter_mask
+    NEWSLETTER_STORAGE: str = field(default_factory=lambda: os.environ.get("NEWSLETTER_STORAGE", "columns"))
+    # Admin reads stay on the primary this long after an admin write
+    READ_YOUR_WRITES_SECONDS: int = field(default_factory=lambda: env_int("READ_YOUR_WRITES_SECONDS", 5))
+    # Write-behind queue for public signups (group commit of N rows or every T ms)
+    SUBSCRIBE_WRITE_BEHIND: bool = field(default_factory=lambda: env_bool("SUBSCRIBE_WRITE_BEHIND"))
+    SUBSCRIBE_BATCH_SIZE: int = field(default_factory=lambda: env_int("SUBSCRIBE_BATCH_SIZE", 100))
+    SUBSCRIBE_FLUSH_MS: int = field(default_factory=lambda: env_int("SUBSCRIBE_FLUSH_MS", 50))
+    SUBSCRIBE_QUEUE_MAX: int = field(default_factory=lambda: env_int("SUBSCRIBE_QUEUE_MAX", 10000))
+    SUBSCRIBE_RESULT_TIMEOUT: int = field(default_factory=lambda: env_int("SUBSCRIBE_RESULT_TIMEOUT", 10))
+    # Cache for admin read results: "none", "memory" (per worker) or "sqlite" (shared file)
+    RESULT_CACHE: str = field(default_factory=lambda: os.environ.get("RESULT_CACHE", "memory"))
+    RESULT_CACHE_PATH: str = field(default_factory=lambda: os.environ.get("RESULT_CACHE_PATH", ""))
+    RESULT_CACHE_MAX_ENTRIES: int = field(default_factory=lambda: env_int("RESULT_CACHE_MAX_ENTRIES", 512))
+    RESULT_CACHE_TTL: int = field(default_factory=lambda: env_int("RESULT_CACHE_TTL", 300))
+    # Per-worker cuckoo filter that answers "definitely not subscribed" without a query
+    EMAIL_FILTER: bool = field(default_factory=lambda: env_bool("EMAIL_FILTER", True))
+    EMAIL_FILTER_CAPACITY: int = field(default_factory=lambda: env_int("EMAIL_FILTER_CAPACITY", 1_000_000))
+    EMAIL_FILTER_REFRESH_SECONDS: int = field(default_factory=lambda: env_int("EMAIL_FILTER_REFRESH_SECONDS", 5))
+    # Compiled templates shared by all workers on the host, and rendered admin rows per worker
+    JINJA_BYTECODE_CACHE: bool = field(default_factory=lambda: env_bool("JINJA_BYTECODE_CACHE", True))
+    JINJA_BYTECODE_CACHE_DIR: str = field(default_factory=lambda: os.environ.get("JINJA_BYTECODE_CACHE_DIR", ""))
+    FRAGMENT_CACHE_MAX_ENTRIES: int = field(default_factory=lambda: env_int("FRAGMENT_CACHE_MAX_ENTRIES", 5000))
+    # Public pages rendered once per worker and served from memory (off in debug mode)
+    PAGE_CACHE: bool = field(default_factory=lambda: env_bool("PAGE_CACHE", True))
+    # Gzip HTML/JSON/CSV responses of at least GZIP_MIN_SIZE bytes (streamed ones always)
+    GZIP: bool = field(default_factory=lambda: env_bool("GZIP", True))
+    GZIP_LEVEL: int = field(default_factory=lambda: env_int("GZIP_LEVEL", 6))
+    GZIP_MIN_SIZE: int = field(default_factory=lambda: env_int("GZIP_MIN_SIZE", 1024))
+    # Where fingerprinted CSS/JS/images are written (default: presentation/static/dist)
+    ASSET_BUILD_DIR: str = field(default_factory=lambda: os.environ.get("ASSET_BUILD_DIR", ""))
+    # Token buckets per client IP for the public POSTs: "sqlite" (shared by all
+    # workers on the host), "memory" (per worker) or "none"; limits are "<requests>/<seconds>"
+    RATE_LIMIT: str = field(default_factory=lambda: os.environ.get("RATE_LIMIT", "sqlite"))
+    RATE_LIMIT_PATH: str = field(default_factory=lambda: os.environ.get("RATE_LIMIT_PATH", ""))
+    RATE_LIMIT_SUBSCRIBE: str = field(default_factory=lambda: os.environ.get("RATE_LIMIT_SUBSCRIBE", "10/60"))
+    RATE_LIMIT_LOGIN: str = field(default_factory=lambda: os.environ.get("RATE_LIMIT_LOGIN", "10/300"))
+    # Reverse proxies in front of the app whose X-Forwarded-For entry is trusted
+    RATE_LIMIT_PROXY_HOPS: int = field(default_factory=lambda: env_int("RATE_LIMIT_PROXY_HOPS", 0))
 
 
 @dataclass
@@ -41,14 +171,24 @@ class DevelopmentConfig(Config):
     DEBUG: bool = True
 
 
+@dataclass
+class TestingConfig(Config):
+    # Per-process buckets, so test runs do not share state through a file
+    RATE_LIMIT: str = field(default_factory=lambda: os.environ.get("RATE_LIMIT", "memory"))
+
+
 @dataclass
 class ProductionConfig(Config):
     DEBUG: bool = False
+    SQLALCHEMY_ENGINE_OPTIONS: dict = field(default_factory=lambda: get_engine_options("production"))
+    FAST_BOOT: bool = field(default_factory=lambda: env_bool("FAST_BOOT", True))
+    # Azure Container Apps ingress appends the client address to X-Forwarded-For
+    RATE_LIMIT_PROXY_HOPS: int = field(default_factory=lambda: env_int("RATE_LIMIT_PROXY_HOPS", 1))
 
 
 config = {
     "development": DevelopmentConfig,
-    "testing": Config,
+    "testing": TestingConfig,
     "production": ProductionConfig,
     "default": DevelopmentConfig,
 }
@@ -0,0 +1,59 @@
+"""Asyncio database engine for the async request path (asgi.py).
+
+Each worker process gets one AsyncEngine, with the pool settings of the sync
+engine. It is created on first use, inside the process and event loop that
+will use it, so nothing from a preloading master leaks into a worker. Every
+request opens its own AsyncSession through ``session()``. The ASGI lifespan
+shutdown disposes the engine.
+"""
+from flask import Flask, current_app, has_app_context
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+EXTENSION_KEY = "async_db"
+
+
+class AsyncDatabase:
+    def __init__(self, uri: str, engine_options: dict | None = None):
+        self.uri = uri
+        self.engine_options = engine_options or {}
+        self._engine: AsyncEngine | None = None
+        self._sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            self._engine = create_async_engine(self.uri, **self.engine_options)
+            # Results are used after the session closes, e.g. to render the thank-you redirect
+            self._sessionmaker = async_sessionmaker(self._engine, expire_on_commit=False)
+        return self._engine
+
+    def session(self) -> AsyncSession:
+        """A new session; use as ``async with async_db.session() as session``."""
+        self.engine
+        return self._sessionmaker()
+
+    async def dispose(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+            self._engine = None
+
+    def after_fork(self) -> None:
+        # The parent's connections stay with the parent; this process connects anew
+        self._engine = None
+        self._sessionmaker = None
+
+
+def init_async_db(app: Flask) -> AsyncDatabase | None:
+    """Register the asyncio engine if ASYNC_DATABASE_URI is set (see config)."""
+    uri = app.config.get("ASYNC_DATABASE_URI")
+    if not uri:
+        return None
+    async_db = AsyncDatabase(uri, app.config.get("SQLALCHEMY_ENGINE_OPTIONS"))
+    app.extensions[EXTENSION_KEY] = async_db
+    return async_db
+
+
+def get_async_db() -> AsyncDatabase | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get(EXTENSION_KEY)
@@ -0,0 +1,62 @@
+"""Database bootstrap: pending migrations plus the default admin user.
+
+This used to run inside every create_app() call. It now runs once per deploy
+through ``flask db upgrade``; with FAST_BOOT enabled, workers only compare
+the recorded schema version with SCHEMA_VERSION.
+"""
+import logging
+import os
+
+from app.data.migrations import HEAD, MigrationContext, current_version, upgrade
+from app.data.models import db
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = HEAD
+
+
+def bootstrap_database(ctx: MigrationContext | None = None) -> int:
+    """Apply pending migrations and seed the admin user; safe to re-run.
+
+    Raises MigrationError if a migration fails.
+    """
+    upgrade(ctx=ctx)
+    _ensure_admin_user()
+    return current_schema_version()
+
+
+def current_schema_version() -> int | None:
+    """Highest recorded schema version, or None if the table is missing."""
+    return current_version()
+
+
+def check_schema_version() -> bool:
+    """Cheap boot-time check: one SELECT, no DDL."""
+    current = current_schema_version()
+    if current is None or current < SCHEMA_VERSION:
+        logger.warning(
+            f"Database schema version is {current}, expected {SCHEMA_VERSION}; run 'flask db upgrade'"
+        )
+        return False
+    return True
+
+
+def _ensure_admin_user():
+    """Ensure default admin user exists."""
+    from app.data.models import User
+
+    admin_username = os.environ.get("ADMIN_USERNAME", "admin")
+    admin_password = os.environ.get("ADMIN_PASSWORD", "admin123")
+
+    try:
+        if User.query.filter_by(username=admin_username).first():
+            return
+
+        admin_user = User(username=admin_username)
+        admin_user.set_password(admin_password)
+        db.session.add(admin_user)
+        db.session.commit()
+        logger.info(f"Created default admin user: {admin_username}")
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Failed to create admin user: {e}")
@@ -0,0 +1,290 @@
+"""In-memory cuckoo filter over subscriber emails.
+
+Duplicate checks ask the filter first and only query the database for
+emails it might contain; "definitely not present" answers skip the lookup.
+A cuckoo filter (16-bit fingerprints, 4-slot buckets) is used instead of a
+Bloom filter because it supports deletes: about 2 bytes per email at an
+estimated false-positive rate near 0.01%.
+
+The filter is per process. It is built from a streamed scan at startup and
+the repository keeps it current for writes made in this process. Signups
+committed by other workers are picked up by ``refresh_if_due()``, which reads
+rows above the highest id seen, at most every ``refresh_seconds``. Until
+then, and for emails changed through edits in other workers, a negative
+can be stale. Every caller therefore still relies on the unique email
+constraint as the final guard.
+"""
+import hashlib
+import logging
+import random
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+
+from flask import Flask, current_app, has_app_context
+from sqlalchemy import func, select
+
+from app.data.models import db, Subscriber
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "email_filter"
+BUCKET_SIZE = 4
+FINGERPRINT_BITS = 16
+MAX_KICKS = 500
+BUILD_CHUNK_SIZE = 10000
+
+
+class FilterFull(Exception):
+    """Raised when an insert cannot find a free slot after MAX_KICKS evictions."""
+
+
+class CuckooFilter:
+    def __init__(self, capacity: int):
+        # Cuckoo filters stay insertable up to ~95% load with 4-slot buckets
+        buckets = max(1, -(-capacity // int(BUCKET_SIZE * 0.9)))
+        self.num_buckets = 1 << (buckets - 1).bit_length()
+        self._mask = self.num_buckets - 1
+        self._slots = array("H", bytes(2 * self.num_buckets * BUCKET_SIZE))
+        self._rng = random.Random(0)
+        self.count = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.num_buckets * BUCKET_SIZE
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._slots.itemsize * len(self._slots)
+
+    def _locate(self, item: str) -> tuple[int, int, int]:
+        digest = int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), "little")
+        fingerprint = (digest >> 32) & 0xFFFF or 1
+        first = digest & self._mask
+        return fingerprint, first, self._alternate(first, fingerprint)
+
+    def _alternate(self, index: int, fingerprint: int) -> int:
+        # Multiplicative hash of the fingerprint; XOR makes this an involution
+        return (index ^ ((fingerprint * 0x5BD1E995) >> 7)) & self._mask
+
+    def _bucket(self, index: int) -> range:
+        start = index * BUCKET_SIZE
+        return range(start, start + BUCKET_SIZE)
+
+    def add(self, item: str) -> None:
+        fingerprint, first, second = self._locate(item)
+        for index in (first, second):
+            for slot in self._bucket(index):
+                if not self._slots[slot]:
+                    self._slots[slot] = fingerprint
+                    self.count += 1
+                    return
+
+        index = self._rng.choice((first, second))
+        for _ in range(MAX_KICKS):
+            slot = index * BUCKET_SIZE + self._rng.randrange(BUCKET_SIZE)
+            fingerprint, self._slots[slot] = self._slots[slot], fingerprint
+            index = self._alternate(index, fingerprint)
+            for slot in self._bucket(index):
+                if not self._slots[slot]:
+                    self._slots[slot] = fingerprint
+                    self.count += 1
+                    return
+        raise FilterFull(f"Cuckoo filter full at {self.count} items")
+
+    def remove(self, item: str) -> bool:
+        """Remove one copy of an item that was added; False if not found."""
+        fingerprint, first, second = self._locate(item)
+        for index in (first, second):
+            for slot in self._bucket(index):
+                if self._slots[slot] == fingerprint:
+                    self._slots[slot] = 0
+                    self.count -= 1
+                    return True
+        return False
+
+    def __contains__(self, item: str) -> bool:
+        fingerprint, first, second = self._locate(item)
+        first *= BUCKET_SIZE
+        second *= BUCKET_SIZE
+        slots = self._slots
+        return fingerprint in slots[first:first + BUCKET_SIZE] or fingerprint in slots[second:second + BUCKET_SIZE]
+
+    def estimated_fpr(self) -> float:
+        """Chance that an absent item matches one of the 2 * 4 slots it probes."""
+        load = self.count / self.capacity
+        return 1 - (1 - 1 / ((1 << FINGERPRINT_BITS) - 1)) ** (2 * BUCKET_SIZE * load)
+
+
+@dataclass
+class EmailFilterStats:
+    ready: bool = False
+    items: int = 0
+    capacity: int = 0
+    load_factor: float = 0.0
+    memory_bytes: int = 0
+    estimated_fpr: float = 0.0
+    checks: int = 0
+    definitely_absent: int = 0
+    false_positives: int = 0
+    observed_fpr: float | None = None
+    build_ms: float = 0.0
+    max_id: int = 0
+
+
+class EmailFilter:
+    """Thread-safe wrapper that builds, refreshes and reports on the filter."""
+
+    def __init__(self, capacity: int = 1_000_000, refresh_seconds: float = 5):
+        self.min_capacity = capacity
+        self.refresh_seconds = refresh_seconds
+        self._filter = CuckooFilter(capacity)
+        self._lock = threading.Lock()
+        self._ready = False
+        self._max_id = 0
+        self._last_refresh = 0.0
+        self._stats = EmailFilterStats()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def after_fork(self) -> None:
+        # The lock may have been copied while the parent's build thread held it
+        self._lock = threading.Lock()
+
+    def build(self) -> None:
+        """Stream every email into a fresh filter sized for the table."""
+        start = time.perf_counter()
+        rows = db.session.execute(select(func.count()).select_from(Subscriber)).scalar()
+        fresh = CuckooFilter(max(self.min_capacity, 2 * rows))
+        max_id = 0
+        stream = db.session.execute(
+            select(Subscriber.id, Subscriber.email).execution_options(yield_per=BUILD_CHUNK_SIZE)
+        )
+        for subscriber_id, email in stream:
+            fresh.add(email)
+            max_id = max(max_id, subscriber_id)
+        db.session.rollback()
+
+        with self._lock:
+            self._filter = fresh
+            self._max_id = max_id
+            self._ready = True
+            self._last_refresh = time.monotonic()
+            self._stats.build_ms = round((time.perf_counter() - start) * 1000, 1)
+        logger.info(f"Email filter built: {fresh.count} emails in {self._stats.build_ms} ms")
+
+    def refresh_if_due(self) -> None:
+        """Add emails inserted by other processes since the last look.
+
+        SQLite hands out the ids of deleted top rows again, so the watermark
+        follows max(id) down; a delete and re-insert inside one refresh
+        window can still be missed until the next build.
+        """
+        if not self._ready or time.monotonic() - self._last_refresh < self.refresh_seconds:
+            return
+        self._last_refresh = time.monotonic()
+        max_id = db.session.execute(select(func.max(Subscriber.id))).scalar() or 0
+        with self._lock:
+            self._max_id = min(self._max_id, max_id)
+        rows = db.session.execute(
+            select(Subscriber.id, Subscriber.email).where(Subscriber.id > self._max_id).order_by(Subscriber.id)
+        ).all()
+        for subscriber_id, email in rows:
+            self.add(email, subscriber_id)
+
+    def might_contain(self, email: str) -> bool:
+        """False means the email is definitely not subscribed (as of the last refresh)."""
+        if not self._ready:
+            return True
+        with self._lock:
+            present = email in self._filter
+            self._stats.checks += 1
+            if not present:
+                self._stats.definitely_absent += 1
+        return present
+
+    def candidates(self, emails: list[str]) -> list[str]:
+        """The emails that might be subscribed, i.e. still need a database lookup."""
+        if not self._ready:
+            return emails
+        with self._lock:
+            f = self._filter
+            maybe = [email for email in emails if email in f]
+            self._stats.checks += len(emails)
+            self._stats.definitely_absent += len(emails) - len(maybe)
+        return maybe
+
+    def record_false_positive(self, count: int = 1) -> None:
+        with self._lock:
+            self._stats.false_positives += count
+
+    def add(self, email: str, subscriber_id: int | None = None) -> None:
+        with self._lock:
+            try:
+                self._filter.add(email)
+            except FilterFull:
+                # Answer "maybe" for everything until a larger filter is built
+                self._ready = False
+                logger.warning("Email filter is full; disabled until it is rebuilt")
+            if subscriber_id is not None:
+                self._max_id = max(self._max_id, subscriber_id)
+
+    def remove(self, email: str) -> None:
+        with self._lock:
+            self._filter.remove(email)
+
+    def stats(self) -> EmailFilterStats:
+        with self._lock:
+            f = self._filter
+            negatives = self._stats.definitely_absent + self._stats.false_positives
+            return EmailFilterStats(
+                ready=self._ready,
+                items=f.count,
+                capacity=f.capacity,
+                load_factor=round(f.count / f.capacity, 4),
+                memory_bytes=f.memory_bytes,
+                estimated_fpr=f.estimated_fpr(),
+                checks=self._stats.checks,
+                definitely_absent=self._stats.definitely_absent,
+                false_positives=self._stats.false_positives,
+                observed_fpr=self._stats.false_positives / negatives if negatives else None,
+                build_ms=self._stats.build_ms,
+                max_id=self._max_id,
+            )
+
+
+def init_email_filter(app: Flask, background: bool = True) -> EmailFilter | None:
+    """Create the filter if EMAIL_FILTER is enabled and start building it.
+
+    The scan runs on a background thread so boot is not held up by it;
+    duplicate checks go to the database until it is ready.
+    """
+    if not app.config.get("EMAIL_FILTER"):
+        return None
+    email_filter = EmailFilter(app.config["EMAIL_FILTER_CAPACITY"], app.config["EMAIL_FILTER_REFRESH_SECONDS"])
+    app.extensions[EXTENSION_KEY] = email_filter
+    start_build(app, email_filter, background)
+    return email_filter
+
+
+def start_build(app: Flask, email_filter: EmailFilter, background: bool = True) -> None:
+    def build() -> None:
+        with app.app_context():
+            try:
+                email_filter.build()
+            except Exception as e:
+                logger.warning(f"Email filter build failed, duplicate checks use the database: {e}")
+
+    if background:
+        threading.Thread(target=build, name="email-filter-build", daemon=True).start()
+    else:
+        build()
+
+
+def get_email_filter() -> EmailFilter | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get(EXTENSION_KEY)
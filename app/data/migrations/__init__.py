@@ -0,0 +1,136 @@
+"""Versioned schema migrations.
+
+Migrations are plain modules named ``mNNNN_<name>.py`` exposing ``VERSION``,
+``NAME`` and ``upgrade(ctx)``, listed in order in ``MIGRATIONS`` below. Each
+applied version is recorded in the ``schema_version`` table, so ``upgrade()``
+only runs what is pending. Migrations must also be safe on databases that
+predate the version table, i.e. check before they alter.
+"""
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import ModuleType
+from typing import Callable
+
+from sqlalchemy import func, inspect, text
+
+from app.data.models import db, SchemaVersion
+
+from . import (
+    m0001_baseline,
+    m0002_newsletter_columns,
+    m0003_newsletter_mask,
+    m0004_subscriber_indexes,
+    m0005_subscriber_counters,
+    m0006_subscriber_search,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_THROTTLE_MS = 50
+
+
+class MigrationError(Exception):
+    """Raised when a migration fails; later migrations are not attempted."""
+
+
+@dataclass
+class MigrationContext:
+    """What a migration gets to work with, plus backfill tuning from the CLI."""
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    throttle_ms: int = DEFAULT_THROTTLE_MS
+    echo: Callable[[str], None] = field(default=logger.info)
+
+    @property
+    def session(self):
+        return db.session
+
+    @property
+    def engine(self):
+        return db.engine
+
+    def has_table(self, table: str) -> bool:
+        return inspect(db.engine).has_table(table)
+
+    def columns(self, table: str) -> set[str]:
+        return {c["name"] for c in inspect(db.engine).get_columns(table)}
+
+    def add_column(self, table: str, column: str, ddl: str) -> bool:
+        """ALTER TABLE ... ADD unless the column exists; returns True if added."""
+        if column in self.columns(table):
+            return False
+        self.echo(f"Adding column {table}.{column}")
+        db.session.execute(text(f"ALTER TABLE {table} ADD {column} {ddl}"))
+        db.session.commit()
+        return True
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    upgrade: Callable[[MigrationContext], None]
+
+    @classmethod
+    def from_module(cls, module: ModuleType) -> "Migration":
+        return cls(version=module.VERSION, name=module.NAME, upgrade=module.upgrade)
+
+
+MIGRATIONS = [
+    Migration.from_module(m)
+    for m in (
+        m0001_baseline,
+        m0002_newsletter_columns,
+        m0003_newsletter_mask,
+        m0004_subscriber_indexes,
+        m0005_subscriber_counters,
+        m0006_subscriber_search,
+    )
+]
+HEAD = MIGRATIONS[-1].version
+
+
+def applied_versions() -> set[int]:
+    """Versions recorded in schema_version; empty if the table is missing."""
+    if not inspect(db.engine).has_table(SchemaVersion.__tablename__):
+        return set()
+    return set(db.session.execute(db.select(SchemaVersion.version)).scalars())
+
+
+def current_version() -> int | None:
+    """Highest recorded version, or None if the table is missing. One SELECT."""
+    try:
+        return db.session.execute(db.select(func.max(SchemaVersion.version))).scalar()
+    except Exception:
+        db.session.rollback()
+        return None
+
+
+def pending_migrations(target: int | None = None) -> list[Migration]:
+    applied = applied_versions()
+    target = HEAD if target is None else target
+    return [m for m in MIGRATIONS if m.version not in applied and m.version <= target]
+
+
+def upgrade(target: int | None = None, ctx: MigrationContext | None = None) -> list[Migration]:
+    """Apply pending migrations in order up to ``target`` (default: HEAD)."""
+    ctx = ctx or MigrationContext()
+    # The version table itself is the one thing created unconditionally.
+    SchemaVersion.__table__.create(bind=db.engine, checkfirst=True)
+
+    applied = []
+    for migration in pending_migrations(target):
+        ctx.echo(f"Applying {migration.version:04d} {migration.name}")
+        start = time.perf_counter()
+        try:
+            migration.upgrade(ctx)
+            db.session.add(SchemaVersion(version=migration.version, name=migration.name, applied_at=datetime.utcnow()))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            raise MigrationError(f"Migration {migration.version:04d} {migration.name} failed: {e}") from e
+        ctx.echo(f"Applied {migration.version:04d} {migration.name} in {time.perf_counter() - start:.2f}s")
+        applied.append(migration)
+    return applied
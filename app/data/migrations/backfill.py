@@ -0,0 +1,106 @@
+"""Online backfills: UPDATE a large table in short keyset-ordered chunks.
+
+Each chunk picks the next ``chunk_size`` primary keys after the last one
+seen, updates exactly that key range and commits, so locks are held for one
+chunk at a time and concurrent writers only ever wait briefly. An optional
+pause between chunks leaves headroom for regular traffic.
+
+``backfill`` takes SQL expressions; ``process_in_chunks`` hands each chunk
+of rows to Python for values SQL cannot derive portably.
+"""
+import time
+from typing import Callable
+
+from sqlalchemy import Table, and_, select, update
+
+from app.data.models import db
+
+
+def backfill(
+    table: Table,
+    values: dict,
+    where=None,
+    chunk_size: int = 1000,
+    throttle_ms: int = 0,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Apply ``values`` to every row matching ``where``; returns rows updated.
+
+    ``values`` maps column names to values or SQL expressions, as for
+    ``update().values()``. The table must have a single-column primary key.
+    Safe to re-run: a crash leaves earlier chunks committed, and a rerun
+    simply updates them again.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    (key,) = table.primary_key.columns
+    session = db.session
+
+    total = 0
+    last = None
+    while True:
+        query = select(key).order_by(key).limit(chunk_size)
+        if where is not None:
+            query = query.where(where)
+        if last is not None:
+            query = query.where(key > last)
+        keys = session.execute(query).scalars().all()
+        if not keys:
+            break
+
+        condition = and_(key >= keys[0], key <= keys[-1])
+        if where is not None:
+            condition = and_(condition, where)
+        total += session.execute(update(table).where(condition).values(values)).rowcount
+        session.commit()
+
+        last = keys[-1]
+        if progress is not None:
+            progress(total)
+        if len(keys) < chunk_size:
+            break
+        if throttle_ms:
+            time.sleep(throttle_ms / 1000)
+    return total
+
+
+def process_in_chunks(
+    table: Table,
+    columns: list,
+    handler: Callable[[list], None],
+    chunk_size: int = 1000,
+    throttle_ms: int = 0,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Call ``handler(rows)`` per keyset-ordered chunk, committing after each.
+
+    Each row holds the primary key followed by ``columns``. The handler
+    issues its own statements on db.session; returns rows processed.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    (key,) = table.primary_key.columns
+    session = db.session
+
+    total = 0
+    last = None
+    while True:
+        query = select(key, *columns).order_by(key).limit(chunk_size)
+        if last is not None:
+            query = query.where(key > last)
+        rows = session.execute(query).all()
+        if not rows:
+            break
+
+        handler(rows)
+        session.commit()
+        total += len(rows)
+
+        last = rows[-1][0]
+        if progress is not None:
+            progress(total)
+        if len(rows) < chunk_size:
+            break
+        if throttle_ms:
+            time.sleep(throttle_ms / 1000)
+    return total
@@ -0,0 +1,11 @@
+"""Create any missing tables from the current models."""
+from app.data.models import db
+
+VERSION = 1
+NAME = "baseline"
+
+
+def upgrade(ctx) -> None:
+    # Only the primary; a read replica gets its schema via replication.
+    # checkfirst leaves existing tables alone, later migrations fill in columns.
+    db.create_all(bind_key=None)
@@ -0,0 +1,10 @@
+"""Add the legacy per-newsletter flag columns to older subscriber tables."""
+VERSION = 2
+NAME = "newsletter_columns"
+
+COLUMNS = ("nl_kost", "nl_mindset", "nl_kunskap", "nl_veckans_pass", "nl_jaine")
+
+
+def upgrade(ctx) -> None:
+    for column in COLUMNS:
+        ctx.add_column("subscribers", column, "BIT NOT NULL DEFAULT 0")
@@ -0,0 +1,43 @@
+"""Add newsletter_mask and backfill it from the legacy nl_* columns.
+
+The column is added with a constant default, which is a metadata-only change
+on MSSQL; the backfill then runs in short keyset-ordered chunks instead of
+one table-wide UPDATE. It only touches rows whose mask lacks a legacy bit and
+ORs the legacy bits in, so a rerun after a crash finishes the rows that were
+left and keeps bits of newsletters that have no legacy column.
+"""
+from sqlalchemy import case, true
+
+from app.data.models import Subscriber
+from app.data.newsletters import newsletter_registry
+
+from .backfill import backfill
+
+VERSION = 3
+NAME = "newsletter_mask"
+
+
+def mask_expression():
+    """SQL expression that derives newsletter_mask from the legacy columns."""
+    table = Subscriber.__table__
+    terms = [
+        case((table.c[n.legacy_column] == true(), n.flag), else_=0)
+        for n in newsletter_registry
+        if n.legacy_column
+    ]
+    return sum(terms[1:], terms[0])
+
+
+def upgrade(ctx) -> None:
+    ctx.add_column("subscribers", "newsletter_mask", "INT NOT NULL DEFAULT 0")
+    mask = Subscriber.__table__.c.newsletter_mask
+    legacy = mask_expression()
+    rows = backfill(
+        Subscriber.__table__,
+        {"newsletter_mask": mask.bitwise_or(legacy)},
+        where=mask.bitwise_and(legacy) != legacy,
+        chunk_size=ctx.chunk_size,
+        throttle_ms=ctx.throttle_ms,
+        progress=lambda done: ctx.echo(f"  newsletter_mask: {done} rows backfilled"),
+    )
+    ctx.echo(f"Backfilled newsletter_mask on {rows} rows")
@@ -0,0 +1,13 @@
+"""Create subscriber indexes missing from tables that predate them."""
+from app.data.models import db, Subscriber
+
+VERSION = 4
+NAME = "subscriber_indexes"
+
+
+def upgrade(ctx) -> None:
+    # Indexes on columns added by later migrations are created there.
+    columns = ctx.columns("subscribers")
+    for index in Subscriber.__table__.indexes:
+        if all(column.name in columns for column in index.columns):
+            index.create(bind=db.engine, checkfirst=True)
@@ -0,0 +1,11 @@
+"""Create subscriber_counters and populate it from the existing rows."""
+from app.data.models import db, SubscriberCounter
+from app.data.repositories.subscriber_repository import SubscriberRepository
+
+VERSION = 5
+NAME = "subscriber_counters"
+
+
+def upgrade(ctx) -> None:
+    SubscriberCounter.__table__.create(bind=db.engine, checkfirst=True)
+    SubscriberRepository().reconcile_counters()
@@ -0,0 +1,43 @@
+"""Add the lowercase search columns and the trigram table, then fill both."""
+from sqlalchemy import bindparam, delete, insert, update
+
+from app.data.models import db, Subscriber, SubscriberTrigram
+from app.data.search import search_columns, trigram_rows
+
+from .backfill import process_in_chunks
+
+VERSION = 6
+NAME = "subscriber_search"
+
+
+def upgrade(ctx) -> None:
+    ctx.add_column("subscribers", "name_lower", "VARCHAR(120) NULL")
+    ctx.add_column("subscribers", "email_domain", "VARCHAR(120) NULL")
+    SubscriberTrigram.__table__.create(bind=db.engine, checkfirst=True)
+    for index in Subscriber.__table__.indexes:
+        index.create(bind=db.engine, checkfirst=True)
+
+    table = Subscriber.__table__
+    trigrams = SubscriberTrigram.__table__
+
+    def index_rows(rows) -> None:
+        ids = [row.id for row in rows]
+        db.session.execute(
+            update(table).where(table.c.id == bindparam("row_id")),
+            [{"row_id": row.id, **search_columns(row.email, row.name)} for row in rows],
+        )
+        # Re-runnable: replace whatever a previous attempt left behind
+        db.session.execute(delete(trigrams).where(trigrams.c.subscriber_id.in_(ids)))
+        params = [param for row in rows for param in trigram_rows(row.id, row.email, row.name)]
+        if params:
+            db.session.execute(insert(trigrams), params)
+
+    rows = process_in_chunks(
+        table,
+        [table.c.email, table.c.name],
+        index_rows,
+        chunk_size=ctx.chunk_size,
+        throttle_ms=ctx.throttle_ms,
+        progress=lambda done: ctx.echo(f"  search index: {done} rows"),
+    )
+    ctx.echo(f"Indexed {rows} subscribers for search")
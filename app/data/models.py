@@ -2,7 +2,10 @@ from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 
-db = SQLAlchemy()
+from .newsletters import STORAGE_BITMASK, newsletter_registry
+from .routing import RoutingSession
+
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 
 
 class User(db.Model):
@@ -21,36 +24,109 @@ class User(db.Model):
         return check_password_hash(self.password_hash, password)
 
 
+class SchemaVersion(db.Model):
+    __tablename__ = 'schema_version'
+
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(120), nullable=False)
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class SubscriberCounter(db.Model):
+    """Running subscriber totals, updated in the same transaction as each write."""
+    __tablename__ = 'subscriber_counters'
+
+    name = db.Column(db.String(64), primary_key=True)
+    value = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+class SubscriberTrigram(db.Model):
+    """Substring search index: one row per distinct trigram of email and name."""
+    __tablename__ = 'subscriber_trigrams'
+    __table_args__ = (
+        db.Index("ix_subscriber_trigrams_subscriber_id", "subscriber_id"),
+    )
+
+    trigram = db.Column(db.Unicode(3), primary_key=True)
+    subscriber_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+
+
+def _newsletter_filter_indexes() -> tuple:
+    """Filtered (subscribed_at, id) index per legacy newsletter flag."""
+    return tuple(
+        db.Index(
+            f"ix_subscribers_{n.legacy_column}_date",
+            "subscribed_at",
+            "id",
+            sqlite_where=db.text(f"{n.legacy_column} = 1"),
+            mssql_where=db.text(f"{n.legacy_column} = 1"),
+        )
+        for n in newsletter_registry
+        if n.legacy_column
+    )
+
+
 class Subscriber(db.Model):
     __tablename__ = 'subscribers'
+    # One index per admin sort mode with id as the tie-breaker. Email sorts use
+    # the unique email index, which already gives a total order.
+    __table_args__ = (
+        db.Index("ix_subscribers_subscribed_at_id", "subscribed_at", "id"),
+        db.Index("ix_subscribers_name_id", "name", "id"),
+        db.Index("ix_subscribers_name_lower", "name_lower"),
+        db.Index("ix_subscribers_email_domain", "email_domain"),
+        *_newsletter_filter_indexes(),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
     name = db.Column(db.String(120), nullable=False)
     subscribed_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    # Newsletter subscriptions
+    # Lowercase search keys, see app/data/search.py
+    name_lower = db.Column(db.String(120))
+    email_domain = db.Column(db.String(120))
+
+    # Newsletter subscriptions: one bit per registered newsletter
+    newsletter_mask = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    # Legacy per-newsletter flags, kept in sync with newsletter_mask
     nl_kost = db.Column(db.Boolean, default=False)
     nl_mindset = db.Column(db.Boolean, default=False)
     nl_kunskap = db.Column(db.Boolean, default=False)
     nl_veckans_pass = db.Column(db.Boolean, default=False)
     nl_jaine = db.Column(db.Boolean, default=False)
 
+    @property
+    def newsletter_bits(self) -> int:
+        """Effective subscription mask for the configured storage mode."""
+        mask = self.newsletter_mask or 0
+        if newsletter_registry.storage == STORAGE_BITMASK:
+            return mask
+        for newsletter in newsletter_registry:
+            if newsletter.legacy_column:
+                if getattr(self, newsletter.legacy_column):
+                    mask |= newsletter.flag
+                else:
+                    mask &= ~newsletter.flag
+        return mask
+
+    @property
+    def row_version(self) -> int:
+        """Hash of every column value; changes whenever the stored row does.
+
+        Uses the per-process string hash, so only compare it within a worker.
+        """
+        return hash(tuple(getattr(self, key) for key in self.__table__.columns.keys()))
+
     def get_newsletters(self) -> list[str]:
         """Return list of subscribed newsletter names."""
-        newsletters = []
-        if self.nl_kost:
-            newsletters.append('kost')
-        if self.nl_mindset:
-            newsletters.append('mindset')
-        if self.nl_kunskap:
-            newsletters.append('kunskap')
-        if self.nl_veckans_pass:
-            newsletters.append('veckans_pass')
-        if self.nl_jaine:
-            newsletters.append('jaine')
-        return newsletters
+        return list(newsletter_registry.keys_for(self.newsletter_bits))
 
     def get_newsletter_count(self) -> int:
         """Return number of subscribed newsletters."""
-        return len(self.get_newsletters())
+        return newsletter_registry.count(self.newsletter_bits)
+
+    def has_newsletter(self, key: str) -> bool:
+        """Return True if subscribed to the newsletter with the given key."""
+        return newsletter_registry.contains(self.newsletter_bits, key)
@@ -0,0 +1,118 @@
+"""Registry mapping newsletter keys to bits in Subscriber.newsletter_mask.
+
+Adding a newsletter only needs a ``register()`` call here; no new column
+is required. The five original newsletters also keep their legacy ``nl_*``
+columns, which every write keeps in sync with the mask so the storage mode
+can be switched without a data migration.
+"""
+from dataclasses import dataclass
+
+STORAGE_COLUMNS = "columns"
+STORAGE_BITMASK = "bitmask"
+STORAGE_MODES = (STORAGE_COLUMNS, STORAGE_BITMASK)
+
+# Bits must fit a signed 32-bit INT column on MSSQL.
+MAX_BITS = 31
+
+
+@dataclass(frozen=True)
+class Newsletter:
+    key: str
+    bit: int
+    label: str
+    legacy_column: str | None = None
+
+    @property
+    def flag(self) -> int:
+        return 1 << self.bit
+
+
+class NewsletterRegistry:
+    """Ordered set of newsletters with constant-time mask helpers."""
+
+    def __init__(self, storage: str = STORAGE_COLUMNS):
+        self._by_key: dict[str, Newsletter] = {}
+        self._keys_by_mask: dict[int, tuple[str, ...]] = {}
+        self.all_bits = 0
+        self.storage = STORAGE_COLUMNS
+        self.configure(storage)
+
+    def configure(self, storage: str) -> None:
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"Unknown newsletter storage mode: {storage}")
+        self.storage = storage
+
+    def register(self, key: str, bit: int, label: str, legacy_column: str | None = None) -> Newsletter:
+        if key in self._by_key:
+            raise ValueError(f"Newsletter already registered: {key}")
+        if not 0 <= bit < MAX_BITS:
+            raise ValueError(f"Newsletter bit out of range: {bit}")
+        if self.all_bits & (1 << bit):
+            raise ValueError(f"Newsletter bit already in use: {bit}")
+
+        newsletter = Newsletter(key=key, bit=bit, label=label, legacy_column=legacy_column)
+        self._by_key[key] = newsletter
+        self._by_key = dict(sorted(self._by_key.items(), key=lambda item: item[1].bit))
+        self.all_bits |= newsletter.flag
+        self._keys_by_mask.clear()
+        return newsletter
+
+    def __iter__(self):
+        return iter(self._by_key.values())
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._by_key
+
+    def get(self, key: str | None) -> Newsletter | None:
+        return self._by_key.get(key) if key else None
+
+    def keys(self) -> list[str]:
+        return list(self._by_key)
+
+    def labels(self) -> dict[str, str]:
+        return {n.key: n.label for n in self}
+
+    def mask_for(self, newsletters: dict[str, bool] | None) -> int:
+        """Build a mask from a ``{key: subscribed}`` dict; unknown keys are ignored."""
+        mask = 0
+        if newsletters:
+            for key, subscribed in newsletters.items():
+                newsletter = self._by_key.get(key)
+                if newsletter is not None and subscribed:
+                    mask |= newsletter.flag
+        return mask
+
+    def keys_for(self, mask: int) -> tuple[str, ...]:
+        """Return the subscribed keys for a mask, memoized per distinct mask."""
+        keys = self._keys_by_mask.get(mask)
+        if keys is None:
+            keys = tuple(n.key for n in self if mask & n.flag)
+            self._keys_by_mask[mask] = keys
+        return keys
+
+    def contains(self, mask: int, key: str) -> bool:
+        newsletter = self._by_key.get(key)
+        return newsletter is not None and bool(mask & newsletter.flag)
+
+    def count(self, mask: int) -> int:
+        return (mask & self.all_bits).bit_count()
+
+    def column_values(self, newsletters: dict[str, bool] | None) -> dict[str, bool | int]:
+        """Column values for a full newsletter assignment (mask plus legacy flags)."""
+        mask = self.mask_for(newsletters)
+        values: dict[str, bool | int] = {
+            n.legacy_column: bool(mask & n.flag) for n in self if n.legacy_column
+        }
+        values["newsletter_mask"] = mask
+        return values
+
+
+newsletter_registry = NewsletterRegistry()
+newsletter_registry.register('kost', 0, 'Kost & Näring', legacy_column='nl_kost')
+newsletter_registry.register('mindset', 1, 'Mindset', legacy_column='nl_mindset')
+newsletter_registry.register('kunskap', 2, 'Kunskap & Forskning', legacy_column='nl_kunskap')
+newsletter_registry.register('veckans_pass', 3, 'Veckans Pass', legacy_column='nl_veckans_pass')
+newsletter_registry.register('jaine', 4, 'Träna med Jaine', legacy_column='nl_jaine')
@@ -0,0 +1,134 @@
+"""Connection pool instrumentation.
+
+Counters come from SQLAlchemy pool events plus two thin wrappers: one around
+the pool's internal ``_do_get`` to time how long a checkout waits for a free
+connection, and one around the dialect's ``do_ping`` to time pre-ping round
+trips. Metrics are per process, i.e. per gunicorn worker.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.data.models import db
+
+EXTENSION_KEY = "pool_metrics"
+
+
+@dataclass
+class Timing:
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def add(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class PoolMetrics:
+    def __init__(self, engine: Engine):
+        self._engine = engine
+        self._lock = threading.Lock()
+        self.checkout_wait = Timing()
+        self.pre_ping = Timing()
+        self.checkout_timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "engine_disposed", self._on_disposed)
+        self._wrap_pool(engine.pool)
+        self._wrap_ping(engine.dialect)
+
+    def snapshot(self) -> dict:
+        pool = self._engine.pool
+        with self._lock:
+            data = {
+                "pool_class": type(pool).__name__,
+                "checkout_wait": self.checkout_wait.to_dict(),
+                "pre_ping": self.pre_ping.to_dict(),
+                "checkout_timeouts": self.checkout_timeouts,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+            }
+        # QueuePool exposes live occupancy; StaticPool and friends do not.
+        for name in ("size", "checkedout", "checkedin", "overflow"):
+            method = getattr(pool, name, None)
+            data[name] = method() if callable(method) else None
+        return data
+
+    def _wrap_pool(self, pool) -> None:
+        do_get = pool._do_get
+
+        def timed_do_get():
+            start = time.perf_counter()
+            try:
+                return do_get()
+            except PoolTimeoutError:
+                with self._lock:
+                    self.checkout_timeouts += 1
+                raise
+            finally:
+                with self._lock:
+                    self.checkout_wait.add((time.perf_counter() - start) * 1000)
+
+        pool._do_get = timed_do_get
+
+    def _wrap_ping(self, dialect) -> None:
+        do_ping = dialect.do_ping
+
+        def timed_do_ping(dbapi_connection):
+            start = time.perf_counter()
+            try:
+                return do_ping(dbapi_connection)
+            finally:
+                with self._lock:
+                    self.pre_ping.add((time.perf_counter() - start) * 1000)
+
+        dialect.do_ping = timed_do_ping
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def _on_disposed(self, engine: Engine) -> None:
+        # dispose() swaps in a fresh pool, which needs its own wrapper.
+        self._wrap_pool(engine.pool)
+
+
+def init_pool_metrics(app: Flask) -> dict[str, PoolMetrics]:
+    """Instrument every engine of the app, keyed "primary" or by bind key."""
+    with app.app_context():
+        metrics = {
+            (key or "primary"): PoolMetrics(engine)
+            for key, engine in db.engines.items()
+        }
+    app.extensions[EXTENSION_KEY] = metrics
+    return metrics
+
+
+def pool_stats(app: Flask) -> dict:
+    metrics = app.extensions.get(EXTENSION_KEY, {})
+    return {
+        "pid": os.getpid(),
+        "engines": {name: m.snapshot() for name, m in metrics.items()},
+    }
@@ -0,0 +1,39 @@
+"""Query plan inspection helpers for checking index usage in tests.
+
+Only SQLite's ``EXPLAIN QUERY PLAN`` is supported; it is what the test
+suite runs against.
+"""
+import re
+
+from app.data.models import db
+
+_FULL_SCAN = re.compile(r"^SCAN \w+$")
+_TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def explain_query_plan(query) -> list[str]:
+    """Return the detail lines of SQLite's EXPLAIN QUERY PLAN for a query."""
+    connection = db.session.connection()
+    if connection.dialect.name != "sqlite":
+        raise ValueError(f"Query plans are only supported on SQLite, not {connection.dialect.name}")
+    statement = getattr(query, "statement", query)
+    compiled = statement.compile(dialect=connection.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup or ())
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params)
+    return [row[3] for row in rows]
+
+
+def plan_problems(plan: list[str]) -> list[str]:
+    """Plan lines that indicate a full table scan or a sort outside an index.
+
+    A walk in index order (``SCAN t USING INDEX ix``) is not flagged, since
+    it is how an ordered, limited listing reads; pair this with
+    plan_uses_index to check that it is the intended index.
+    """
+    return [line for line in plan if _FULL_SCAN.match(line) or line.startswith(_TEMP_SORT)]
+
+
+def plan_uses_index(plan: list[str], index: str) -> bool:
+    """True if a SCAN or SEARCH line of the plan reads through ``index``."""
+    pattern = re.compile(rf"^(SCAN|SEARCH) \w+ USING (COVERING )?INDEX {re.escape(index)}\b")
+    return any(pattern.match(line) for line in plan)
@@ -1,6 +1,7 @@
 """Data repositories package."""
 
+from .async_subscriber_repository import AsyncSubscriberRepository
 from .subscriber_repository import Subscriber, SubscriberRepository
 from .user_repository import User, UserRepository
 
-__all__ = ["Subscriber", "SubscriberRepository", "User", "UserRepository"]
+__all__ = ["AsyncSubscriberRepository", "Subscriber", "SubscriberRepository", "User", "UserRepository"]
@@ -0,0 +1,53 @@
+"""Signup writes on an AsyncSession, for the async request path (asgi.py)."""
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data.email_filter import get_email_filter
+from app.data.models import Subscriber, SubscriberTrigram
+from app.data.newsletters import newsletter_registry
+from app.data.repositories.subscriber_repository import (
+    DuplicateEmailError,
+    counter_deltas,
+    counter_update,
+    is_unique_violation,
+)
+from app.data.search import search_columns, trigram_rows
+
+
+class AsyncSubscriberRepository:
+    """SubscriberRepository.save() with awaited round trips.
+
+    The statements are the sync repository's, so both paths keep the
+    counters, data version, search index and email filter the same way.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def save(self, email: str, name: str, newsletters: dict[str, bool] | None = None) -> Subscriber:
+        """Insert a subscriber, its counters and search index in one transaction.
+
+        Raises DuplicateEmailError when the unique email constraint rejects
+        the row; the session is rolled back and stays usable.
+        """
+        values = newsletter_registry.column_values(newsletters)
+        subscriber = Subscriber(email=email, name=name, **values, **search_columns(email, name))
+        self._session.add(subscriber)
+        try:
+            await self._session.flush()
+            await self._session.execute(*counter_update(counter_deltas(values["newsletter_mask"])))
+            subscriber_id = subscriber.id
+            trigrams = trigram_rows(subscriber_id, email, name)
+            if trigrams:
+                await self._session.execute(insert(SubscriberTrigram.__table__), trigrams)
+            await self._session.commit()
+        except IntegrityError as e:
+            await self._session.rollback()
+            if is_unique_violation(e):
+                raise DuplicateEmailError(email) from e
+            raise
+        email_filter = get_email_filter()
+        if email_filter is not None:
+            email_filter.add(email, subscriber_id)
+        return subscriber
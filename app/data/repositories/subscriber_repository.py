@@ -1,103 +1,655 @@
-from datetime import datetime
-from app.data.models import db, Subscriber
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+from collections import Counter
+
+from sqlalchemy import and_, bindparam, case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from app.data.email_filter import get_email_filter
+from app.data.models import db, Subscriber, SubscriberCounter, SubscriberTrigram
+from app.data.newsletters import STORAGE_COLUMNS, newsletter_registry
+from app.data.routing import READ_ONLY
+from app.data.search import search_columns, search_predicate, trigram_rows
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+DEFAULT_SORT = "date_desc"
+
+STREAM_CHUNK_SIZE = 1000
+
+# MSSQL caps a statement at 2100 bound parameters; stay well below it.
+IN_CLAUSE_CHUNK_SIZE = 1000
+
+# sort_by -> (column, descending); id is always appended as the tie-breaker.
+SORT_MODES = {
+    "date_asc": (Subscriber.subscribed_at, False),
+    "date_desc": (Subscriber.subscribed_at, True),
+    "name_asc": (Subscriber.name, False),
+    "name_desc": (Subscriber.name, True),
+    "email_asc": (Subscriber.email, False),
+    "email_desc": (Subscriber.email, True),
+}
+
+def newsletter_predicate(key: str | None):
+    """SQL predicate selecting subscribers of a newsletter, or None if unknown.
+
+    Legacy newsletters are matched on their nl_* flag in "columns" mode; all
+    other cases use a bitwise test on newsletter_mask.
+    """
+    newsletter = newsletter_registry.get(key)
+    if newsletter is None:
+        return None
+    if newsletter_registry.storage == STORAGE_COLUMNS and newsletter.legacy_column:
+        return getattr(Subscriber, newsletter.legacy_column) == True
+    return Subscriber.newsletter_mask.op('&')(newsletter.flag) != 0
+
+
+def newsletter_bits_expression():
+    """SQL twin of Subscriber.newsletter_bits: the mask the predicates above test."""
+    if newsletter_registry.storage != STORAGE_COLUMNS:
+        return Subscriber.newsletter_mask.op('&')(newsletter_registry.all_bits)
+    legacy = [n for n in newsletter_registry if n.legacy_column]
+    other_bits = newsletter_registry.all_bits & ~sum(n.flag for n in legacy)
+    expression = Subscriber.newsletter_mask.op('&')(other_bits)
+    for n in legacy:
+        expression = expression + case((getattr(Subscriber, n.legacy_column) == True, n.flag), else_=0)
+    return expression
+
+
+# Names of the rows in subscriber_counters
+COUNTER_TOTAL = "total"
+COUNTER_NO_NEWSLETTERS = "no_newsletters"
+# Bumped by every write; read caches key on it and use it as the ETag.
+COUNTER_DATA_VERSION = "data_version"
+
+
+def counter_update(deltas: Counter):
+    """(statement, params) adding deltas to subscriber_counters as one executemany.
+
+    Every call also bumps the data version. Rows are updated in name order so
+    concurrent writers lock them in the same order. Missing rows are left
+    alone: until the table has been populated by reconcile_counters, stats()
+    does not read it.
+    """
+    deltas = Counter(deltas)
+    deltas[COUNTER_DATA_VERSION] += 1
+    params = [{"counter_name": name, "delta": delta} for name, delta in sorted(deltas.items()) if delta]
+    # Core table rather than the entity, so this is a plain executemany
+    # instead of an ORM bulk update by primary key.
+    counters = SubscriberCounter.__table__
+    statement = (
+        update(counters)
+        .where(counters.c.name == bindparam("counter_name"))
+        .values(value=counters.c.value + bindparam("delta"))
+    )
+    return statement, params
+
+
+def newsletter_counter(key: str) -> str:
+    return f"newsletter:{key}"
+
+
+def counter_deltas(bits: int, sign: int = 1, rows: int = 1) -> Counter:
+    """Counter changes for adding (sign=1) or removing (-1) rows with these bits."""
+    deltas = Counter({COUNTER_TOTAL: sign * rows})
+    keys = newsletter_registry.keys_for(bits)
+    for key in keys:
+        deltas[newsletter_counter(key)] += sign * rows
+    if not keys:
+        deltas[COUNTER_NO_NEWSLETTERS] += sign * rows
+    return deltas
+
+
+def change_deltas(old_bits: int, new_bits: int, rows: int = 1) -> Counter:
+    deltas = counter_deltas(new_bits, 1, rows)
+    deltas.update(counter_deltas(old_bits, -1, rows))
+    return deltas
+
+
+class DuplicateEmailError(Exception):
+    """Raised when an insert violates the unique email constraint.
+
+    ``email`` is None when a batch insert fails and the database does not
+    say which row was the duplicate.
+    """
+
+    def __init__(self, email: str | None = None):
+        super().__init__(f"Email already subscribed: {email}" if email else "Email already subscribed")
+        self.email = email
+
+
+def is_unique_violation(error: IntegrityError) -> bool:
+    """True for unique/duplicate-key violations on SQLite and MSSQL."""
+    message = str(error.orig).lower()
+    return "unique" in message or "duplicate" in message
+
+
+@dataclass
+class SubscriberPage:
+    items: list[Subscriber] = field(default_factory=list)
+    next_cursor: str | None = None
+    has_more: bool = False
+
+
+@dataclass
+class SubscriberStats:
+    total: int = 0
+    newsletters: dict[str, int] = field(default_factory=dict)
+    no_newsletters: int = 0
+    last_24h: int = 0
+    last_7d: int = 0
+
+    def to_dict(self) -> dict:
+        return vars(self).copy()
+
+
+def chunked(ids: list[int], size: int) -> list[list[int]]:
+    """Split ids into de-duplicated chunks of at most size elements."""
+    unique_ids = list(dict.fromkeys(ids))
+    return [unique_ids[i:i + size] for i in range(0, len(unique_ids), size)]
+
+
+def encode_cursor(subscriber: Subscriber, sort_by: str) -> str:
+    """Encode the keyset position of a row as an opaque URL-safe token."""
+    column, _ = SORT_MODES[sort_by]
+    value = getattr(subscriber, column.key)
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort_by, value, subscriber.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str | None, sort_by: str) -> tuple | None:
+    """Decode a cursor produced by encode_cursor, or None if absent/invalid."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        if cursor_sort != sort_by or not isinstance(last_id, int):
+            return None
+        if SORT_MODES[sort_by][0] is Subscriber.subscribed_at:
+            # subscribed_at is nullable; a NULL position is encoded as null
+            value = None if value is None else datetime.fromisoformat(value)
+        elif not isinstance(value, str):
+            return None
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        return None
+    return value, last_id
+
+
+def keyset_predicate(column, descending: bool, value, last_id: int):
+    """Rows after (value, last_id) in the order given by _order_by.
+
+    NULL sorts lowest, as it does natively on SQLite and SQL Server: first in
+    ascending order and last in descending order.
+    """
+    if value is None:
+        if descending:
+            return and_(column.is_(None), Subscriber.id < last_id)
+        return or_(column.is_not(None), and_(column.is_(None), Subscriber.id > last_id))
+    if descending:
+        return or_(column < value, and_(column == value, Subscriber.id < last_id), column.is_(None))
+    return or_(column > value, and_(column == value, Subscriber.id > last_id))
 
 
 class SubscriberRepository:
     def save(self, email: str, name: str, newsletters: dict[str, bool] | None = None) -> Subscriber:
-        subscriber = Subscriber(
-            email=email,
-            name=name,
-            nl_kost=newsletters.get('kost', False) if newsletters else False,
-            nl_mindset=newsletters.get('mindset', False) if newsletters else False,
-            nl_kunskap=newsletters.get('kunskap', False) if newsletters else False,
-            nl_veckans_pass=newsletters.get('veckans_pass', False) if newsletters else False,
-            nl_jaine=newsletters.get('jaine', False) if newsletters else False,
-        )
+        """Insert a subscriber, its counters and search index in one transaction.
+
+        Raises DuplicateEmailError when the unique email constraint rejects
+        the row; the session is rolled back and stays usable.
+        """
+        values = newsletter_registry.column_values(newsletters)
+        subscriber = Subscriber(email=email, name=name, **values, **search_columns(email, name))
         db.session.add(subscriber)
-        db.session.commit()
+        try:
+            db.session.flush()
+            self._apply_counter_deltas(counter_deltas(values["newsletter_mask"]))
+            subscriber_id = subscriber.id
+            self._index_search([(subscriber_id, email, name)])
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if is_unique_violation(e):
+                raise DuplicateEmailError(email) from e
+            raise
+        self._filter_add([(subscriber_id, email)])
         return subscriber
 
+    def save_many(self, rows: list[tuple[str, str, dict[str, bool] | None]]) -> int:
+        """Insert (email, name, newsletters) rows with one executemany and commit.
+
+        Raises DuplicateEmailError (without an email) if any row violates
+        the unique email constraint; the whole batch is rolled back in that
+        case.
+        """
+        if not rows:
+            return 0
+        now = datetime.utcnow()
+        values = [
+            {
+                "email": email,
+                "name": name,
+                "subscribed_at": now,
+                **newsletter_registry.column_values(newsletters),
+                **search_columns(email, name),
+            }
+            for email, name, newsletters in rows
+        ]
+        deltas = Counter()
+        for row in values:
+            deltas.update(counter_deltas(row["newsletter_mask"]))
+        try:
+            ids = db.session.scalars(
+                insert(Subscriber).returning(Subscriber.id, sort_by_parameter_order=True), values
+            ).all()
+            self._apply_counter_deltas(deltas)
+            self._index_search([(i, row["email"], row["name"]) for i, row in zip(ids, values)])
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if is_unique_violation(e):
+                raise DuplicateEmailError() from e
+            raise
+        self._filter_add([(i, row["email"]) for i, row in zip(ids, values)])
+        return len(values)
+
+    def existing_emails(self, emails: list[str]) -> set[str]:
+        """Return the subset of emails that are already subscribed.
+
+        Only emails the email filter might contain are looked up, so a batch
+        of new addresses usually costs no query at all. The filter can miss
+        very recent signups from other workers; callers still handle
+        DuplicateEmailError on insert.
+        """
+        email_filter = get_email_filter()
+        if email_filter is not None:
+            email_filter.refresh_if_due()
+            emails = email_filter.candidates(list(dict.fromkeys(emails)))
+        found: set[str] = set()
+        for chunk in chunked(emails, IN_CLAUSE_CHUNK_SIZE):
+            rows = db.session.execute(select(Subscriber.email).where(Subscriber.email.in_(chunk)))
+            found.update(row[0] for row in rows)
+        if email_filter is not None and email_filter.ready:
+            email_filter.record_false_positive(len(emails) - len(found))
+        return found
+
     def find_by_email(self, email: str) -> Subscriber | None:
+        # On the primary: this is a duplicate check, and a lagging replica would miss new rows
         return Subscriber.query.filter_by(email=email).first()
 
     def find_by_id(self, subscriber_id: int) -> Subscriber | None:
-        return Subscriber.query.get(subscriber_id)
+        statement = select(Subscriber).where(Subscriber.id == subscriber_id).execution_options(**READ_ONLY)
+        return db.session.scalars(statement).first()
 
     def exists(self, email: str) -> bool:
-        return Subscriber.query.filter_by(email=email).first() is not None
+        """True if subscribed; "definitely not" answers come from the email filter."""
+        email_filter = get_email_filter()
+        if email_filter is not None:
+            email_filter.refresh_if_due()
+            if not email_filter.might_contain(email):
+                return False
+        found = Subscriber.query.filter_by(email=email).first() is not None
+        if not found and email_filter is not None and email_filter.ready:
+            email_filter.record_false_positive()
+        return found
 
     def get_all(self, sort_by: str = "date_desc", newsletter_filter: str | None = None) -> list[Subscriber]:
-        query = Subscriber.query
-
-        # Filter by newsletter
-        if newsletter_filter:
-            if newsletter_filter == 'kost':
-                query = query.filter(Subscriber.nl_kost == True)
-            elif newsletter_filter == 'mindset':
-                query = query.filter(Subscriber.nl_mindset == True)
-            elif newsletter_filter == 'kunskap':
-                query = query.filter(Subscriber.nl_kunskap == True)
-            elif newsletter_filter == 'veckans_pass':
-                query = query.filter(Subscriber.nl_veckans_pass == True)
-            elif newsletter_filter == 'jaine':
-                query = query.filter(Subscriber.nl_jaine == True)
-
-        # Sort
-        if sort_by == "date_asc":
-            query = query.order_by(Subscriber.subscribed_at.asc())
-        elif sort_by == "date_desc":
-            query = query.order_by(Subscriber.subscribed_at.desc())
-        elif sort_by == "name_asc":
-            query = query.order_by(Subscriber.name.asc())
-        elif sort_by == "name_desc":
-            query = query.order_by(Subscriber.name.desc())
-        elif sort_by == "email_asc":
-            query = query.order_by(Subscriber.email.asc())
-        elif sort_by == "email_desc":
-            query = query.order_by(Subscriber.email.desc())
-        else:
-            query = query.order_by(Subscriber.subscribed_at.desc())
-
-        return query.all()
+        return self.query_all(sort_by, newsletter_filter).all()
+
+    def query_all(self, sort_by: str = "date_desc", newsletter_filter: str | None = None):
+        """Unexecuted query behind get_all, for streaming or plan inspection."""
+        query = self._filtered_query(newsletter_filter)
+        column, descending = SORT_MODES.get(sort_by, SORT_MODES[DEFAULT_SORT])
+        return query.order_by(*self._order_by(column, descending))
+
+    def iter_all(
+        self,
+        sort_by: str = "date_desc",
+        newsletter_filter: str | None = None,
+        chunk_size: int = STREAM_CHUNK_SIZE,
+    ) -> Iterator[Subscriber]:
+        """Stream subscribers through a server-side cursor, chunk_size rows at a time."""
+        return iter(self.query_all(sort_by, newsletter_filter).yield_per(chunk_size))
+
+    def get_page(
+        self,
+        sort_by: str = "date_desc",
+        newsletter_filter: str | None = None,
+        cursor: str | None = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        search: str | None = None,
+    ) -> SubscriberPage:
+        """Return one page of subscribers using keyset (cursor) pagination.
+
+        The cursor encodes the sort value and id of the last row on the
+        previous page, so every page is a bounded index range scan instead
+        of an OFFSET that grows with depth. An invalid cursor restarts from
+        the first page. ``search`` narrows the rows, see app/data/search.py.
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        if sort_by not in SORT_MODES:
+            sort_by = DEFAULT_SORT
+        column, descending = SORT_MODES[sort_by]
+
+        query = self._filtered_query(newsletter_filter, search)
+        position = decode_cursor(cursor, sort_by)
+        if position is not None:
+            query = query.filter(keyset_predicate(column, descending, *position))
+
+        rows = query.order_by(*self._order_by(column, descending)).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        items = rows[:limit]
+        next_cursor = encode_cursor(items[-1], sort_by) if has_more else None
+        return SubscriberPage(items=items, next_cursor=next_cursor, has_more=has_more)
+
+    def count(self, newsletter_filter: str | None = None, search: str | None = None) -> int:
+        return self._filtered_query(newsletter_filter, search).order_by(None).count()
+
+    def stats(self, now: datetime | None = None) -> SubscriberStats:
+        """Totals from subscriber_counters plus an index range count of recent signups.
+
+        Falls back to a full aggregate scan while the counters table has not
+        been populated yet (see reconcile_counters).
+        """
+        now = now or datetime.utcnow()
+        counters = dict(db.session.execute(
+            select(SubscriberCounter.name, SubscriberCounter.value).execution_options(**READ_ONLY)
+        ).all())
+        if COUNTER_TOTAL not in counters:
+            return self.aggregate_stats(now)
+
+        week_ago = now - timedelta(days=7)
+        last_24h, last_7d = db.session.execute(
+            select(
+                func.coalesce(func.sum(case((Subscriber.subscribed_at >= now - timedelta(days=1), 1), else_=0)), 0),
+                func.count(),
+            )
+            .where(Subscriber.subscribed_at >= week_ago)
+            .execution_options(**READ_ONLY)
+        ).one()
+        return SubscriberStats(
+            total=counters[COUNTER_TOTAL],
+            newsletters={key: counters.get(newsletter_counter(key), 0) for key in newsletter_registry.keys()},
+            no_newsletters=counters.get(COUNTER_NO_NEWSLETTERS, 0),
+            last_24h=last_24h,
+            last_7d=last_7d,
+        )
+
+    def data_version(self) -> int | None:
+        """Current data version, or None until the counters are populated."""
+        return db.session.execute(
+            select(SubscriberCounter.value)
+            .where(SubscriberCounter.name == COUNTER_DATA_VERSION)
+            .execution_options(**READ_ONLY)
+        ).scalar()
+
+    def aggregate_stats(self, now: datetime | None = None, use_replica: bool = True) -> SubscriberStats:
+        """The same figures computed from the rows in one COUNT + SUM(CASE) scan."""
+        now = now or datetime.utcnow()
+        keys = newsletter_registry.keys()
+        predicates = [newsletter_predicate(key) for key in keys]
+
+        def count_where(condition):
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        query = select(
+            func.count(),
+            # NULL flags land in the else branch, i.e. count as "no newsletter"
+            func.coalesce(func.sum(case((or_(*predicates), 0), else_=1)), 0),
+            count_where(Subscriber.subscribed_at >= now - timedelta(days=1)),
+            count_where(Subscriber.subscribed_at >= now - timedelta(days=7)),
+            *(count_where(predicate) for predicate in predicates),
+        ).select_from(Subscriber)
+        if use_replica:
+            query = query.execution_options(**READ_ONLY)
+
+        total, no_newsletters, last_24h, last_7d, *per_newsletter = db.session.execute(query).one()
+        return SubscriberStats(
+            total=total,
+            newsletters=dict(zip(keys, per_newsletter)),
+            no_newsletters=no_newsletters,
+            last_24h=last_24h,
+            last_7d=last_7d,
+        )
+
+    def reconcile_counters(self) -> dict[str, tuple[int, int]]:
+        """Rebuild subscriber_counters from the rows on the primary.
+
+        Returns {counter: (stored, actual)} for every counter that drifted,
+        including ones that were missing. Writes that commit while this runs
+        can be missed; run it again if it reported drift under load.
+        """
+        actual_stats = self.aggregate_stats(use_replica=False)
+        actual = {
+            COUNTER_TOTAL: actual_stats.total,
+            COUNTER_NO_NEWSLETTERS: actual_stats.no_newsletters,
+            **{newsletter_counter(key): count for key, count in actual_stats.newsletters.items()},
+        }
+        try:
+            stored = dict(db.session.execute(select(SubscriberCounter.name, SubscriberCounter.value)).all())
+            drift = {
+                name: (stored.get(name), value)
+                for name, value in actual.items()
+                if stored.get(name) != value
+            }
+            # The rebuilt counts are a change readers must see
+            version = stored.get(COUNTER_DATA_VERSION, 0) + 1
+            db.session.execute(delete(SubscriberCounter))
+            db.session.execute(
+                insert(SubscriberCounter),
+                [{"name": n, "value": v} for n, v in {**actual, COUNTER_DATA_VERSION: version}.items()],
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return drift
+
+    def _lock_counters(self) -> None:
+        """Lock the data version row before reading rows whose change sets counter deltas.
+
+        A concurrent delete or edit of the same rows then waits here until
+        this transaction commits and reads what it left, instead of applying
+        deltas for rows that are already gone or changed. It bumps the data
+        version once more than strictly needed, which readers only see as a
+        new version.
+        """
+        counters = SubscriberCounter.__table__
+        db.session.execute(
+            update(counters)
+            .where(counters.c.name == COUNTER_DATA_VERSION)
+            .values(value=counters.c.value + 1)
+        )
+
+    def _apply_counter_deltas(self, deltas: Counter) -> None:
+        """Add deltas to subscriber_counters inside the caller's transaction."""
+        db.session.execute(*counter_update(deltas))
+
+    def _index_search(self, rows: list[tuple[int, str, str]]) -> None:
+        """Insert trigram rows for (id, email, name) inside the caller's transaction."""
+        params = [param for row in rows for param in trigram_rows(*row)]
+        if params:
+            db.session.execute(insert(SubscriberTrigram.__table__), params)
+
+    def _unindex_search(self, subscriber_ids: list[int]) -> None:
+        db.session.execute(
+            delete(SubscriberTrigram.__table__).where(SubscriberTrigram.subscriber_id.in_(subscriber_ids))
+        )
+
+    def _filter_add(self, rows: list[tuple[int, str]]) -> None:
+        """Add committed (id, email) rows to the email filter."""
+        email_filter = get_email_filter()
+        if email_filter is not None:
+            for subscriber_id, email in rows:
+                email_filter.add(email, subscriber_id)
+
+    def _filter_remove(self, emails: list[str]) -> None:
+        email_filter = get_email_filter()
+        if email_filter is not None:
+            for email in emails:
+                email_filter.remove(email)
+
+    def _bits_histogram(self, subscriber_ids: Iterable[int]) -> Counter:
+        """{effective newsletter bits: row count} for the given ids, on the primary."""
+        bits = newsletter_bits_expression()
+        rows = db.session.execute(
+            select(bits, func.count()).where(Subscriber.id.in_(list(subscriber_ids))).group_by(bits)
+        )
+        return Counter(dict(rows.all()))
+
+    def _filtered_query(self, newsletter_filter: str | None, search: str | None = None):
+        query = Subscriber.query.execution_options(**READ_ONLY)
+        for predicate in (newsletter_predicate(newsletter_filter), search_predicate(search)):
+            if predicate is not None:
+                query = query.filter(predicate)
+        return query
+
+    def _find_on_primary(self, subscriber_id: int) -> Subscriber | None:
+        # populate_existing refreshes a row that was loaded from the replica
+        return db.session.get(Subscriber, subscriber_id, populate_existing=True)
+
+    def _order_by(self, column, descending: bool) -> tuple:
+        # No NULLS FIRST/LAST: SQL Server lacks it, and both databases already
+        # sort NULL lowest, which keyset_predicate relies on
+        if descending:
+            return column.desc(), Subscriber.id.desc()
+        return column.asc(), Subscriber.id.asc()
 
     def update(self, subscriber_id: int, email: str, name: str, newsletters: dict[str, bool] | None = None) -> Subscriber | None:
-        subscriber = self.find_by_id(subscriber_id)
-        if subscriber:
-            subscriber.email = email
-            subscriber.name = name
-            if newsletters is not None:
-                subscriber.nl_kost = newsletters.get('kost', False)
-                subscriber.nl_mindset = newsletters.get('mindset', False)
-                subscriber.nl_kunskap = newsletters.get('kunskap', False)
-                subscriber.nl_veckans_pass = newsletters.get('veckans_pass', False)
-                subscriber.nl_jaine = newsletters.get('jaine', False)
+        self._lock_counters()
+        subscriber = self._find_on_primary(subscriber_id)
+        if not subscriber:
+            db.session.rollback()
+            return None
+        old_email = subscriber.email
+        if (email, name) != (subscriber.email, subscriber.name):
+            self._unindex_search([subscriber_id])
+            self._index_search([(subscriber_id, email, name)])
+            for column, value in search_columns(email, name).items():
+                setattr(subscriber, column, value)
+        subscriber.email = email
+        subscriber.name = name
+        deltas = Counter()
+        if newsletters is not None:
+            old_bits = subscriber.newsletter_bits
+            for column, value in newsletter_registry.column_values(newsletters).items():
+                setattr(subscriber, column, value)
+            deltas = change_deltas(old_bits, subscriber.newsletter_bits)
+        try:
+            self._apply_counter_deltas(deltas)
             db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            if is_unique_violation(e):
+                raise DuplicateEmailError(email) from e
+            raise
+        if email != old_email:
+            self._filter_remove([old_email])
+            self._filter_add([(subscriber_id, email)])
         return subscriber
 
     def update_newsletters_bulk(self, subscriber_ids: list[int], newsletters: dict[str, bool | None]) -> int:
-        """Update newsletters for multiple subscribers. None means don't change."""
+        """Update newsletters for multiple subscribers. None means don't change.
+
+        Runs one UPDATE ... WHERE id IN (...) per chunk of ids, all in a
+        single transaction, and returns the row count reported by the database.
+        """
+        set_bits = 0
+        clear_bits = 0
+        values = {}
+        for newsletter in newsletter_registry:
+            subscribed = newsletters.get(newsletter.key)
+            if subscribed is None:
+                continue
+            if subscribed:
+                set_bits |= newsletter.flag
+            else:
+                clear_bits |= newsletter.flag
+            if newsletter.legacy_column:
+                values[newsletter.legacy_column] = bool(subscribed)
+        if not (set_bits or clear_bits) or not subscriber_ids:
+            return 0
+        values["newsletter_mask"] = (
+            Subscriber.newsletter_mask.op('|')(set_bits).op('&')(newsletter_registry.all_bits & ~clear_bits)
+        )
+
         updated = 0
-        for sid in subscriber_ids:
-            subscriber = self.find_by_id(sid)
-            if subscriber:
-                if newsletters.get('kost') is not None:
-                    subscriber.nl_kost = newsletters['kost']
-                if newsletters.get('mindset') is not None:
-                    subscriber.nl_mindset = newsletters['mindset']
-                if newsletters.get('kunskap') is not None:
-                    subscriber.nl_kunskap = newsletters['kunskap']
-                if newsletters.get('veckans_pass') is not None:
-                    subscriber.nl_veckans_pass = newsletters['veckans_pass']
-                if newsletters.get('jaine') is not None:
-                    subscriber.nl_jaine = newsletters['jaine']
-                updated += 1
-        db.session.commit()
+        try:
+            self._lock_counters()
+            for chunk in chunked(subscriber_ids, IN_CLAUSE_CHUNK_SIZE):
+                deltas = Counter()
+                for old_bits, rows in self._bits_histogram(chunk).items():
+                    new_bits = (old_bits | set_bits) & ~clear_bits & newsletter_registry.all_bits
+                    deltas.update(change_deltas(old_bits, new_bits, rows))
+                self._apply_counter_deltas(deltas)
+                result = db.session.execute(
+                    update(Subscriber)
+                    .where(Subscriber.id.in_(chunk))
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                updated += result.rowcount
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
         return updated
 
     def delete(self, subscriber_id: int) -> bool:
-        subscriber = self.find_by_id(subscriber_id)
-        if subscriber:
+        try:
+            self._lock_counters()
+            subscriber = self._find_on_primary(subscriber_id)
+            if not subscriber:
+                db.session.rollback()
+                return False
+            email = subscriber.email
+            self._apply_counter_deltas(counter_deltas(subscriber.newsletter_bits, -1))
+            self._unindex_search([subscriber_id])
             db.session.delete(subscriber)
             db.session.commit()
-            return True
-        return False
+        except Exception:
+            db.session.rollback()
+            raise
+        self._filter_remove([email])
+        return True
+
+    def delete_bulk(self, subscriber_ids: list[int]) -> int:
+        """Delete many subscribers with chunked DELETE ... WHERE id IN (...).
+
+        All chunks run in one transaction; returns the number of rows deleted.
+        """
+        if not subscriber_ids:
+            return 0
+
+        deleted = 0
+        track_emails = get_email_filter() is not None
+        deleted_emails: list[str] = []
+        try:
+            self._lock_counters()
+            for chunk in chunked(subscriber_ids, IN_CLAUSE_CHUNK_SIZE):
+                deltas = Counter()
+                for bits, rows in self._bits_histogram(chunk).items():
+                    deltas.update(counter_deltas(bits, -1, rows))
+                self._apply_counter_deltas(deltas)
+                self._unindex_search(chunk)
+                if track_emails:
+                    deleted_emails += db.session.scalars(select(Subscriber.email).where(Subscriber.id.in_(chunk)))
+                result = db.session.execute(
+                    delete(Subscriber)
+                    .where(Subscriber.id.in_(chunk))
+                    .execution_options(synchronize_session=False)
+                )
+                deleted += result.rowcount
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        self._filter_remove(deleted_emails)
+        return deleted
@@ -0,0 +1,41 @@
+"""Session routing of read-only queries to an optional read replica.
+
+Repository read methods tag their statements with ``REPLICA_OPTION``; the
+session sends tagged SELECTs to the ``replica`` bind when one is configured.
+Everything else stays on the primary, and so do all reads:
+
+* in a session that has already written (same request sees its own writes);
+* while ``g.read_primary`` is set, which the admin blueprint does for a
+  short window after an edit so the next page load is not served stale data.
+"""
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import Select
+
+REPLICA_BIND_KEY = "replica"
+REPLICA_OPTION = "use_replica"
+
+# Execution options that mark a read as safe to serve from the replica.
+READ_ONLY = {REPLICA_OPTION: True}
+
+
+class RoutingSession(Session):
+    def __init__(self, db, **kwargs):
+        super().__init__(db, **kwargs)
+        self.has_written = False
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._use_replica(clause):
+            return self._db.engines[REPLICA_BIND_KEY]
+        if self._flushing or (clause is not None and not isinstance(clause, Select)):
+            self.has_written = True
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _use_replica(self, clause) -> bool:
+        if not isinstance(clause, Select) or self._flushing or self.has_written:
+            return False
+        if not clause.get_execution_options().get(REPLICA_OPTION):
+            return False
+        if has_app_context() and g.get("read_primary"):
+            return False
+        return REPLICA_BIND_KEY in self._db.engines
@@ -0,0 +1,120 @@
+"""Indexed subscriber search on email, name and email domain.
+
+Every search first runs a bounded probe (at most SELECTIVE_ROWS index
+entries) to see whether the term is selective:
+
+* Selective prefix matches use plain range predicates
+  (``col >= 'ab' AND col < 'ac'``) on lowercase columns, which every database
+  answers from a b-tree index; ``LIKE 'ab%'`` only gets that treatment on
+  SQLite under a NOCASE collation.
+* Selective substring matches (three characters or more) use the posting
+  list of the rarest trigram in ``subscriber_trigrams`` as the candidate set,
+  and a ``LIKE`` re-check drops false positives.
+* A term that is not selective matches much of the table anyway, so the
+  query uses a plain ``LIKE``, walks the sort index and stops as soon as a
+  page is full instead of sorting every match.
+
+Emails are stored normalized to lowercase, so ``email`` itself is the
+lowercase email column.
+"""
+from sqlalchemy import and_, func, or_, select
+
+from app.data.models import db, Subscriber, SubscriberTrigram
+from app.data.routing import READ_ONLY
+
+TRIGRAM_SIZE = 3
+# Terms matching fewer index entries than this drive the search from the index.
+SELECTIVE_ROWS = 5000
+
+
+def normalize_search_term(term: str | None) -> str:
+    return " ".join((term or "").lower().split())
+
+
+def email_domain(email: str) -> str:
+    return email.rpartition("@")[2].lower()
+
+
+def search_columns(email: str, name: str) -> dict[str, str]:
+    """Values for the lowercase search columns of a subscriber row."""
+    return {"name_lower": name.lower(), "email_domain": email_domain(email)}
+
+
+def trigrams(text: str) -> set[str]:
+    text = text.lower()
+    return {text[i:i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+def subscriber_trigrams(email: str, name: str) -> set[str]:
+    # Per field, so no trigram spans the boundary between email and name
+    return trigrams(email) | trigrams(name)
+
+
+def trigram_rows(subscriber_id: int, email: str, name: str) -> list[dict]:
+    return [
+        {"trigram": gram, "subscriber_id": subscriber_id}
+        for gram in sorted(subscriber_trigrams(email, name))
+    ]
+
+
+def prefix_range(column, prefix: str):
+    """Sargable equivalent of ``column LIKE 'prefix%'``."""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return and_(column >= prefix, column < upper)
+
+
+def search_predicate(term: str | None):
+    """WHERE clause for a search term, or None for an empty term.
+
+    ``@domain`` matches the email domain by prefix. Shorter terms match any
+    of email, name and domain by prefix; longer ones by substring.
+    """
+    term = normalize_search_term(term)
+    if term.startswith("@"):
+        domain = term[1:]
+        if not domain:
+            return None
+        return _prefix_predicate([Subscriber.email_domain], domain)
+    if not term:
+        return None
+    if len(term) < TRIGRAM_SIZE:
+        return _prefix_predicate([Subscriber.email, Subscriber.name_lower, Subscriber.email_domain], term)
+
+    substring = or_(
+        Subscriber.email.contains(term, autoescape=True),
+        Subscriber.name_lower.contains(term, autoescape=True),
+    )
+    gram, rows = _rarest_trigram(trigrams(term))
+    if rows >= SELECTIVE_ROWS:
+        return substring
+    candidates = select(SubscriberTrigram.subscriber_id).where(SubscriberTrigram.trigram == gram)
+    return and_(Subscriber.id.in_(candidates), substring)
+
+
+def _prefix_predicate(columns: list, prefix: str):
+    ranges = or_(*(prefix_range(column, prefix) for column in columns))
+    if _count_capped(select(Subscriber.id).where(ranges), SELECTIVE_ROWS) < SELECTIVE_ROWS:
+        return ranges
+    return or_(*(column.startswith(prefix, autoescape=True) for column in columns))
+
+
+def _rarest_trigram(grams: set[str]) -> tuple[str, int]:
+    """(trigram, row count capped at SELECTIVE_ROWS) for the rarest gram."""
+    best = ("", SELECTIVE_ROWS)
+    for gram in sorted(grams):
+        rows = _count_capped(
+            select(SubscriberTrigram.subscriber_id).where(SubscriberTrigram.trigram == gram), best[1]
+        )
+        if rows < best[1]:
+            best = (gram, rows)
+        if rows == 0:
+            break
+    return best
+
+
+def _count_capped(query, cap: int) -> int:
+    """COUNT(*) of a query that stops reading after ``cap`` rows."""
+    capped = query.limit(cap).subquery()
+    return db.session.execute(
+        select(func.count()).select_from(capped).execution_options(**READ_ONLY)
+    ).scalar()
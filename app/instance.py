@@ -0,0 +1,29 @@
+"""Private per-host scratch directories under the Flask instance folder.
+
+The SQLite result cache and the Jinja bytecode cache load pickled or
+marshalled code from disk, so their files must not be writable by anyone
+else. A fixed path in the shared temp directory could be created by another
+local user first; the instance folder belongs to the app.
+"""
+import os
+import stat
+
+from flask import Flask
+
+
+def private_instance_dir(app: Flask, name: str) -> str:
+    """Create ``instance_path/name`` with mode 0700 and return it.
+
+    Raises RuntimeError if the directory is a symlink or is owned by another
+    user; a directory we own is tightened to 0700.
+    """
+    path = os.path.join(app.instance_path, name)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise RuntimeError(f"{path} is not a directory")
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        raise RuntimeError(f"{path} is owned by another user")
+    if stat.S_IMODE(info.st_mode) & 0o077:
+        os.chmod(path, 0o700)
+    return path
@@ -0,0 +1,91 @@
+"""Process lifecycle hooks for pre-forking servers (see gunicorn.conf.py).
+
+With ``preload_app`` the app is created once in the gunicorn master and
+forked into every worker, so workers share its memory copy-on-write and
+start faster. Anything that owns a socket, file handle or thread must then
+be renewed in the child: ``after_fork`` does that for the SQLAlchemy pools
+(bootstrapping the in-memory SQLite database each worker then gets anew),
+the SQLite-backed caches, the write-behind queue, the email filter and the
+asyncio engine.
+
+``warm_templates`` and ``warm_pool`` move first-request costs (compiling
+templates, opening DB connections) to before the worker accepts traffic.
+"""
+import logging
+import os
+import time
+
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from app import BOOT_STATS_KEY, _is_in_memory_db
+from app.business.services import result_cache, subscription_queue
+from app.data import async_db, email_filter
+from app.data.bootstrap import bootstrap_database
+from app.data.models import db
+from app.presentation import rate_limit
+
+logger = logging.getLogger(__name__)
+
+
+def after_fork(app: Flask) -> None:
+    """Make a worker's inherited copy of a preloaded app safe to use."""
+    with app.app_context():
+        for engine in db.engines.values():
+            # Drop the parent's pooled connections without closing them under it
+            engine.dispose(close=False)
+        if _is_in_memory_db(app):
+            # The new connection opens a new, empty in-memory database
+            bootstrap_database()
+
+    for key in (result_cache.EXTENSION_KEY, rate_limit.EXTENSION_KEY):
+        extension = app.extensions.get(key)
+        if extension is not None and hasattr(extension.backend, "after_fork"):
+            extension.backend.after_fork()
+
+    async_database = app.extensions.get(async_db.EXTENSION_KEY)
+    if async_database is not None:
+        async_database.after_fork()
+
+    queue = app.extensions.get(subscription_queue.EXTENSION_KEY)
+    if queue is not None:
+        queue.after_fork()
+
+    emails = app.extensions.get(email_filter.EXTENSION_KEY)
+    if emails is not None:
+        emails.after_fork()
+        if not emails.ready:
+            # The parent's build thread was not copied
+            email_filter.start_build(app, emails)
+
+    if BOOT_STATS_KEY in app.extensions:
+        app.extensions[BOOT_STATS_KEY] = {**app.extensions[BOOT_STATS_KEY], "pid": os.getpid(), "preloaded": True}
+
+
+def warm_templates(app: Flask) -> float:
+    """Load every template; returns the time taken in ms."""
+    start = time.perf_counter()
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+    return (time.perf_counter() - start) * 1000
+
+
+def warm_pool(app: Flask, connections: int = 1) -> float:
+    """Open up to ``connections`` pooled connections per engine; returns ms."""
+    start = time.perf_counter()
+    with app.app_context():
+        for engine in db.engines.values():
+            count = min(connections, engine.pool.size()) if isinstance(engine.pool, QueuePool) else 1
+            opened = []
+            try:
+                for _ in range(count):
+                    conn = engine.connect()
+                    opened.append(conn)
+                    conn.execute(text("SELECT 1"))
+            except Exception as e:
+                logger.warning(f"Pool warm-up failed for {engine.url.render_as_string()}: {e}")
+            finally:
+                for conn in opened:
+                    conn.close()
+    return (time.perf_counter() - start) * 1000
@@ -0,0 +1,128 @@
+"""ASGI entry point: async views on the event loop, everything else through Flask.
+
+Served by ``asgi.py`` under an ASGI worker (uvicorn). Requests listed in
+ASYNC_VIEWS run as coroutines on the worker's event loop, so one worker can
+have many signups waiting on the database at once. Every other request goes
+to the Flask WSGI app, with its middlewares, on a thread pool (a2wsgi).
+
+An async view runs inside a normal Flask request context built from the
+ASGI scope. ``request``, ``render_template``, ``url_for``, ``before_request``
+and error handlers work as in a sync view. Flask keeps its contexts in
+contextvars, so concurrent requests on the loop do not see each other's.
+The lifespan shutdown disposes the asyncio engine.
+"""
+import io
+
+from a2wsgi import WSGIMiddleware
+from flask import Flask, Response
+from werkzeug.exceptions import HTTPException
+
+from app.data.async_db import EXTENSION_KEY as ASYNC_DB_KEY
+from app.presentation.routes.public import subscribe_confirm_async
+
+# (method, path) -> coroutine view; the sync route for the same URL stays for WSGI servers
+ASYNC_VIEWS = {
+    ("POST", "/subscribe/confirm"): subscribe_confirm_async,
+}
+# Threads per worker for requests that go through the WSGI app
+WSGI_THREADS = 10
+
+
+class AsgiApp:
+    def __init__(self, flask_app: Flask, async_views: dict | None = None, wsgi_threads: int = WSGI_THREADS):
+        self.flask_app = flask_app
+        self.async_views = ASYNC_VIEWS if async_views is None else async_views
+        self.wsgi = WSGIMiddleware(flask_app, workers=wsgi_threads)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        view = self.async_views.get((scope.get("method"), scope.get("path"))) if scope["type"] == "http" else None
+        if view is None:
+            await self.wsgi(scope, receive, send)
+            return
+
+        environ = build_environ(scope, await _read_body(receive))
+        response = await self._dispatch(view, environ)
+        headers = [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in response.headers.items()]
+        await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": response.get_data()})
+
+    async def _dispatch(self, view, environ: dict) -> Response:
+        """Flask's full_dispatch_request for a coroutine view."""
+        app = self.flask_app
+        with app.request_context(environ):
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = await view()
+            except HTTPException as e:
+                rv = app.handle_user_exception(e)
+            except Exception as e:
+                rv = app.handle_exception(e)
+            return app.process_response(app.make_response(rv))
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                async_db = self.flask_app.extensions.get(ASYNC_DB_KEY)
+                if async_db is not None:
+                    await async_db.dispose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+def build_environ(scope: dict, body: bytes) -> dict:
+    """WSGI environ for an ASGI HTTP scope (PEP 3333 from the ASGI spec)."""
+    script_name = scope.get("root_path", "").encode().decode("latin-1")
+    path_info = scope["path"].encode().decode("latin-1")
+    if script_name and path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": script_name,
+        "PATH_INFO": path_info,
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "REMOTE_ADDR": scope["client"][0] if scope.get("client") else "",
+        "CONTENT_LENGTH": str(len(body)),
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": io.StringIO(),
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        value = raw_value.decode("latin-1")
+        if name == "CONTENT_LENGTH":
+            continue
+        key = name if name == "CONTENT_TYPE" else f"HTTP_{name}"
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def create_asgi_app(flask_app: Flask) -> AsgiApp:
+    """ASGI app serving ``flask_app``, with ASGI_WSGI_THREADS threads for the sync routes."""
+    return AsgiApp(flask_app, wsgi_threads=flask_app.config["ASGI_WSGI_THREADS"])
@@ -0,0 +1,195 @@
+"""Fingerprinted, precompressed static assets.
+
+CSS and JS live in ``presentation/assets/`` and are combined into the
+bundles listed in BUNDLES; files in ``presentation/static/`` (images) are
+published as they are. Every output is written once under a content-hashed
+name (``base.3f9a0c1b2d4e.css``) together with a ``.gz`` variant for text
+types, so it can be cached by browsers and proxies for a year: a changed
+file gets a new name instead of a revalidation.
+
+Templates link assets with ``asset_url("base.css")``, which takes the same
+keyword arguments as ``url_for`` and falls back to the plain static URL for
+files the pipeline does not know. Outputs are served by ``/assets/<name>``
+through ``send_file``, which gives ETags, conditional GETs and, under
+gunicorn, ``os.sendfile`` via ``wsgi.file_wrapper``.
+
+``flask assets build`` writes the outputs ahead of time (the Docker image
+does this); otherwise they are written at startup for whatever is missing.
+"""
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass, field
+
+from flask import Blueprint, Flask, Response, abort, current_app, request, send_file, url_for
+
+from app.presentation.compression import gzip_chunks
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "assets"
+PRESENTATION_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_DIR = os.path.join(PRESENTATION_DIR, "assets")
+STATIC_DIR = os.path.join(PRESENTATION_DIR, "static")
+DEFAULT_BUILD_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_NAME = "manifest.json"
+
+# Bundle name -> source files under assets/, concatenated in order
+BUNDLES = {
+    "base.css": ["css/base.css"],
+    "base.js": ["js/base.js"],
+    "index.css": ["css/index.css"],
+    "subscribe.css": ["css/subscribe.css"],
+    "subscribe.js": ["js/subscribe.js"],
+    "thank_you.css": ["css/thank_you.css"],
+    "admin/login.css": ["css/admin/login.css"],
+    "admin/edit_subscriber.css": ["css/admin/edit_subscriber.css"],
+    "admin/subscribers.css": ["css/admin/subscribers.css"],
+    "admin/subscribers.js": ["js/admin/subscribers.js"],
+}
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt")
+FINGERPRINT_LENGTH = 12
+GZIP_LEVEL = 9
+# Outputs never change under their name
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+assets_bp = Blueprint("assets", __name__, url_prefix="/assets")
+
+
+@dataclass
+class AssetManifest:
+    build_dir: str
+    # Logical name ("base.css") -> fingerprinted name ("base.3f9a0c1b2d4e.css")
+    files: dict[str, str] = field(default_factory=dict)
+    gzipped: set[str] = field(default_factory=set)
+    source_mtime: float = 0.0
+
+    def __post_init__(self):
+        self.published = set(self.files.values())
+        # Changes whenever any output does; part of cache keys for pages that link assets
+        self.version = hashlib.sha256(json.dumps(self.files, sort_keys=True).encode()).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+def fingerprinted_name(name: str, content: bytes) -> str:
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:FINGERPRINT_LENGTH]}{ext}"
+
+
+def _sources() -> dict[str, list[str]]:
+    """Logical name -> absolute source paths, for bundles and static files."""
+    sources = {name: [os.path.join(SOURCE_DIR, path) for path in paths] for name, paths in BUNDLES.items()}
+    for root, dirs, files in os.walk(STATIC_DIR):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != DEFAULT_BUILD_DIR]
+        for filename in files:
+            path = os.path.join(root, filename)
+            sources[os.path.relpath(path, STATIC_DIR).replace(os.sep, "/")] = [path]
+    return sources
+
+
+def _source_mtime() -> float:
+    return max(os.path.getmtime(path) for paths in _sources().values() for path in paths)
+
+
+def _write(path: str, content: bytes) -> None:
+    """Write through a temp file and rename, so other workers never see half a file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        f.write(content)
+    os.replace(temp, path)
+
+
+def _write_once(path: str, content: bytes) -> None:
+    # The name is a hash of the content, so an existing file is this file
+    if not os.path.exists(path):
+        _write(path, content)
+
+
+def _has_content(path: str, content: bytes) -> bool:
+    try:
+        with open(path, "rb") as f:
+            return f.read() == content
+    except FileNotFoundError:
+        return False
+
+
+def build_assets(build_dir: str = DEFAULT_BUILD_DIR) -> AssetManifest:
+    """Write every bundle and static file under its fingerprinted name."""
+    mtime = _source_mtime()
+    files: dict[str, str] = {}
+    gzipped: set[str] = set()
+    for name, paths in _sources().items():
+        content = b""
+        for path in paths:
+            with open(path, "rb") as f:
+                content += f.read()
+        output = fingerprinted_name(name, content)
+        _write_once(os.path.join(build_dir, output), content)
+        files[name] = output
+
+        if name.endswith(COMPRESSIBLE):
+            compressed = b"".join(gzip_chunks([content], level=GZIP_LEVEL))
+            if len(compressed) < len(content):
+                _write_once(os.path.join(build_dir, output + ".gz"), compressed)
+                gzipped.add(output)
+
+    # For deploy tooling and debugging; the app keeps its own copy in memory
+    manifest_path = os.path.join(build_dir, MANIFEST_NAME)
+    manifest = json.dumps(files, indent=2, sort_keys=True).encode()
+    if not _has_content(manifest_path, manifest):
+        _write(manifest_path, manifest)
+    return AssetManifest(build_dir, files, gzipped, mtime)
+
+
+def asset_version() -> str:
+    """Fingerprint of the current asset manifest ("" when assets are not built)."""
+    manifest = current_app.extensions.get(EXTENSION_KEY)
+    return manifest.version if manifest is not None else ""
+
+
+def asset_url(filename: str, **values) -> str:
+    """``url_for("static", filename=...)`` that resolves fingerprinted names."""
+    manifest = current_app.extensions.get(EXTENSION_KEY)
+    if manifest is not None and current_app.debug and _source_mtime() > manifest.source_mtime:
+        # Pick up edited CSS/JS without a restart while developing
+        manifest = current_app.extensions[EXTENSION_KEY] = build_assets(manifest.build_dir)
+    if manifest is None or filename not in manifest.files:
+        return url_for("static", filename=filename, **values)
+    return url_for("assets.asset", filename=manifest.files[filename], **values)
+
+
+@assets_bp.route("/<path:filename>")
+def asset(filename: str) -> Response:
+    """Serve a fingerprinted output, gzipped when the client accepts it."""
+    manifest = current_app.extensions.get(EXTENSION_KEY)
+    if manifest is None or filename not in manifest.published:
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    path = os.path.join(manifest.build_dir, filename)
+    gzipped = filename in manifest.gzipped and "gzip" in request.accept_encodings
+    if gzipped:
+        path += ".gz"
+
+    response = send_file(path, mimetype=mimetype, conditional=True, etag=True)
+    response.headers["Cache-Control"] = IMMUTABLE
+    if filename in manifest.gzipped:
+        response.vary.add("Accept-Encoding")
+    if gzipped:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
+
+
+def init_assets(app: Flask) -> AssetManifest | None:
+    """Build (or find already built) assets and register asset_url."""
+    app.add_template_global(asset_url)
+    app.register_blueprint(assets_bp)
+    build_dir = app.config.get("ASSET_BUILD_DIR") or DEFAULT_BUILD_DIR
+    try:
+        manifest = build_assets(build_dir)
+    except OSError as e:
+        logger.warning(f"Asset build failed, serving plain static URLs: {e}")
+        return None
+    app.extensions[EXTENSION_KEY] = manifest
+    return manifest
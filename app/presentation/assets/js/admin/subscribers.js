@@ -0,0 +1,133 @@
+// Endpoint URLs come from ADMIN_URLS, set inline by admin/subscribers.html
+function applyFilters() {
+    const sort = document.getElementById('sort').value;
+    const newsletter = document.getElementById('newsletter').value;
+    const search = document.querySelector('.admin__search input[name="q"]').value.trim();
+    let url = '?sort=' + sort;
+    if (newsletter) {
+        url += '&newsletter=' + newsletter;
+    }
+    if (search) {
+        url += '&q=' + encodeURIComponent(search);
+    }
+    window.location.href = url;
+}
+
+function toggleSelectAll(checkbox) {
+    const checkboxes = document.querySelectorAll('.subscriber-checkbox');
+    checkboxes.forEach(cb => cb.checked = checkbox.checked);
+}
+
+function getSelectedIds() {
+    const checkboxes = document.querySelectorAll('.subscriber-checkbox:checked');
+    return Array.from(checkboxes).map(cb => cb.value);
+}
+
+function getSelectedEmails() {
+    const checkboxes = document.querySelectorAll('.subscriber-checkbox:checked');
+    return Array.from(checkboxes).map(cb => cb.dataset.email);
+}
+
+function showNotification(message) {
+    const notification = document.getElementById('notification');
+    notification.textContent = message;
+    notification.classList.add('show');
+    setTimeout(() => notification.classList.remove('show'), 3000);
+}
+
+function copySelectedEmails() {
+    const emails = getSelectedEmails();
+    if (emails.length === 0) {
+        const allEmails = Array.from(document.querySelectorAll('.subscriber-checkbox')).map(cb => cb.dataset.email);
+        if (allEmails.length === 0) {
+            showNotification('No emails to copy');
+            return;
+        }
+        navigator.clipboard.writeText(allEmails.join('; ')).then(() => {
+            showNotification(`All ${allEmails.length} email(s) copied!`);
+        });
+        return;
+    }
+    navigator.clipboard.writeText(emails.join('; ')).then(() => {
+        showNotification(`${emails.length} email(s) copied!`);
+    });
+}
+
+function toggleDropdown(id) {
+    document.querySelectorAll('.admin__dropdown-menu').forEach(menu => {
+        if (menu.id !== id) menu.classList.remove('show');
+    });
+    document.getElementById(id).classList.toggle('show');
+}
+
+document.addEventListener('click', function(e) {
+    if (!e.target.closest('.admin__dropdown')) {
+        document.querySelectorAll('.admin__dropdown-menu').forEach(menu => {
+            menu.classList.remove('show');
+        });
+    }
+});
+
+function bulkUpdateNewsletter(newsletter, action) {
+    const ids = getSelectedIds();
+    if (ids.length === 0) {
+        showNotification('No subscribers selected');
+        return;
+    }
+
+    fetch(ADMIN_URLS.updateNewslettersBulk, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ids: ids, newsletter: newsletter, action: action })
+    })
+    .then(r => r.json())
+    .then(data => {
+        if (data.success) {
+            showNotification(`Updated ${data.updated} subscriber(s)`);
+            setTimeout(() => window.location.reload(), 1000);
+        } else {
+            showNotification('Update failed: ' + data.error);
+        }
+    });
+}
+
+function importSubscribers(input) {
+    if (!input.files.length) return;
+    const form = new FormData();
+    form.append('file', input.files[0]);
+    showNotification('Importing...');
+
+    fetch(ADMIN_URLS.importSubscribers, { method: 'POST', body: form })
+    .then(r => r.json())
+    .then(data => {
+        input.value = '';
+        if (data.success) {
+            showNotification(`Imported ${data.imported} of ${data.total} row(s), ${data.duplicates} duplicate(s), ${data.invalid} invalid`);
+            setTimeout(() => window.location.reload(), 2000);
+        } else {
+            showNotification('Import failed: ' + data.error);
+        }
+    });
+}
+
+function deleteSelected() {
+    const ids = getSelectedIds();
+    if (ids.length === 0) {
+        showNotification('No subscribers selected');
+        return;
+    }
+    if (!confirm(`Delete ${ids.length} subscriber(s)?`)) return;
+
+    fetch(ADMIN_URLS.deleteMultipleSubscribers, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ids: ids })
+    })
+    .then(r => r.json())
+    .then(data => {
+        if (data.success) {
+            showNotification(`Deleted ${data.deleted} subscriber(s)`);
+            setTimeout(() => window.location.reload(), 1000);
+        }
+    });
+}
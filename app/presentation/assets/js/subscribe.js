@@ -0,0 +1,19 @@
+document.addEventListener('DOMContentLoaded', function() {
+    const form = document.querySelector('.form');
+    const consentCheckbox = document.getElementById('consent');
+    const errorMessage = document.getElementById('consent-error');
+
+    form.addEventListener('submit', function(e) {
+        if (!consentCheckbox.checked) {
+            e.preventDefault();
+            errorMessage.style.display = 'block';
+            consentCheckbox.closest('.form__group').scrollIntoView({ behavior: 'smooth', block: 'center' });
+        }
+    });
+
+    consentCheckbox.addEventListener('change', function() {
+        if (this.checked) {
+            errorMessage.style.display = 'none';
+        }
+    });
+});
@@ -0,0 +1,139 @@
+"""Flask CLI commands, registered on the app in create_app()."""
+import csv
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from app.business.services.export_service import EXPORT_FORMATS, ExportService
+from app.business.services.import_service import (
+    DEFAULT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    ImportService,
+    detect_format,
+)
+from app.data.bootstrap import SCHEMA_VERSION, bootstrap_database, current_schema_version
+from app.data.migrations import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_THROTTLE_MS,
+    MIGRATIONS,
+    MigrationContext,
+    MigrationError,
+    applied_versions,
+    upgrade,
+)
+from app.data.newsletters import newsletter_registry
+from app.data.repositories.subscriber_repository import SORT_MODES, SubscriberRepository
+from app.presentation.asset_pipeline import DEFAULT_BUILD_DIR, build_assets
+from app.presentation.compression import gzip_chunks
+
+subscribers_cli = AppGroup("subscribers", help="Manage newsletter subscribers.")
+db_cli = AppGroup("db", help="Manage the database schema.")
+assets_cli = AppGroup("assets", help="Build fingerprinted static assets.")
+
+
+@subscribers_cli.command("import")
+@click.argument("source", type=click.File("rb"))
+@click.option("--format", "fmt", type=click.Choice(IMPORT_FORMATS), default=None,
+              help="Input format (default: from the file extension).")
+@click.option("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, show_default=True)
+@click.option("--report", type=click.File("w", encoding="utf-8"), default=None,
+              help="Write every rejected row to this CSV file.")
+def import_subscribers(source, fmt, batch_size, report):
+    """Import subscribers from a CSV or NDJSON file ('-' for stdin)."""
+    fmt = fmt or detect_format(source.name)
+    writer = None
+    if report is not None:
+        writer = csv.writer(report)
+        writer.writerow(["line", "email", "error"])
+
+    def on_error(row_error):
+        if writer is not None:
+            writer.writerow([row_error.line, row_error.email, row_error.error])
+
+    result = ImportService().import_stream(
+        source, fmt, batch_size=batch_size, max_errors=0 if writer else 20, on_error=on_error,
+    )
+
+    for row_error in result.errors:
+        click.echo(f"line {row_error.line}: {row_error.email}: {row_error.error}", err=True)
+    if result.errors_truncated and writer is None:
+        click.echo("... more errors omitted, use --report for the full list", err=True)
+    click.echo(
+        f"Processed {result.total} rows: {result.imported} imported, "
+        f"{result.duplicates} duplicates, {result.invalid} invalid"
+    )
+
+
+@subscribers_cli.command("export")
+@click.argument("output", type=click.File("wb"), default="-")
+@click.option("--format", "fmt", type=click.Choice(EXPORT_FORMATS), default="csv", show_default=True)
+@click.option("--sort", "sort_by", type=click.Choice(list(SORT_MODES)), default="date_desc", show_default=True)
+@click.option("--newsletter", type=click.Choice(newsletter_registry.keys()), default=None,
+              help="Only export subscribers of this newsletter.")
+@click.option("--gzip", "compress", is_flag=True, help="Gzip-compress the output.")
+def export_subscribers(output, fmt, sort_by, newsletter, compress):
+    """Export subscribers to OUTPUT ('-' for stdout)."""
+    chunks = ExportService().iter_export(fmt, sort_by, newsletter)
+    if compress:
+        chunks = gzip_chunks(chunks)
+    for chunk in chunks:
+        output.write(chunk)
+
+
+@subscribers_cli.command("reconcile-counters")
+def reconcile_counters():
+    """Rebuild subscriber_counters from the rows and report any drift."""
+    drift = SubscriberRepository().reconcile_counters()
+    for name, (stored, actual) in sorted(drift.items()):
+        click.echo(f"{name}: stored {stored}, actual {actual}")
+    click.echo(f"Counters rebuilt, {len(drift)} drifted" if drift else "Counters rebuilt, no drift")
+
+
+@db_cli.command("upgrade")
+@click.option("--target", type=int, default=None, help="Stop after this version (default: latest).")
+@click.option("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, show_default=True,
+              help="Rows per backfill transaction.")
+@click.option("--throttle-ms", type=int, default=DEFAULT_THROTTLE_MS, show_default=True,
+              help="Pause between backfill chunks.")
+def db_upgrade(target, chunk_size, throttle_ms):
+    """Apply pending migrations and ensure the admin user exists."""
+    ctx = MigrationContext(chunk_size=chunk_size, throttle_ms=throttle_ms, echo=click.echo)
+    try:
+        if target is None:
+            version = bootstrap_database(ctx)
+        else:
+            upgrade(target, ctx)
+            version = current_schema_version()
+    except MigrationError as e:
+        raise click.ClickException(str(e)) from e
+    click.echo(f"Database schema is at version {version}")
+
+
+@db_cli.command("status")
+def db_status():
+    """List migrations; exits 1 if any are pending."""
+    applied = applied_versions()
+    for migration in MIGRATIONS:
+        state = "applied" if migration.version in applied else "pending"
+        click.echo(f"{migration.version:04d} {migration.name:25s} {state}")
+    current = current_schema_version()
+    click.echo(f"Schema version {current}, expected {SCHEMA_VERSION}")
+    if current is None or current < SCHEMA_VERSION:
+        raise SystemExit(1)
+
+
+@assets_cli.command("build")
+def assets_build():
+    """Write bundles, images and gzip variants under content-hashed names."""
+    manifest = build_assets(current_app.config["ASSET_BUILD_DIR"] or DEFAULT_BUILD_DIR)
+    for name, output in sorted(manifest.files.items()):
+        suffix = " (+ .gz)" if output in manifest.gzipped else ""
+        click.echo(f"{name} -> {output}{suffix}")
+    click.echo(f"{len(manifest.files)} assets in {manifest.build_dir}")
+
+
+def register_commands(app) -> None:
+    app.cli.add_command(subscribers_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(assets_cli)
@@ -0,0 +1,131 @@
+"""Incremental gzip helpers for streamed responses and files.
+
+``GzipMiddleware`` compresses responses for clients that accept gzip. Only
+the types in COMPRESSIBLE_TYPES are compressed, and only when they are at
+least ``min_size`` bytes or their length is unknown (streamed). The body is
+compressed chunk by chunk as the app yields it, so a streamed export never
+sits in memory whole. Responses that already have a Content-Encoding, such
+as assets and cached pages, are passed through untouched.
+"""
+import zlib
+from typing import Iterable, Iterator
+
+from flask import Flask
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+DEFAULT_COMPRESS_LEVEL = 6
+# wbits=31 selects the gzip container (header + CRC32 trailer)
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+DEFAULT_MIN_SIZE = 1024
+COMPRESSIBLE_TYPES = frozenset({
+    "text/html", "text/css", "text/plain", "text/csv", "text/javascript", "text/xml",
+    "application/javascript", "application/json", "application/x-ndjson", "application/xml",
+    "image/svg+xml",
+})
+# Appended to the ETag of a compressed response: a different encoding is a different representation
+ETAG_SUFFIX = "-gz"
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = DEFAULT_COMPRESS_LEVEL) -> Iterator[bytes]:
+    """Gzip-compress an iterable of byte chunks without buffering it whole."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def accepts_gzip(environ: dict) -> bool:
+    # Quality of "gzip", or of "*" when gzip is not listed
+    return parse_accept_header(environ.get("HTTP_ACCEPT_ENCODING"), Accept)["gzip"] > 0
+
+
+class GzipMiddleware:
+    """Gzip-compress eligible responses as they are streamed out."""
+
+    def __init__(self, wsgi_app, level: int = DEFAULT_COMPRESS_LEVEL, min_size: int = DEFAULT_MIN_SIZE):
+        self.wsgi_app = wsgi_app
+        self.level = level
+        self.min_size = min_size
+
+    def __call__(self, environ, start_response):
+        gzip_ok = accepts_gzip(environ)
+        if_none_match = environ.get("HTTP_IF_NONE_MATCH", "")
+        revalidating_gzip = gzip_ok and f'{ETAG_SUFFIX}"' in if_none_match
+        if revalidating_gzip:
+            # The app compares against the ETag of the uncompressed body
+            environ["HTTP_IF_NONE_MATCH"] = if_none_match.replace(f'{ETAG_SUFFIX}"', '"')
+        compress = False
+
+        def gzip_start_response(status, headers, exc_info=None):
+            nonlocal compress
+            if self._eligible(status, headers):
+                headers = _add_vary(headers)
+                compress = gzip_ok and environ["REQUEST_METHOD"] != "HEAD"
+            if compress:
+                headers = [(k, v) for k, v in headers if k.lower() != "content-length"]
+                headers.append(("Content-Encoding", "gzip"))
+            if compress or (revalidating_gzip and status.startswith("304")):
+                headers = [(k, _suffix_etag(v) if k.lower() == "etag" else v) for k, v in headers]
+            write = start_response(status, headers, exc_info)
+            return write if not compress else _unsupported_write
+
+        # Flask calls start_response before returning the body iterable
+        app_iter = self.wsgi_app(environ, gzip_start_response)
+        if not compress:
+            return app_iter
+        return self._compress(app_iter)
+
+    def _eligible(self, status: str, headers: list[tuple[str, str]]) -> bool:
+        if not status.startswith("200"):
+            return False
+        values = {k.lower(): v for k, v in headers}
+        if "content-encoding" in values or "no-transform" in values.get("cache-control", ""):
+            return False
+        if values.get("content-type", "").split(";")[0].strip().lower() not in COMPRESSIBLE_TYPES:
+            return False
+        length = values.get("content-length")
+        # Unknown length means a streamed body, which is worth compressing
+        return length is None or int(length) >= self.min_size
+
+    def _compress(self, app_iter) -> Iterator[bytes]:
+        try:
+            yield from gzip_chunks(app_iter, self.level)
+        finally:
+            if hasattr(app_iter, "close"):
+                app_iter.close()
+
+
+def _add_vary(headers: list[tuple[str, str]]) -> list[tuple[str, str]]:
+    for i, (key, value) in enumerate(headers):
+        if key.lower() == "vary":
+            if "accept-encoding" in value.lower():
+                return headers
+            return headers[:i] + [(key, f"{value}, Accept-Encoding")] + headers[i + 1:]
+    return headers + [("Vary", "Accept-Encoding")]
+
+
+def _suffix_etag(etag: str) -> str:
+    # The page cache tags its own gzip bodies
+    if not etag.endswith('"') or etag.endswith(f'{ETAG_SUFFIX}"'):
+        return etag
+    return etag[:-1] + ETAG_SUFFIX + '"'
+
+
+def _unsupported_write(data: bytes) -> None:
+    raise RuntimeError("GzipMiddleware does not support the WSGI write() callable")
+
+
+def init_compression(app: Flask) -> GzipMiddleware | None:
+    """Wrap the app in GzipMiddleware (GZIP, GZIP_LEVEL, GZIP_MIN_SIZE)."""
+    if not app.config.get("GZIP"):
+        return None
+    middleware = GzipMiddleware(
+        app.wsgi_app,
+        level=app.config.get("GZIP_LEVEL", DEFAULT_COMPRESS_LEVEL),
+        min_size=app.config.get("GZIP_MIN_SIZE", DEFAULT_MIN_SIZE),
+    )
+    app.wsgi_app = middleware
+    return middleware
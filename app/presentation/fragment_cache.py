@@ -0,0 +1,99 @@
+"""Template caches: a shared Jinja bytecode cache and per-worker fragment cache.
+
+The bytecode cache stores compiled templates in a directory every gunicorn
+worker on the host reads (a 0700 directory under the instance folder), so a template is compiled once per deploy rather
+than once per worker. Jinja writes each entry to a temp file and renames it,
+which makes concurrent writers safe.
+
+The fragment cache keeps rendered HTML for small templates that repeat many
+times on a page, such as one row of the admin subscriber table, keyed by the
+caller (e.g. subscriber id and row version). Only fragments whose key
+changed are rendered again.
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from flask import Flask, current_app, has_app_context
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+
+from app.instance import private_instance_dir
+
+EXTENSION_KEY = "fragment_cache"
+
+
+@dataclass
+class FragmentCacheStats:
+    hits: int = 0
+    misses: int = 0
+    entries: int = 0
+    evictions: int = 0
+
+
+class FragmentCache:
+    """LRU of rendered fragments, per worker process."""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, Markup] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = FragmentCacheStats()
+
+    def render(self, template_name: str, key, **context) -> Markup:
+        """Rendered template for this key, rendering it only on a miss."""
+        cache_key = (template_name, key)
+        with self._lock:
+            html = self._entries.get(cache_key)
+            if html is not None:
+                self._entries.move_to_end(cache_key)
+                self._stats.hits += 1
+                return html
+            self._stats.misses += 1
+
+        html = Markup(current_app.jinja_env.get_template(template_name).render(**context))
+        with self._lock:
+            self._entries[cache_key] = html
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+        return html
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> FragmentCacheStats:
+        with self._lock:
+            return FragmentCacheStats(**{**vars(self._stats), "entries": len(self._entries)})
+
+
+def render_fragment(template_name: str, key, **context) -> Markup:
+    """Render through the fragment cache, or directly when it is disabled."""
+    cache = get_fragment_cache()
+    if cache is None:
+        return Markup(current_app.jinja_env.get_template(template_name).render(**context))
+    return cache.render(template_name, key, **context)
+
+
+def init_template_caches(app: Flask) -> FragmentCache | None:
+    """Set up the bytecode cache (JINJA_BYTECODE_CACHE) and fragment cache."""
+    if app.config.get("JINJA_BYTECODE_CACHE"):
+        # Jinja loads marshalled code from here, so the default is private to this user
+        directory = app.config["JINJA_BYTECODE_CACHE_DIR"] or private_instance_dir(app, "jinja")
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+    max_entries = app.config.get("FRAGMENT_CACHE_MAX_ENTRIES", 0)
+    if not max_entries:
+        return None
+    cache = FragmentCache(max_entries)
+    app.extensions[EXTENSION_KEY] = cache
+    return cache
+
+
+def get_fragment_cache() -> FragmentCache | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get(EXTENSION_KEY)
@@ -0,0 +1,264 @@
+"""Full-page cache for the public pages that look the same to every visitor.
+
+Views decorated with ``@cached_page`` are rendered once per worker, at
+startup or on the first hit, and kept in memory as raw and gzip bytes with an
+ETag and Last-Modified. Later GETs are answered from memory with conditional
+GET handling, and ``PageCacheMiddleware`` answers them before Flask routes the
+request at all when the client has no session cookie.
+
+A page is keyed by its path, so the view must not depend on anything else in
+the request. The exception is query arguments declared as slots: the view
+renders ``page_slot("name")`` in their place and each response fills in the
+escaped argument, e.g. the name and email on the thank-you page.
+
+Requests with flashed messages are rendered normally, and a view can call
+``skip_page_cache()`` to keep the response it is returning out of the cache.
+"""
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import wraps
+from urllib.parse import parse_qs
+
+from flask import Flask, Response, current_app, has_app_context, request, session
+from markupsafe import Markup, escape
+from werkzeug.http import HTTP_STATUS_CODES, http_date, parse_date, parse_etags
+
+from app.presentation.compression import ETAG_SUFFIX, accepts_gzip, gzip_chunks
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "page_cache"
+GZIP_LEVEL = 9
+# Cannot occur in rendered templates, so the body can be split on it
+SLOT_MARK = "\x00"
+# Stored, but revalidated on every use: pages link fingerprinted assets that change per deploy
+CACHE_CONTROL = "no-cache"
+RENDERING_KEY = "page_cache.rendering"
+SKIP_KEY = "page_cache.skip"
+HTTP_STATUS_LINES = {status: f"{status} {HTTP_STATUS_CODES[status]}" for status in (200, 304)}
+
+
+@dataclass
+class CachedPage:
+    # Literal HTML with slot names in between: [html, slot, html, slot, html]
+    parts: list[bytes]
+    slots: list[str]
+    gzipped: bytes | None
+    etag: str
+    last_modified: datetime
+    content_type: str
+
+    @classmethod
+    def render(cls, html: str, content_type: str) -> "CachedPage":
+        pieces = html.split(SLOT_MARK)
+        parts = [piece.encode() for piece in pieces[::2]]
+        slots = pieces[1::2]
+        body = b"".join(parts)
+        # A slotted page is compressed per response, after filling in the slots
+        gzipped = None if slots else b"".join(gzip_chunks([body], level=GZIP_LEVEL))
+        etag = hashlib.sha256(body).hexdigest()[:16]
+        return cls(parts, slots, gzipped, etag, datetime.now(timezone.utc).replace(microsecond=0), content_type)
+
+    def __post_init__(self):
+        self.http_last_modified = http_date(self.last_modified)
+
+    @property
+    def size(self) -> int:
+        return sum(len(part) for part in self.parts) + len(self.gzipped or b"")
+
+    def respond(self, environ: dict) -> tuple[bytes, int, list[tuple[str, str]]]:
+        """Body, status and headers for this request: gzipped if accepted, 304 if unchanged.
+
+        Built by hand rather than through a Response object; on a cache hit
+        that is most of the remaining work.
+        """
+        etag = self.etag
+        body = self.parts[0]
+        if self.slots:
+            args = parse_qs(environ.get("QUERY_STRING", ""))
+            values = [args.get(slot, [""])[0] for slot in self.slots]
+            etag += "-" + hashlib.blake2b("\x00".join(values).encode(), digest_size=6).hexdigest()
+            pieces = [self.parts[0]]
+            for value, part in zip(values, self.parts[1:]):
+                pieces += [str(escape(value)).encode(), part]
+            body = b"".join(pieces)
+
+        # Negotiated and tagged like GzipMiddleware, so both layers hand out the same validators
+        gzipped = accepts_gzip(environ)
+        validators = [etag]
+        if gzipped:
+            body = self.gzipped if self.gzipped is not None else b"".join(gzip_chunks([body]))
+            etag += ETAG_SUFFIX
+            # GzipMiddleware strips the suffix from If-None-Match before it gets here
+            validators.append(etag)
+        headers = [
+            ("ETag", f'"{etag}"'),
+            ("Last-Modified", self.http_last_modified),
+            ("Cache-Control", CACHE_CONTROL),
+            ("Vary", "Accept-Encoding"),
+        ]
+        if not self._modified(environ, validators):
+            return b"", 304, headers
+
+        headers += [("Content-Type", self.content_type), ("Content-Length", str(len(body)))]
+        if gzipped:
+            headers.append(("Content-Encoding", "gzip"))
+        return body, 200, headers
+
+    def _modified(self, environ: dict, validators: list[str]) -> bool:
+        if_none_match = environ.get("HTTP_IF_NONE_MATCH")
+        if if_none_match is not None:
+            # Takes precedence over If-Modified-Since
+            etags = parse_etags(if_none_match)
+            return not any(etags.contains_weak(etag) for etag in validators)
+        since = parse_date(environ.get("HTTP_IF_MODIFIED_SINCE"))
+        return since is None or self.last_modified > since
+
+
+@dataclass
+class PageCacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+    not_modified: int = 0
+    pages: int = 0
+    memory_bytes: int = 0
+
+
+class PageCache:
+    """Rendered pages by path, per worker process."""
+
+    def __init__(self):
+        self._pages: dict[str, CachedPage] = {}
+        self._lock = threading.Lock()
+        self._stats = PageCacheStats()
+
+    def get(self, path: str) -> CachedPage | None:
+        return self._pages.get(path)
+
+    def put(self, path: str, page: CachedPage) -> None:
+        with self._lock:
+            self._pages[path] = page
+
+    def serve(self, page: CachedPage, environ: dict) -> tuple[bytes, int, list[tuple[str, str]]]:
+        body, status, headers = page.respond(environ)
+        with self._lock:
+            self._stats.hits += 1
+            if status == 304:
+                self._stats.not_modified += 1
+        return body, status, headers
+
+    def record(self, stat: str) -> None:
+        with self._lock:
+            setattr(self._stats, stat, getattr(self._stats, stat) + 1)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+    def stats(self) -> PageCacheStats:
+        with self._lock:
+            return PageCacheStats(
+                **{**vars(self._stats), "pages": len(self._pages), "memory_bytes": sum(p.size for p in self._pages.values())}
+            )
+
+
+class PageCacheMiddleware:
+    """Answer GETs for cached pages before Flask sees the request.
+
+    Only clients without a session cookie are served here, since a session
+    may hold flashed messages; everyone else goes through the view.
+    """
+
+    def __init__(self, wsgi_app, cache: PageCache, session_cookie_name: str):
+        self.wsgi_app = wsgi_app
+        self.cache = cache
+        self.session_cookie = f"{session_cookie_name}="
+
+    def __call__(self, environ, start_response):
+        if environ["REQUEST_METHOD"] in ("GET", "HEAD") and self.session_cookie not in environ.get("HTTP_COOKIE", ""):
+            page = self.cache.get(environ.get("PATH_INFO", ""))
+            if page is not None:
+                body, status, headers = self.cache.serve(page, environ)
+                start_response(HTTP_STATUS_LINES[status], headers)
+                return [b"" if environ["REQUEST_METHOD"] == "HEAD" else body]
+        return self.wsgi_app(environ, start_response)
+
+
+def page_slot(name: str) -> Markup | str:
+    """Query argument ``name`` in a cached page, filled in per response."""
+    if request.environ.get(RENDERING_KEY):
+        return Markup(f"{SLOT_MARK}{name}{SLOT_MARK}")
+    return request.args.get(name, "")
+
+
+def skip_page_cache() -> None:
+    """Keep this request's response out of the page cache."""
+    request.environ[SKIP_KEY] = True
+
+
+def cached_page(view):
+    """Serve a view from the page cache, rendering it on the first hit."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        cache = get_page_cache()
+        if cache is None:
+            return view(*args, **kwargs)
+        if "_flashes" in session:
+            cache.record("bypassed")
+            return view(*args, **kwargs)
+
+        page = cache.get(request.path)
+        if page is not None:
+            return Response(*cache.serve(page, request.environ))
+
+        cache.record("misses")
+        request.environ[RENDERING_KEY] = True
+        response = current_app.make_response(view(*args, **kwargs))
+        request.environ[RENDERING_KEY] = False
+        if request.environ.get(SKIP_KEY) or response.status_code != 200 or response.is_streamed:
+            if not response.is_streamed:
+                pieces = response.get_data(as_text=True).split(SLOT_MARK)
+                pieces[1::2] = [str(escape(request.args.get(slot, ""))) for slot in pieces[1::2]]
+                response.set_data("".join(pieces))
+            return response
+        page = CachedPage.render(response.get_data(as_text=True), response.content_type)
+        cache.put(request.path, page)
+        return Response(*page.respond(request.environ))
+
+    wrapper.page_cached = True
+    return wrapper
+
+
+def _cached_paths(app: Flask) -> list[str]:
+    return [
+        rule.rule for rule in app.url_map.iter_rules()
+        if not rule.arguments and getattr(app.view_functions[rule.endpoint], "page_cached", False)
+    ]
+
+
+def init_page_cache(app: Flask) -> PageCache | None:
+    """Install the page cache (PAGE_CACHE) and prerender the cached pages."""
+    if not app.config.get("PAGE_CACHE") or app.debug:
+        # Debug mode edits templates while the app runs
+        return None
+    cache = PageCache()
+    app.extensions[EXTENSION_KEY] = cache
+    app.wsgi_app = PageCacheMiddleware(app.wsgi_app, cache, app.config["SESSION_COOKIE_NAME"])
+
+    client = app.test_client()
+    for path in _cached_paths(app):
+        try:
+            client.get(path)
+        except Exception as e:
+            logger.warning(f"Prerendering {path} failed, it will be rendered on first hit: {e}")
+    return cache
+
+
+def get_page_cache() -> PageCache | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get(EXTENSION_KEY)
@@ -0,0 +1,237 @@
+"""Token-bucket rate limiting per client IP and endpoint.
+
+Each (endpoint, IP) pair has a bucket of ``capacity`` tokens that refills at
+``capacity / period`` tokens per second; a request takes one token or is
+answered with 429 and a Retry-After of the time until the next token.
+
+Two backends:
+
+* ``sqlite``: one SQLite file shared by every gunicorn worker on the host,
+  updated with a single UPSERT ... RETURNING per request.
+* ``memory``: a dict per worker process, for tests and single-worker runs.
+
+Backend errors are logged and let the request through; the limiter must
+never take the site down with it.
+"""
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+
+from flask import Flask, current_app, has_app_context, request
+from werkzeug.exceptions import TooManyRequests
+
+from app.instance import private_instance_dir
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "rate_limiter"
+LIMITER_BACKENDS = ("none", "memory", "sqlite")
+# Full buckets are deleted every this many limiter calls per worker
+PRUNE_EVERY = 1000
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int
+    period: float
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.period
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse "<requests>/<seconds>", e.g. "10/60"."""
+        capacity, period = value.split("/")
+        return cls(int(capacity), float(period))
+
+
+@dataclass
+class RateLimitStats:
+    allowed: int = 0
+    limited: int = 0
+    errors: int = 0
+
+
+def _take(tokens: float, updated: float, now: float, limit: RateLimit) -> tuple[float, bool]:
+    refilled = min(limit.capacity, tokens + (now - updated) * limit.rate)
+    if refilled >= 1:
+        return refilled - 1, True
+    return refilled, False
+
+
+class MemoryRateLimitBackend:
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: RateLimit, now: float) -> tuple[float, bool]:
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (limit.capacity, now))
+            tokens, allowed = _take(tokens, updated, now, limit)
+            self._buckets[key] = (tokens, now)
+        return tokens, allowed
+
+    def prune(self, older_than: float) -> None:
+        with self._lock:
+            self._buckets = {k: v for k, v in self._buckets.items() if v[1] >= older_than}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteRateLimitBackend:
+    """Buckets in a SQLite file that every worker on the host opens."""
+
+    # Every SET expression sees the old row, so "refilled" is computed once
+    # per column from the stored tokens.
+    _REFILLED = "MIN(:capacity, tokens + (:now - updated) * :rate)"
+    _TAKE = (
+        "INSERT INTO rate_limit (key, tokens, updated, allowed) VALUES (:key, :capacity - 1, :now, 1)"
+        " ON CONFLICT (key) DO UPDATE SET"
+        f" tokens = CASE WHEN {_REFILLED} >= 1 THEN {_REFILLED} - 1 ELSE {_REFILLED} END,"
+        f" allowed = {_REFILLED} >= 1,"
+        " updated = :now"
+        " RETURNING tokens, allowed"
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit ("
+            " key TEXT PRIMARY KEY, tokens REAL NOT NULL,"
+            " updated REAL NOT NULL, allowed INTEGER NOT NULL)"
+        )
+
+    def after_fork(self) -> None:
+        # A SQLite connection must not be used across fork(); leave the parent's to the parent
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, limit: RateLimit, now: float) -> tuple[float, bool]:
+        params = {"key": key, "capacity": limit.capacity, "rate": limit.rate, "now": now}
+        tokens, allowed = self._connect().execute(self._TAKE, params).fetchone()
+        return tokens, bool(allowed)
+
+    def prune(self, older_than: float) -> None:
+        self._connect().execute("DELETE FROM rate_limit WHERE updated < ?", (older_than,))
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM rate_limit")
+
+
+class RateLimiter:
+    def __init__(self, backend, limits: dict[str, RateLimit], proxy_hops: int = 0):
+        self.backend = backend
+        self.limits = limits
+        self.proxy_hops = proxy_hops
+        self._lock = threading.Lock()
+        self._stats = RateLimitStats()
+        self._calls = 0
+
+    def hit(self, name: str, client: str, now: float | None = None) -> float:
+        """Take a token for client under the named limit.
+
+        Returns 0 when allowed, otherwise the seconds until a token is free.
+        """
+        limit = self.limits[name]
+        now = time.time() if now is None else now
+        try:
+            tokens, allowed = self.backend.take(f"{name}:{client}", limit, now)
+        except Exception as e:
+            logger.warning(f"Rate limiter failed, allowing request: {e}")
+            with self._lock:
+                self._stats.errors += 1
+            return 0
+        with self._lock:
+            if allowed:
+                self._stats.allowed += 1
+            else:
+                self._stats.limited += 1
+            self._calls += 1
+            prune = self._calls % PRUNE_EVERY == 0
+        if prune:
+            self._prune(now)
+        return 0 if allowed else (1 - tokens) / limit.rate
+
+    def client_address(self) -> str:
+        """Client IP, taken from X-Forwarded-For when behind proxy_hops proxies."""
+        route = request.access_route
+        if self.proxy_hops and request.headers.get("X-Forwarded-For") and len(route) >= self.proxy_hops:
+            return route[-self.proxy_hops]
+        return request.remote_addr or "unknown"
+
+    def stats(self) -> RateLimitStats:
+        with self._lock:
+            return RateLimitStats(**vars(self._stats))
+
+    def _prune(self, now: float) -> None:
+        # A bucket left alone for a full period is full again; forget it
+        longest = max(limit.period for limit in self.limits.values())
+        try:
+            self.backend.prune(now - longest)
+        except Exception as e:
+            logger.warning(f"Rate limiter prune failed: {e}")
+
+
+def rate_limit(name: str, methods: tuple[str, ...] = ("POST",)):
+    """Apply the named limit ("subscribe" or "login") to a view for the given methods."""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            limiter = get_rate_limiter()
+            if limiter is not None and request.method in methods:
+                retry_after = limiter.hit(name, limiter.client_address())
+                if retry_after:
+                    raise TooManyRequests(
+                        "Too many requests, please try again later.",
+                        retry_after=math.ceil(retry_after),
+                    )
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def init_rate_limiter(app: Flask) -> RateLimiter | None:
+    """Create the limiter selected by RATE_LIMIT, or None for "none"."""
+    backend_name = app.config.get("RATE_LIMIT", "none")
+    if backend_name not in LIMITER_BACKENDS:
+        raise ValueError(f"Unknown rate limit backend: {backend_name}")
+    if backend_name == "none":
+        return None
+
+    if backend_name == "sqlite":
+        # Anyone who can write the buckets can lock clients out or lift their limits
+        path = app.config["RATE_LIMIT_PATH"] or os.path.join(private_instance_dir(app, "rate-limit"), "buckets.sqlite")
+        backend = SQLiteRateLimitBackend(path)
+    else:
+        backend = MemoryRateLimitBackend()
+
+    limits = {
+        "subscribe": RateLimit.parse(app.config["RATE_LIMIT_SUBSCRIBE"]),
+        "login": RateLimit.parse(app.config["RATE_LIMIT_LOGIN"]),
+    }
+    limiter = RateLimiter(backend, limits, app.config["RATE_LIMIT_PROXY_HOPS"])
+    app.extensions[EXTENSION_KEY] = limiter
+    return limiter
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    if not has_app_context():
+        return None
+    return current_app.extensions.get(EXTENSION_KEY)
@@ -2,21 +2,54 @@
 Admin routes for managing subscribers with authentication.
 """
 
+import csv
+import hashlib
+import time
 from functools import wraps
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import (
+    Blueprint, Response, current_app, g, render_template, request, redirect, url_for, session, flash, jsonify,
+    stream_with_context,
+)
+from markupsafe import Markup
 
+from app.data.email_filter import get_email_filter
 from app.data.models import User
+from app.data.newsletters import newsletter_registry
+from app.data.pool_metrics import pool_stats
+from app.data.routing import REPLICA_BIND_KEY
+from app.business.services.export_service import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_EXTENSIONS,
+    EXPORT_FORMATS,
+    ExportService,
+)
+from app.business.services.import_service import IMPORT_FORMATS, ImportService, detect_format
+from app.business.services.subscription_queue import get_subscription_queue
 from app.business.services.subscription_service import SubscriptionService
+from app.data.repositories.subscriber_repository import DEFAULT_PAGE_SIZE, SubscriberPage, SubscriberStats
+from app.presentation.asset_pipeline import asset_version
+from app.presentation.compression import gzip_chunks
+from app.presentation.fragment_cache import get_fragment_cache, render_fragment
+from app.presentation.page_cache import get_page_cache
+from app.presentation.rate_limit import get_rate_limiter, rate_limit
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
 
-NEWSLETTER_NAMES = {
-    'kost': 'Kost & Näring',
-    'mindset': 'Mindset',
-    'kunskap': 'Kunskap & Forskning',
-    'veckans_pass': 'Veckans Pass',
-    'jaine': 'Träna med Jaine',
-}
+NEWSLETTER_NAMES = newsletter_registry.labels()
+
+
+@admin_bp.before_request
+def route_reads_after_write():
+    """Keep an admin's reads on the primary for a short window after a write."""
+    if session.get("read_primary_until", 0) > time.time():
+        g.read_primary = True
+
+
+@admin_bp.after_request
+def remember_write(response):
+    if request.method == "POST" and REPLICA_BIND_KEY in current_app.config.get("SQLALCHEMY_BINDS", {}):
+        session["read_primary_until"] = time.time() + current_app.config["READ_YOUR_WRITES_SECONDS"]
+    return response
 
 
 def login_required(f):
@@ -28,7 +61,49 @@ def login_required(f):
     return decorated_function
 
 
+def etag_on_data_version(f):
+    """Answer conditional GETs with 304 until a write bumps the data version.
+
+    The ETag covers the data version, the asset manifest, the full URL and
+    the admin user, so the view is only run when its output could differ:
+    a deploy that changes CSS or JS links new asset names. It also changes
+    every RESULT_CACHE_TTL seconds, as the recent-signup counts age without
+    a write. Pages with pending flash messages are never cached by the
+    browser.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        version = SubscriptionService().data_version()
+        if version is None or session.get("_flashes"):
+            return f(*args, **kwargs)
+
+        period = int(time.time() // max(1, current_app.config["RESULT_CACHE_TTL"]))
+        key = f"{version}|{period}|{asset_version()}|{request.full_path}|{session.get('admin_username', '')}"
+        etag = hashlib.sha1(key.encode()).hexdigest()[:20]
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = current_app.make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+    return decorated_function
+
+
+@admin_bp.app_template_global()
+def subscriber_row(subscriber) -> Markup:
+    """One <tr> of the subscriber table, re-rendered only when the row changed."""
+    return render_fragment(
+        "admin/_subscriber_row.html",
+        (subscriber.id, subscriber.row_version),
+        subscriber=subscriber,
+    )
+
+
 @admin_bp.route("/login", methods=["GET", "POST"])
+@rate_limit("login")
 def login():
     """Admin login page."""
     if "admin_logged_in" in session:
@@ -63,29 +138,76 @@ def logout():
 
 @admin_bp.route("/subscribers")
 @login_required
+@etag_on_data_version
 def subscribers():
-    """Display list of all newsletter subscribers."""
+    """Display one page of newsletter subscribers."""
     import logging
     sort_by = request.args.get("sort", "date_desc")
     newsletter_filter = request.args.get("newsletter", None)
+    cursor = request.args.get("after", None)
+    per_page = request.args.get("per_page", DEFAULT_PAGE_SIZE, type=int)
+    search = request.args.get("q", "").strip()
 
     try:
         service = SubscriptionService()
-        all_subscribers = service.get_all_subscribers(sort_by, newsletter_filter)
+        page = service.get_subscribers_page(sort_by, newsletter_filter, cursor, per_page, search)
+        stats = service.get_stats()
+        if search:
+            count = service.count_subscribers(newsletter_filter, search)
+        else:
+            count = stats.newsletters.get(newsletter_filter, stats.total) if newsletter_filter else stats.total
     except Exception as e:
         logging.error(f"Error fetching subscribers: {e}")
-        all_subscribers = []
+        page = SubscriberPage()
+        stats = SubscriberStats()
+        count = 0
 
     return render_template(
         "admin/subscribers.html",
-        subscribers=all_subscribers,
-        count=len(all_subscribers),
+        subscribers=page.items,
+        count=count,
+        stats=stats,
+        next_cursor=page.next_cursor,
+        is_first_page=not cursor,
+        per_page=per_page,
         current_sort=sort_by,
         current_filter=newsletter_filter,
+        current_search=search,
         newsletter_names=NEWSLETTER_NAMES,
     )
 
 
+@admin_bp.route("/subscribers/search")
+@login_required
+@etag_on_data_version
+def search_subscribers():
+    """Search subscribers by email, name or @domain; paginated like the list."""
+    search = request.args.get("q", "").strip()
+    started = time.perf_counter()
+    page = SubscriptionService().get_subscribers_page(
+        request.args.get("sort", "date_desc"),
+        request.args.get("newsletter", None),
+        request.args.get("after", None),
+        request.args.get("per_page", DEFAULT_PAGE_SIZE, type=int),
+        search,
+    )
+    return jsonify({
+        "query": search,
+        "subscribers": [
+            {
+                "id": s.id,
+                "email": s.email,
+                "name": s.name,
+                "newsletters": s.get_newsletters(),
+                "subscribed_at": s.subscribed_at.isoformat() if s.subscribed_at else None,
+            }
+            for s in page.items
+        ],
+        "next_cursor": page.next_cursor,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+    })
+
+
 @admin_bp.route("/subscribers/<int:subscriber_id>/edit", methods=["GET", "POST"])
 @login_required
 def edit_subscriber(subscriber_id: int):
@@ -100,13 +222,7 @@ def edit_subscriber(subscriber_id: int):
     if request.method == "POST":
         email = request.form.get("email", "")
         name = request.form.get("name", "")
-        newsletters = {
-            'kost': 'nl_kost' in request.form,
-            'mindset': 'nl_mindset' in request.form,
-            'kunskap': 'nl_kunskap' in request.form,
-            'veckans_pass': 'nl_veckans_pass' in request.form,
-            'jaine': 'nl_jaine' in request.form,
-        }
+        newsletters = {key: f"nl_{key}" in request.form for key in newsletter_registry.keys()}
         result = service.update_subscriber(subscriber_id, email, name, newsletters)
 
         if result.success:
@@ -146,10 +262,7 @@ def delete_multiple_subscribers():
     data = request.get_json()
     ids = data.get("ids", [])
     service = SubscriptionService()
-    deleted_count = 0
-    for subscriber_id in ids:
-        if service.delete_subscriber(int(subscriber_id)):
-            deleted_count += 1
+    deleted_count = service.delete_subscribers_bulk([int(i) for i in ids])
     return jsonify({"success": True, "deleted": deleted_count})
 
 
@@ -173,3 +286,133 @@ def update_newsletters_bulk():
     updated = service.update_newsletters_bulk([int(i) for i in ids], newsletters)
 
     return jsonify({"success": True, "updated": updated})
+
+
+@admin_bp.route("/subscribers/import", methods=["POST"])
+@login_required
+def import_subscribers():
+    """Import subscribers from an uploaded CSV or NDJSON file."""
+    upload = request.files.get("file")
+    if upload is None or not upload.filename:
+        return jsonify({"success": False, "error": "No file uploaded"}), 400
+
+    fmt = request.form.get("format") or detect_format(upload.filename)
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"success": False, "error": "Invalid format"}), 400
+
+    try:
+        result = ImportService().import_stream(upload.stream, fmt)
+    except (UnicodeDecodeError, csv.Error) as e:
+        # Batches before the unreadable line are already committed
+        return jsonify({"success": False, "error": f"Could not read file: {e}"}), 400
+    return jsonify({"success": True, **result.to_dict()})
+
+
+@admin_bp.route("/subscribers/export")
+@login_required
+@etag_on_data_version
+def export_subscribers():
+    """Stream all subscribers matching the current sort and filter."""
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"success": False, "error": "Invalid format"}), 400
+    sort_by = request.args.get("sort", "date_desc")
+    newsletter_filter = request.args.get("newsletter", None)
+    compress = request.args.get("gzip") == "1"
+
+    chunks = ExportService().iter_export(fmt, sort_by, newsletter_filter)
+    filename = f"subscribers.{EXPORT_EXTENSIONS[fmt]}"
+    if compress:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        mimetype = "application/gzip"
+    else:
+        mimetype = EXPORT_CONTENT_TYPES[fmt]
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
+@admin_bp.route("/stats/subscription-queue")
+@login_required
+def subscription_queue_stats():
+    """Depth and throughput counters of the write-behind signup queue."""
+    subscription_queue = get_subscription_queue()
+    if subscription_queue is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **vars(subscription_queue.stats())})
+
+
+@admin_bp.route("/stats/subscribers")
+@login_required
+@etag_on_data_version
+def subscriber_stats_view():
+    """Subscriber totals, per-newsletter counts and recent signups."""
+    return jsonify(SubscriptionService().get_stats().to_dict())
+
+
+@admin_bp.route("/stats/cache")
+@login_required
+def cache_stats_view():
+    """Result cache hit/miss counts for this worker."""
+    cache = current_app.extensions.get("result_cache")
+    if cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, "backend": type(cache.backend).__name__, **vars(cache.stats())})
+
+
+@admin_bp.route("/stats/email-filter")
+@login_required
+def email_filter_stats_view():
+    """Size, memory and false-positive rates of this worker's email filter."""
+    email_filter = get_email_filter()
+    if email_filter is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **vars(email_filter.stats())})
+
+
+@admin_bp.route("/stats/rate-limit")
+@login_required
+def rate_limit_stats_view():
+    """Allowed and limited request counts for this worker."""
+    limiter = get_rate_limiter()
+    if limiter is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, "backend": type(limiter.backend).__name__, **vars(limiter.stats())})
+
+
+@admin_bp.route("/stats/fragments")
+@login_required
+def fragment_stats_view():
+    """Rendered-row cache hit/miss counts for this worker."""
+    cache = get_fragment_cache()
+    if cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **vars(cache.stats())})
+
+
+@admin_bp.route("/stats/page-cache")
+@login_required
+def page_cache_stats_view():
+    """Full-page cache hits, 304s and size for this worker."""
+    cache = get_page_cache()
+    if cache is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **vars(cache.stats())})
+
+
+@admin_bp.route("/stats/pool")
+@login_required
+def pool_stats_view():
+    """Connection pool occupancy and checkout timings for this worker."""
+    return jsonify(pool_stats(current_app))
+
+
+@admin_bp.route("/stats/boot")
+@login_required
+def boot_stats_view():
+    """How long create_app() took in this worker, and how much was schema work."""
+    return jsonify(current_app.extensions.get("boot_stats", {}))
@@ -1,57 +1,78 @@
 from flask import Blueprint, render_template, request, redirect, url_for
 import logging
 
-from app.business.services.subscription_service import SubscriptionService
+from app.business.services.subscription_service import AsyncSubscriptionService, SubscriptionService
+from app.data.newsletters import newsletter_registry
+from app.presentation.page_cache import cached_page, page_slot
+from app.presentation.rate_limit import rate_limit
 
 bp = Blueprint("public", __name__)
 
 subscription_service = SubscriptionService()
+async_subscription_service = AsyncSubscriptionService(subscription_service)
 
 logger = logging.getLogger(__name__)
 
 
 @bp.route("/")
+@cached_page
 def index():
     return render_template("index.html")
 
 
 @bp.route("/subscribe")
+@cached_page
 def subscribe():
     return render_template("subscribe.html")
 
 
 @bp.route("/subscribe/thank-you")
+@cached_page
 def subscribe_thank_you():
-    email = request.args.get('email', '')
-    name = request.args.get('name', '')
-    return render_template("thank_you.html", email=email, name=name)
+    return render_template("thank_you.html", email=page_slot("email"), name=page_slot("name"))
 
 
 @bp.route("/subscribe/confirm", methods=["POST"])
+@rate_limit("subscribe")
 def subscribe_confirm():
-    email = request.form.get("email", "")
-    name = request.form.get("name", "")
+    email, name, newsletters = _signup_form()
+    try:
+        result = subscription_service.subscribe(email, name, newsletters)
+    except Exception as e:
+        return _signup_failed(e, email, name, newsletters)
+    return _signup_response(result, email, name, newsletters)
 
-    newsletters = {
-        'kost': 'nl_kost' in request.form,
-        'mindset': 'nl_mindset' in request.form,
-        'kunskap': 'nl_kunskap' in request.form,
-        'veckans_pass': 'nl_veckans_pass' in request.form,
-        'jaine': 'nl_jaine' in request.form,
-    }
 
+@rate_limit("subscribe")
+async def subscribe_confirm_async():
+    """subscribe_confirm on the event loop; served for this URL by asgi.py."""
+    email, name, newsletters = _signup_form()
     try:
-        result = subscription_service.subscribe(email, name, newsletters)
+        result = await async_subscription_service.subscribe(email, name, newsletters)
     except Exception as e:
-        logger.error(f"Subscription error: {e}", exc_info=True)
-        return render_template(
-            "subscribe.html",
-            error=f"Database error: {str(e)}",
-            email=email,
-            name=name,
-            newsletters=newsletters,
-        ), 500
+        return _signup_failed(e, email, name, newsletters)
+    return _signup_response(result, email, name, newsletters)
+
+
+def _signup_form() -> tuple[str, str, dict[str, bool]]:
+    email = request.form.get("email", "")
+    name = request.form.get("name", "")
+    newsletters = {key: f"nl_{key}" in request.form for key in newsletter_registry.keys()}
+    return email, name, newsletters
+
+
+def _signup_failed(error: Exception, email: str, name: str, newsletters: dict[str, bool]):
+    logger.error(f"Subscription error: {error}", exc_info=True)
+    return render_template(
+        "subscribe.html",
+        error=f"Database error: {str(error)}",
+        email=email,
+        name=name,
+        newsletters=newsletters,
+    ), 500
+
 
+def _signup_response(result, email: str, name: str, newsletters: dict[str, bool]):
     if not result.success:
         return render_template(
             "subscribe.html",
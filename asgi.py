@@ -0,0 +1,4 @@
+from app import create_app
+from app.presentation.asgi import create_asgi_app
+
+app = create_asgi_app(create_app())
@@ -0,0 +1,4 @@
+"""Micro-benchmarks for the data and presentation layers.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_bulk_delete``.
+"""
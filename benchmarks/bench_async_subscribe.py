@@ -0,0 +1,179 @@
+"""Concurrent signups: gthread workers on wsgi:app vs uvicorn workers on asgi:app.
+
+Starts gunicorn with gunicorn.conf.py for each setup against a fresh SQLite
+file and posts unique signups from --concurrency keep-alive clients for
+--seconds, reporting throughput and latency percentiles.
+
+A local SQLite commit takes microseconds, so --db-latency-ms adds a delay
+per database round trip to model a networked database such as Azure SQL.
+SQLite serializes writers, so the delay is taken outside the write lock: on
+the first statement of a transaction and after the commit. Connections also
+use WAL with synchronous=NORMAL, so that fsyncs of the rollback journal do
+not decide the result. Both paths pay the same delay; the async path waits
+for it on the event loop.
+
+Usage: python -m benchmarks.bench_async_subscribe [--workers 2] [--concurrency 64] [--seconds 5] [--db-latency-ms 5]
+"""
+import argparse
+import http.client
+import itertools
+import os
+import signal
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+SETUPS = {
+    "gthread x4, wsgi:app": ("wsgi_app()", {"GUNICORN_WORKER_CLASS": "gthread", "GUNICORN_THREADS": "4"}),
+    "uvicorn, asgi:app": ("asgi_app()", {"GUNICORN_WORKER_CLASS": "uvicorn_worker.UvicornWorker"}),
+}
+PORT = 5078
+LATENCY_ENV = "BENCH_DB_LATENCY_MS"
+
+
+class SlowCursor(sqlite3.Cursor):
+    def execute(self, *args, **kwargs):
+        self.connection.round_trip()
+        return super().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        self.connection.round_trip()
+        return super().executemany(*args, **kwargs)
+
+
+class SlowConnection(sqlite3.Connection):
+    """sqlite3 connection with a network round trip that never holds the write lock."""
+
+    latency = 0.0
+
+    def round_trip(self) -> None:
+        if not self.in_transaction:
+            time.sleep(self.latency)
+
+    def cursor(self, factory=SlowCursor):
+        return super().cursor(factory)
+
+    def commit(self):
+        super().commit()
+        time.sleep(self.latency)
+
+
+def _install_latency() -> None:
+    """Route sqlite3.connect (pysqlite and aiosqlite) through SlowConnection."""
+    SlowConnection.latency = float(os.environ.get(LATENCY_ENV, "0")) / 1000
+    connect = sqlite3.connect
+
+    def slow_connect(*args, **kwargs):
+        kwargs.setdefault("factory", SlowConnection)
+        conn = connect(*args, **kwargs)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # pysqlite connects through sqlite3.dbapi2, aiosqlite through sqlite3
+    sqlite3.connect = sqlite3.dbapi2.connect = slow_connect
+
+
+def wsgi_app():
+    """gunicorn entry point: ``benchmarks.bench_async_subscribe:wsgi_app()``."""
+    _install_latency()
+    from app import create_app
+
+    return create_app()
+
+
+def asgi_app():
+    """gunicorn entry point: ``benchmarks.bench_async_subscribe:asgi_app()``."""
+    from app.presentation.asgi import create_asgi_app
+
+    return create_asgi_app(wsgi_app())
+
+
+def wait_until_up(timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not come up")
+
+
+def load(concurrency: int, seconds: float) -> tuple[float, list[float], int]:
+    """Signups per second, per-request latencies in ms and non-redirect responses."""
+    counter = itertools.count()
+    latencies: list[list[float]] = [[] for _ in range(concurrency)]
+    failures = [0] * concurrency
+    stop = time.monotonic() + seconds
+
+    def client(slot: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=60)
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        while time.monotonic() < stop:
+            body = urllib.parse.urlencode({"email": f"load{next(counter)}@example.com", "name": "Load"})
+            start = time.perf_counter()
+            conn.request("POST", "/subscribe/confirm", body=body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            latencies[slot].append((time.perf_counter() - start) * 1000)
+            if response.status != 302:
+                failures[slot] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    flat = [ms for slot in latencies for ms in slot]
+    return len(flat) / seconds, flat, sum(failures)
+
+
+def run(entry: str, setup: dict, workers: int, concurrency: int, seconds: float, latency_ms: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ, **setup,
+            "WEB_CONCURRENCY": str(workers), "GUNICORN_BIND": f"127.0.0.1:{PORT}",
+            "SQLITE_PATH": os.path.join(tmp, "bench.db"), "RATE_LIMIT": "none", "FLASK_ENV": "production",
+            LATENCY_ENV: str(latency_ms),
+        }
+        # Production config fast-boots against an existing schema, as in the container
+        subprocess.run([sys.executable, "-m", "flask", "--app", "wsgi", "db", "upgrade"], env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", f"benchmarks.bench_async_subscribe:{entry}"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_up()
+            return load(concurrency, seconds)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--db-latency-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, {args.concurrency} clients, {args.db_latency_ms:g} ms per DB round trip")
+    for name, (entry, setup) in SETUPS.items():
+        rate, latencies, failures = run(entry, setup, args.workers, args.concurrency, args.seconds, args.db_latency_ms)
+        p50, p90, p99 = (statistics.quantiles(latencies, n=100)[i] for i in (49, 89, 98))
+        print(f"{name:<22} {rate:7.0f} signups/s   p50 {p50:6.1f} ms  p90 {p90:6.1f} ms  p99 {p99:6.1f} ms"
+              f"   failed {failures}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""create_app() time with full schema bootstrap versus FAST_BOOT.
+
+Each boot runs in a fresh interpreter, like a gunicorn worker starting up,
+against a SQLite file that has already been upgraded once.
+
+Usage: python -m benchmarks.bench_boot [--runs 10]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BOOT_SNIPPET = (
+    "import json, logging; logging.disable(logging.CRITICAL);"
+    "from app import create_app;"
+    "print(json.dumps(create_app('testing').extensions['boot_stats']))"
+)
+
+
+def boot(env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", BOOT_SNIPPET], env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "SQLITE_PATH": os.path.join(tmp, "boot.db"), "FLASK_APP": "wsgi.py"}
+        subprocess.run([sys.executable, "-m", "flask", "db", "upgrade"], env=env, check=True, capture_output=True)
+
+        for label, fast_boot in (("full bootstrap", "0"), ("fast boot", "1")):
+            stats = [boot({**env, "FAST_BOOT": fast_boot}) for _ in range(args.runs)]
+            boot_ms = statistics.median(s["boot_ms"] for s in stats)
+            schema_ms = statistics.median(s["schema_ms"] for s in stats)
+            print(f"{label:15s} create_app {boot_ms:7.1f} ms median (schema {schema_ms:6.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare per-row deletes with the chunked bulk delete.
+
+Usage: python -m benchmarks.bench_bulk_delete [--rows 5000]
+"""
+import argparse
+import time
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.business.services.subscription_service import SubscriptionService
+from app.data.models import db, Subscriber
+
+
+def seed(rows: int) -> list[int]:
+    db.session.execute(
+        insert(Subscriber),
+        [{"email": f"bench{i}@example.com", "name": f"Bench {i}"} for i in range(rows)],
+    )
+    db.session.commit()
+    return [row[0] for row in db.session.query(Subscriber.id).all()]
+
+
+def delete_loop(service: SubscriptionService, ids: list[int]) -> int:
+    deleted = 0
+    for subscriber_id in ids:
+        if service.delete_subscriber(subscriber_id):
+            deleted += 1
+    return deleted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        service = SubscriptionService()
+        for label, fn in [
+            ("per-row loop", lambda ids: delete_loop(service, ids)),
+            ("bulk delete", service.delete_subscribers_bulk),
+        ]:
+            ids = seed(args.rows)
+            start = time.perf_counter()
+            deleted = fn(ids)
+            elapsed = time.perf_counter() - start
+            print(f"{label:>14}: {deleted} rows in {elapsed * 1000:8.1f} ms "
+                  f"({deleted / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""CPU time vs bytes saved per gzip level, to choose GZIP_LEVEL.
+
+Compresses two typical large responses at levels 1-9: the admin subscriber
+table rendered for --rows subscribers (one HTML body) and a CSV export of
+the same rows fed in the chunks ExportService streams, the way
+GzipMiddleware sees them.
+
+Usage: python -m benchmarks.bench_compression [--rows 10000] [--repeat 3]
+"""
+import argparse
+import statistics
+import time
+
+from app import create_app
+from app.data.repositories.subscriber_repository import SubscriberStats
+from app.presentation.compression import gzip_chunks
+from app.presentation.routes.admin import NEWSLETTER_NAMES
+from benchmarks.bench_render import subscribers
+
+CSV_CHUNK_ROWS = 500
+
+
+def admin_table(app, rows: int) -> list[bytes]:
+    items = subscribers(rows)
+    with app.test_request_context("/admin/subscribers"):
+        html = app.jinja_env.get_template("admin/subscribers.html").render(
+            subscribers=items, count=rows, stats=SubscriberStats(), next_cursor=None, is_first_page=True,
+            per_page=rows, current_sort="date_desc", current_filter=None, current_search="",
+            newsletter_names=NEWSLETTER_NAMES,
+        )
+    return [html.encode()]
+
+
+def csv_export(rows: int) -> list[bytes]:
+    lines = [f"{s.email},{s.name},{s.subscribed_at.isoformat()},{s.newsletter_mask}\n" for s in subscribers(rows)]
+    return ["".join(lines[i:i + CSV_CHUNK_ROWS]).encode() for i in range(0, rows, CSV_CHUNK_ROWS)]
+
+
+def measure(chunks: list[bytes], level: int, repeat: int) -> tuple[int, float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = sum(len(c) for c in gzip_chunks(chunks, level))
+        timings.append((time.perf_counter() - start) * 1000)
+    return size, statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    for name, chunks in (("admin table", admin_table(app, args.rows)), ("csv export", csv_export(args.rows))):
+        raw = sum(len(c) for c in chunks)
+        print(f"{name}: {raw / 1e6:.2f} MB in {len(chunks)} chunks")
+        for level in range(1, 10):
+            size, ms = measure(chunks, level, args.repeat)
+            print(f"  level {level}: {size / 1e3:8.1f} kB ({raw / size:5.1f}x)  {ms:7.1f} ms  {raw / 1e6 / (ms / 1000):6.0f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
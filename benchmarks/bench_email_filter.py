@@ -0,0 +1,68 @@
+"""Email filter build time, memory, false-positive rate and lookup savings.
+
+Seeds --rows subscribers into an in-memory SQLite database, builds the
+filter from them, measures the false-positive rate on unseen emails and
+times existing_emails() on import-sized batches of new addresses with the
+filter on and off.
+
+Usage: python -m benchmarks.bench_email_filter [--rows 200000] [--batches 50]
+"""
+import argparse
+import time
+
+from sqlalchemy import insert
+
+from app import create_app
+from app.data.email_filter import EXTENSION_KEY, EmailFilter
+from app.data.models import db, Subscriber
+from app.data.repositories.subscriber_repository import SubscriberRepository
+
+BATCH = 10000
+IMPORT_BATCH = 1000
+
+
+def seed(rows: int) -> None:
+    for start in range(0, rows, BATCH):
+        db.session.execute(
+            insert(Subscriber.__table__),
+            [{"email": f"user{i}@example.com", "name": "User"} for i in range(start, min(start + BATCH, rows))],
+        )
+    db.session.commit()
+
+
+def time_batches(repo: SubscriberRepository, batches: int) -> float:
+    start = time.perf_counter()
+    for b in range(batches):
+        repo.existing_emails([f"new{b}-{i}@example.org" for i in range(IMPORT_BATCH)])
+    return (time.perf_counter() - start) * 1000 / batches
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batches", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        seed(args.rows)
+        email_filter = EmailFilter(capacity=args.rows)
+        email_filter.build()
+        stats = email_filter.stats()
+        print(f"built {stats.items} emails in {stats.build_ms:.0f} ms")
+        print(f"capacity {stats.capacity}, load {stats.load_factor:.2f}, memory {stats.memory_bytes / 1024:.0f} KiB")
+
+        probes = 200000
+        false_positives = sum(not_seen in email_filter._filter for not_seen in (f"x{i}@example.net" for i in range(probes)))
+        print(f"false-positive rate: estimated {stats.estimated_fpr:.5%}, measured {false_positives / probes:.5%}")
+
+        repo = SubscriberRepository()
+        app.extensions.pop(EXTENSION_KEY, None)
+        without = time_batches(repo, args.batches)
+        app.extensions[EXTENSION_KEY] = email_filter
+        with_filter = time_batches(repo, args.batches)
+        print(f"existing_emails({IMPORT_BATCH} new): {without:.2f} ms without filter, {with_filter:.2f} ms with")
+
+
+if __name__ == "__main__":
+    main()
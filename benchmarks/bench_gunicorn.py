@@ -0,0 +1,124 @@
+"""Throughput and per-worker memory of sync vs gthread gunicorn workers.
+
+Starts gunicorn with gunicorn.conf.py for each setup against a fresh
+SQLite file, drives it with --concurrency keep-alive clients for
+--seconds per endpoint, then reads each worker's RSS, PSS (RSS with shared
+pages split between the processes sharing them) and private memory from
+/proc. Linux only.
+
+Usage: python -m benchmarks.bench_gunicorn [--workers 2] [--concurrency 16] [--seconds 5]
+"""
+import argparse
+import http.client
+import itertools
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+
+SETUPS = {
+    "sync": {"GUNICORN_WORKER_CLASS": "sync", "GUNICORN_PRELOAD": "0"},
+    "sync + preload": {"GUNICORN_WORKER_CLASS": "sync", "GUNICORN_PRELOAD": "1"},
+    "gthread x4 + preload": {"GUNICORN_WORKER_CLASS": "gthread", "GUNICORN_THREADS": "4", "GUNICORN_PRELOAD": "1"},
+}
+PORT = 5077
+
+
+def wait_until_up(timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("gunicorn did not come up")
+
+
+def load(method: str, path: str, concurrency: int, seconds: float) -> float:
+    """Requests per second over ``concurrency`` keep-alive connections."""
+    counter = itertools.count()
+    done = [0] * concurrency
+    stop = time.monotonic() + seconds
+
+    def client(slot: int) -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", PORT, timeout=30)
+        while time.monotonic() < stop:
+            body, headers = None, {}
+            if method == "POST":
+                body = urllib.parse.urlencode({"email": f"load{next(counter)}@example.com", "name": "Load"})
+                headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            conn.request(method, path, body=body, headers=headers)
+            conn.getresponse().read()
+            done[slot] += 1
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(done) / seconds
+
+
+def worker_memory_mb(master_pid: int) -> dict[str, float]:
+    """Average RSS, PSS and private memory per worker, in MB."""
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as f:
+        pids = f.read().split()
+    totals = {"rss": 0, "pss": 0, "private": 0}
+    for pid in pids:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = {line.split(":")[0]: int(line.split()[1]) for line in f if line.endswith("kB\n")}
+        totals["rss"] += fields["Rss"]
+        totals["pss"] += fields["Pss"]
+        totals["private"] += fields["Private_Clean"] + fields["Private_Dirty"]
+    return {name: kb / 1024 / len(pids) for name, kb in totals.items()}
+
+
+def run(setup: dict, workers: int, concurrency: int, seconds: float) -> tuple[dict, dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ, **setup,
+            "WEB_CONCURRENCY": str(workers), "GUNICORN_BIND": f"127.0.0.1:{PORT}",
+            "SQLITE_PATH": os.path.join(tmp, "bench.db"), "RATE_LIMIT": "none", "FLASK_ENV": "production",
+        }
+        # Production config fast-boots against an existing schema, as in the container
+        subprocess.run([sys.executable, "-m", "flask", "--app", "wsgi", "db", "upgrade"], env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_until_up()
+            rates = {
+                "GET /": load("GET", "/", concurrency, seconds),
+                "POST /subscribe/confirm": load("POST", "/subscribe/confirm", concurrency, seconds),
+            }
+            return rates, worker_memory_mb(server.pid)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    for name, setup in SETUPS.items():
+        rates, memory = run(setup, args.workers, args.concurrency, args.seconds)
+        throughput = "  ".join(f"{endpoint} {rate:6.0f}/s" for endpoint, rate in rates.items())
+        print(f"{name:<22} {throughput}   per worker: RSS {memory['rss']:.1f} MB, "
+              f"PSS {memory['pss']:.1f} MB, private {memory['private']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
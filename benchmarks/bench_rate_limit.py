@@ -0,0 +1,65 @@
+"""Per-request overhead of the rate limiter.
+
+Times RateLimiter.hit() for the memory and SQLite backends in one process,
+then with --workers processes hammering the same SQLite file the way
+gunicorn workers on one host would.
+
+Usage: python -m benchmarks.bench_rate_limit [--hits 20000] [--workers 4] [--clients 1000]
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from app.presentation.rate_limit import MemoryRateLimitBackend, RateLimit, RateLimiter, SQLiteRateLimitBackend
+
+LIMITS = {"subscribe": RateLimit(10, 60)}
+
+
+def run(limiter: RateLimiter, hits: int, clients: int) -> float:
+    """Microseconds per hit, spread over ``clients`` IP addresses."""
+    start = time.perf_counter()
+    for i in range(hits):
+        limiter.hit("subscribe", f"10.0.{i % clients // 256}.{i % 256}")
+    return (time.perf_counter() - start) * 1e6 / hits
+
+
+def worker(path: str, hits: int, clients: int, results) -> None:
+    results.put(run(RateLimiter(SQLiteRateLimitBackend(path), LIMITS), hits, clients))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hits", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--clients", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "limits.sqlite")
+        memory = run(RateLimiter(MemoryRateLimitBackend(), LIMITS), args.hits, args.clients)
+        sqlite = run(RateLimiter(SQLiteRateLimitBackend(path), LIMITS), args.hits, args.clients)
+        print(f"memory: {memory:.1f} us/hit")
+        print(f"sqlite: {sqlite:.1f} us/hit (1 process)")
+
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(path, args.hits, args.clients, results))
+            for _ in range(args.workers)
+        ]
+        start = time.perf_counter()
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join()
+        elapsed = time.perf_counter() - start
+        per_worker = [results.get() for _ in processes]
+        print(
+            f"sqlite: {max(per_worker):.1f} us/hit worst of {args.workers} processes, "
+            f"{args.workers * args.hits / elapsed:.0f} hits/s combined"
+        )
+
+
+if __name__ == "__main__":
+    main()
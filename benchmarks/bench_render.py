@@ -0,0 +1,92 @@
+"""Admin subscriber table render time per 1k rows, and template compile time.
+
+Renders admin/subscribers.html for --rows in-memory subscribers without the
+fragment cache, with a cold cache, with a warm cache and with 1% of the rows
+changed. Then times loading every template in a fresh environment with and
+without a populated bytecode cache, i.e. what a new worker pays on first hit.
+
+Usage: python -m benchmarks.bench_render [--rows 1000] [--repeat 5]
+"""
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from jinja2 import FileSystemBytecodeCache
+
+from app import create_app
+from app.data.models import Subscriber
+from app.data.repositories.subscriber_repository import SubscriberStats
+from app.presentation.fragment_cache import EXTENSION_KEY, FragmentCache
+from app.presentation.routes.admin import NEWSLETTER_NAMES
+
+TEMPLATES = ["base.html", "index.html", "subscribe.html", "thank_you.html",
+             "admin/login.html", "admin/subscribers.html", "admin/edit_subscriber.html", "admin/_subscriber_row.html"]
+
+
+def subscribers(rows: int) -> list[Subscriber]:
+    return [
+        Subscriber(
+            id=i, email=f"user{i}@example.com", name=f"User {i}", subscribed_at=datetime(2024, 1, 1),
+            newsletter_mask=i % 32, nl_kost=bool(i & 1), nl_mindset=bool(i & 2), nl_kunskap=bool(i & 4),
+            nl_veckans_pass=bool(i & 8), nl_jaine=bool(i & 16),
+        )
+        for i in range(1, rows + 1)
+    ]
+
+
+def render_ms(app, items: list[Subscriber], repeat: int) -> float:
+    template = app.jinja_env.get_template("admin/subscribers.html")
+    context = dict(
+        subscribers=items, count=len(items), stats=SubscriberStats(), next_cursor=None, is_first_page=True,
+        per_page=len(items), current_sort="date_desc", current_filter=None, current_search="",
+        newsletter_names=NEWSLETTER_NAMES,
+    )
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        template.render(**context)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def compile_ms(app, bytecode_dir: str | None) -> float:
+    env = app.create_jinja_environment()
+    if bytecode_dir:
+        env.bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+    start = time.perf_counter()
+    for name in TEMPLATES:
+        env.get_template(name)
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    items = subscribers(args.rows)
+    per_1k = 1000 / args.rows
+    with app.test_request_context("/admin/subscribers"):
+        app.extensions.pop(EXTENSION_KEY, None)
+        print(f"no fragment cache: {render_ms(app, items, args.repeat) * per_1k:.1f} ms per 1k rows")
+
+        app.extensions[EXTENSION_KEY] = FragmentCache(max_entries=2 * args.rows)
+        print(f"cold fragment cache: {render_ms(app, items, 1) * per_1k:.1f} ms per 1k rows")
+        print(f"warm fragment cache: {render_ms(app, items, args.repeat) * per_1k:.1f} ms per 1k rows")
+        for subscriber in items[::100]:
+            subscriber.name += " (edited)"
+        print(f"1% rows changed: {render_ms(app, items, 1) * per_1k:.1f} ms per 1k rows")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cold = compile_ms(app, None)
+        compile_ms(app, tmp)
+        warm = compile_ms(app, tmp)
+    print(f"load {len(TEMPLATES)} templates: {cold:.1f} ms compiling, {warm:.1f} ms from bytecode cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Admin search latency on a large subscriber table.
+
+Seeds --rows subscribers (with their trigram index) into an in-memory
+SQLite database, then times one page of results per search term.
+
+Usage: python -m benchmarks.bench_search [--rows 200000] [--repeat 5]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import insert, text
+
+from app import create_app
+from app.data.models import db, Subscriber, SubscriberTrigram
+from app.data.repositories.subscriber_repository import SubscriberRepository
+from app.data.search import search_columns, trigram_rows
+
+FIRST_NAMES = ["anna", "erik", "maria", "lars", "karin", "johan", "eva", "nils", "sara", "olof"]
+LAST_NAMES = ["berg", "lind", "holm", "strand", "ek", "dahl", "nyberg", "sjöberg", "falk", "wik"]
+DOMAINS = ["gmail.com", "outlook.se", "hotmail.com", "firma.se", "telia.com"]
+TERMS = ["an", "@gmail", "@firma", "nyberg", "user12345", "olof.falk", "zzzz", "gmail"]
+BATCH = 10000
+
+
+def seed(rows: int) -> None:
+    rng = random.Random(1)
+    for start in range(0, rows, BATCH):
+        values = []
+        for i in range(start, min(start + BATCH, rows)):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            email = f"{first}.{last}.user{i}@{rng.choice(DOMAINS)}"
+            name = f"{first.title()} {last.title()}"
+            values.append({"id": i + 1, "email": email, "name": name, **search_columns(email, name)})
+        db.session.execute(insert(Subscriber.__table__), values)
+        db.session.execute(
+            insert(SubscriberTrigram.__table__),
+            [gram for row in values for gram in trigram_rows(row["id"], row["email"], row["name"])],
+        )
+        db.session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        start = time.perf_counter()
+        seed(args.rows)
+        # Planner statistics, which MSSQL keeps automatically
+        db.session.execute(text("ANALYZE"))
+        print(f"seeded {args.rows} rows in {time.perf_counter() - start:.1f} s")
+
+        repo = SubscriberRepository()
+        for term in TERMS:
+            timings = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                page = repo.get_page("date_desc", None, None, 50, term)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{term!r:>14}: {len(page.items):3d} rows, median {statistics.median(timings):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Signup throughput with and without the write-behind subscription queue.
+
+Runs concurrent client threads against a SQLite file so every COMMIT pays
+for a real fsync, once inserting directly and once through the queue.
+
+Each client waits for its own result, so a batch can never hold more rows
+than there are concurrent clients; keep --batch-size at or below --clients.
+
+Usage: python -m benchmarks.bench_write_behind [--clients 64] [--signups 30]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from app.business.services.subscription_queue import EXTENSION_KEY, SubscriptionQueue
+from app.business.services.subscription_service import SubscriptionService
+from app.data.models import db, Subscriber
+
+
+def run_clients(app, clients: int, signups: int, prefix: str) -> tuple[int, float]:
+    successes = []
+
+    def client(n: int) -> None:
+        ok = 0
+        with app.app_context():
+            service = SubscriptionService()
+            for i in range(signups):
+                if service.subscribe(f"{prefix}-{n}-{i}@example.com", "Bench", {'kost': True}).success:
+                    ok += 1
+            db.session.remove()
+        successes.append(ok)
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(successes), time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--signups", type=int, default=30, help="signups per client")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--flush-ms", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["SQLITE_PATH"] = os.path.join(tmp, "bench.db")
+        from app import create_app
+        app = create_app("testing")
+
+        with app.app_context():
+            db.session.query(Subscriber).delete()
+            db.session.commit()
+
+        rows, elapsed = run_clients(app, args.clients, args.signups, "direct")
+        print(f"{'direct':>12}: {rows} signups in {elapsed:6.2f} s ({rows / elapsed:8,.0f} commits/s)")
+
+        subscription_queue = SubscriptionQueue(app, batch_size=args.batch_size, flush_interval_ms=args.flush_ms)
+        subscription_queue.start()
+        app.extensions[EXTENSION_KEY] = subscription_queue
+        rows, elapsed = run_clients(app, args.clients, args.signups, "queued")
+        subscription_queue.stop()
+        stats = subscription_queue.stats()
+        print(f"{'write-behind':>12}: {rows} signups in {elapsed:6.2f} s ({rows / elapsed:8,.0f} signups/s, "
+              f"{stats.batches} commits, avg batch {stats.committed / max(stats.batches, 1):.1f})")
+
+
+if __name__ == "__main__":
+    main()
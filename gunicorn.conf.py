@@ -0,0 +1,95 @@
+"""Gunicorn settings for the container (``gunicorn -c gunicorn.conf.py wsgi:app``).
+
+The same file serves the ASGI entry point, which runs signups on an event
+loop (see app/presentation/asgi.py):
+
+    GUNICORN_WORKER_CLASS=uvicorn_worker.UvicornWorker gunicorn -c gunicorn.conf.py asgi:app
+
+Workers and threads are sized from the CPUs the container may use; every
+setting can be overridden through the environment:
+
+    WEB_CONCURRENCY        workers (CPUs + 1 for gthread and uvicorn, 2 x CPUs + 1
+                           for sync, at most GUNICORN_MAX_WORKERS, default 8)
+    GUNICORN_WORKER_CLASS  gthread (default), sync or uvicorn_worker.UvicornWorker
+    GUNICORN_THREADS       threads per worker (4 for gthread, 1 for sync)
+    GUNICORN_PRELOAD       1 (default) creates the app once in the master and forks it
+    GUNICORN_TIMEOUT       worker timeout in seconds (default 120)
+    GUNICORN_BIND          listen address (default 0.0.0.0:5000)
+
+Each worker holds up to pool_size + max_overflow DB connections, so keep
+workers x that within what the database allows. Threads above pool_size
+wait for a connection.
+"""
+import gc
+import os
+
+
+def _cpu_count() -> int:
+    """CPUs available to this process, honouring a cgroup v2 CPU quota."""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, round(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return cpus
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _flask_app(app):
+    """The Flask app behind a loaded WSGI or ASGI (asgi.py) application."""
+    return getattr(app, "flask_app", app)
+
+
+cpus = _cpu_count()
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+gthread = worker_class == "gthread"
+# An event loop worker overlaps DB round trips like a gthread worker does
+overlapping = gthread or worker_class == "uvicorn_worker.UvicornWorker"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+threads = _env_int("GUNICORN_THREADS", 4 if gthread else 1)
+# gthread and uvicorn workers overlap DB round trips and need fewer processes
+workers = _env_int("WEB_CONCURRENCY", min(cpus + 1 if overlapping else 2 * cpus + 1, _env_int("GUNICORN_MAX_WORKERS", 8)))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1").strip().lower() in ("1", "true", "yes", "on")
+timeout = _env_int("GUNICORN_TIMEOUT", 120)
+graceful_timeout = 30
+keepalive = 5
+
+
+def when_ready(server):
+    """Master, after preloading and before the first fork."""
+    if not server.cfg.preload_app:
+        return
+    from app.lifecycle import warm_templates
+
+    app = _flask_app(server.app.wsgi())
+    server.log.info(f"Templates loaded in the master in {warm_templates(app):.1f} ms")
+    # Move everything allocated so far out of the collector's reach: a GC pass
+    # in a worker would otherwise write to every object header and un-share its pages
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Worker, right after fork."""
+    if server.cfg.preload_app:
+        from app.lifecycle import after_fork
+
+        after_fork(_flask_app(server.app.wsgi()))
+
+
+def post_worker_init(worker):
+    """Worker, after loading the app and before accepting connections."""
+    from app.lifecycle import warm_pool, warm_templates
+
+    app = _flask_app(worker.wsgi)
+    templates_ms = warm_templates(app)
+    pool_ms = warm_pool(app, connections=worker.cfg.threads)
+    worker.log.info(f"Worker {worker.pid} warm: templates {templates_ms:.1f} ms, DB pool {pool_ms:.1f} ms")
@@ -1,5 +1,8 @@
 #!/usr/bin/env python3
-"""Database migration script to add newsletter columns to subscribers table."""
+"""Apply pending schema migrations to the production database.
+
+Same as ``flask db upgrade``; kept for existing deploy scripts.
+"""
 import os
 import sys
 
@@ -9,43 +12,24 @@ os.environ["DB_SERVER"] = os.environ.get("DB_SERVER", "deplojdb.database.windows
 os.environ["DB_NAME"] = os.environ.get("DB_NAME", "deplojdb1")
 os.environ["DB_USERNAME"] = os.environ.get("DB_USERNAME", "deplojadmin@deplojdb")
 os.environ["DB_PASSWORD"] = os.environ.get("DB_PASSWORD", "")
+# Only the migration below should touch the schema.
+os.environ.setdefault("FAST_BOOT", "1")
 
 
 def run_migration():
     """Run database migration."""
     from app import create_app
-    from app.data.models import db
-    from sqlalchemy import text
+    from app.data.bootstrap import bootstrap_database
+    from app.data.migrations import MigrationContext, MigrationError
 
     app = create_app()
     with app.app_context():
-        # Check if columns exist
-        result = db.session.execute(text("""
-            SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS 
-            WHERE TABLE_NAME = 'subscribers'
-            ORDER BY ORDINAL_POSITION
-        """))
-        columns = [row[0] for row in result]
-        
-        print('Current columns in subscribers table:')
-        for col in columns:
-            print(f'  - {col}')
-        
-        # Add missing columns
-        for col in ['nl_kost', 'nl_mindset', 'nl_kunskap', 'nl_veckans_pass', 'nl_jaine']:
-            if col not in columns:
-                print(f'Adding column: {col}...')
-                try:
-                    db.session.execute(text(f'ALTER TABLE subscribers ADD {col} BIT NOT NULL DEFAULT 0'))
-                    db.session.commit()
-                    print(f'  ✓ Added {col}')
-                except Exception as e:
-                    db.session.rollback()
-                    print(f'  ✗ Failed to add {col}: {e}')
-            else:
-                print(f'  ✓ {col} already exists')
-        
-        print('\nMigration complete!')
+        try:
+            version = bootstrap_database(MigrationContext(echo=print))
+        except MigrationError as e:
+            print(f'  ✗ {e}')
+            sys.exit(1)
+        print(f'\nMigration complete! Schema version {version}')
 
 if __name__ == "__main__":
     run_migration()
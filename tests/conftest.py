@@ -10,9 +10,9 @@ def app():
     app.config["WTF_CSRF_ENABLED"] = False
 
     with app.app_context():
-        db.create_all()
+        db.create_all(bind_key=None)
         yield app
-        db.drop_all()
+        db.drop_all(bind_key=None)
 
 
 @pytest.fixture(scope="session")
@@ -36,11 +36,27 @@ def db_session(app):
 def clean_db(app):
     """Clean database before and after test."""
     with app.app_context():
-        from app.data.models import Subscriber, User
+        from app.data.models import Subscriber, SubscriberTrigram, User
+        from app.data.repositories.subscriber_repository import SubscriberRepository
         Subscriber.query.delete()
+        SubscriberTrigram.query.delete()
         User.query.delete()
         db.session.commit()
+        SubscriberRepository().reconcile_counters()
         yield
         Subscriber.query.delete()
+        SubscriberTrigram.query.delete()
         User.query.delete()
         db.session.commit()
+        SubscriberRepository().reconcile_counters()
+
+
+@pytest.fixture
+def admin_client(client):
+    """Test client with an authenticated admin session."""
+    with client.session_transaction() as sess:
+        sess["admin_logged_in"] = True
+        sess["admin_username"] = "admin"
+    yield client
+    with client.session_transaction() as sess:
+        sess.clear()
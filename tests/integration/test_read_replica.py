@@ -0,0 +1,130 @@
+import pytest
+from sqlalchemy import text
+from app import create_app
+from app.data.models import db
+from app.business.services.subscription_service import SubscriptionService
+from app.data.repositories.subscriber_repository import DuplicateEmailError, SubscriberRepository
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """App with a primary and a read replica in two separate SQLite files."""
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "primary.db"))
+    monkeypatch.setenv("SQLITE_REPLICA_PATH", str(tmp_path / "replica.db"))
+    app = create_app("testing")
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines["replica"])
+    yield app
+    with app.app_context():
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+
+
+def insert_row(app, bind_key, email, name):
+    with app.app_context():
+        engine = db.engines[bind_key]
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO subscribers (email, name, newsletter_mask, subscribed_at) "
+                     "VALUES (:email, :name, 0, CURRENT_TIMESTAMP)"),
+                {"email": email, "name": name},
+            )
+
+
+def replicate(app):
+    """Copy every primary row to the replica, as replication eventually would."""
+    with app.app_context():
+        rows = db.engines[None].connect().execute(text("SELECT id, email, name FROM subscribers")).fetchall()
+        with db.engines["replica"].begin() as conn:
+            conn.execute(text("DELETE FROM subscribers"))
+            for row in rows:
+                conn.execute(
+                    text("INSERT INTO subscribers (id, email, name, newsletter_mask, subscribed_at) "
+                         "VALUES (:id, :email, :name, 0, CURRENT_TIMESTAMP)"),
+                    dict(row._mapping),
+                )
+
+
+class TestReadReplicaRouting:
+    def test_reads_use_replica_and_writes_use_primary(self, replica_app):
+        insert_row(replica_app, "replica", "replica-only@example.com", "Replica")
+        with replica_app.app_context():
+            repo = SubscriberRepository()
+
+            assert [s.email for s in repo.get_all()] == ["replica-only@example.com"]
+            assert repo.count() == 1
+            # Duplicate checks stay on the primary
+            assert repo.find_by_email("replica-only@example.com") is None
+
+        with replica_app.app_context():
+            SubscriberRepository().save("new@example.com", "New", {})
+
+        with replica_app.app_context():
+            primary = db.engines[None].connect().execute(text("SELECT email FROM subscribers")).fetchall()
+            assert [r[0] for r in primary] == ["new@example.com"]
+            assert SubscriberRepository().find_by_email("new@example.com") is not None
+            assert SubscriberRepository().exists("new@example.com")
+
+    def test_session_reads_its_own_writes(self, replica_app):
+        with replica_app.app_context():
+            repo = SubscriberRepository()
+            saved = repo.save("mine@example.com", "Mine", {})
+
+            assert repo.find_by_id(saved.id) is not None
+
+    def test_admin_reads_primary_after_edit(self, replica_app):
+        insert_row(replica_app, None, "edit@example.com", "Before")
+        replicate(replica_app)
+        client = replica_app.test_client()
+        with client.session_transaction() as sess:
+            sess["admin_logged_in"] = True
+
+        client.post("/admin/subscribers/1/edit", data={"email": "edit@example.com", "name": "After"})
+        response = client.get("/admin/subscribers")
+
+        assert b"After" in response.data
+
+        with client.session_transaction() as sess:
+            sess["read_primary_until"] = 0
+        response = client.get("/admin/subscribers")
+
+        assert b"Before" in response.data
+
+
+class TestDuplicateChecksOnPrimary:
+    def test_update_to_an_email_the_replica_has_not_seen(self, replica_app):
+        insert_row(replica_app, None, "taken@example.com", "Taken")
+        insert_row(replica_app, None, "mover@example.com", "Mover")
+        with replica_app.app_context():
+            mover = SubscriberRepository().find_by_email("mover@example.com")
+            result = SubscriptionService().update_subscriber(mover.id, "taken@example.com", "Mover")
+
+            assert not result.success
+            assert result.error == "Email already in use"
+
+    def test_unique_violation_on_update_rolls_back(self, replica_app):
+        insert_row(replica_app, None, "taken@example.com", "Taken")
+        insert_row(replica_app, None, "mover@example.com", "Mover")
+        with replica_app.app_context():
+            repo = SubscriberRepository()
+            mover = repo.find_by_email("mover@example.com")
+
+            with pytest.raises(DuplicateEmailError):
+                repo.update(mover.id, "taken@example.com", "Mover")
+
+            assert repo.find_by_email("mover@example.com") is not None
+            assert repo.update(mover.id, "moved@example.com", "Mover").email == "moved@example.com"
+
+    def test_update_race_reports_email_in_use(self, replica_app, monkeypatch):
+        insert_row(replica_app, None, "taken@example.com", "Taken")
+        insert_row(replica_app, None, "mover@example.com", "Mover")
+        with replica_app.app_context():
+            mover_id = SubscriberRepository().find_by_email("mover@example.com").id
+            # The other row commits after the check
+            monkeypatch.setattr(SubscriberRepository, "find_by_email", lambda self, email: None)
+            result = SubscriptionService().update_subscriber(mover_id, "taken@example.com", "Mover")
+
+        assert result.error == "Email already in use"
@@ -76,6 +76,36 @@ class TestSubscribeRoutes:
         assert response.status_code == 200
         assert b"My Name" in response.data
 
+    def test_duplicate_subscribe_shows_error_not_500(self, client, clean_db):
+        data = {"email": "twice@example.com", "name": "Twice", "nl_kost": "1"}
+        client.post("/subscribe/confirm", data=data)
+
+        response = client.post("/subscribe/confirm", data=data)
+
+        assert response.status_code == 200
+        assert b"Email already subscribed" in response.data
+
+    def test_subscribe_flood_gets_429(self, app, client, clean_db, monkeypatch):
+        from app.presentation.rate_limit import RateLimit, get_rate_limiter
+        with app.app_context():
+            limiter = get_rate_limiter()
+        monkeypatch.setitem(limiter.limits, "subscribe", RateLimit(2, 60))
+        limiter.backend.clear()
+        try:
+            statuses = [
+                client.post("/subscribe/confirm", data={"email": f"bot{i}@example.com", "name": "Bot"}).status_code
+                for i in range(3)
+            ]
+            response = client.post("/subscribe/confirm", data={"email": "bot9@example.com", "name": "Bot"})
+        finally:
+            limiter.backend.clear()
+
+        assert statuses == [302, 302, 429]
+        assert response.status_code == 429
+        assert 1 <= int(response.headers["Retry-After"]) <= 30
+        # Only POSTs are limited
+        assert client.get("/subscribe").status_code == 200
+
 
 class TestPublicRoutes:
     def test_index_page(self, client):
@@ -85,3 +115,254 @@ class TestPublicRoutes:
     def test_subscribe_link_exists(self, client):
         response = client.get("/")
         assert b"subscribe" in response.data.lower() or b"Subscribe" in response.data
+
+
+class TestPageCache:
+    def test_landing_page_is_served_from_memory(self, client, app):
+        cache = app.extensions["page_cache"]
+        hits = cache.stats().hits
+
+        response = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert cache.stats().hits == hits + 1
+
+        assert response.headers["ETag"].endswith('-gz"')
+
+        revalidated = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == response.headers["ETag"]
+
+        refused = client.get("/", headers={"Accept-Encoding": "gzip;q=0"})
+        assert "Content-Encoding" not in refused.headers
+
+    def test_thank_you_page_fills_in_the_subscriber(self, client):
+        response = client.get("/subscribe/thank-you?email=a%40example.com&name=%3Cb%3EAnna%3C%2Fb%3E")
+
+        assert b"a@example.com" in response.data
+        assert b"&lt;b&gt;Anna&lt;/b&gt;" in response.data
+        assert b"<b>Anna" not in response.data
+
+    def test_error_re_render_is_not_cached(self, client, clean_db):
+        client.post("/subscribe/confirm", data={"email": "not-an-email", "name": "X"})
+
+        assert b"not-an-email" not in client.get("/subscribe").data
+
+
+class TestAssets:
+    def test_pages_link_fingerprinted_bundles(self, client, app):
+        manifest = app.extensions["assets"]
+        body = client.get("/").data.decode()
+
+        assert f"/assets/{manifest.files['base.css']}" in body
+        assert f"/assets/{manifest.files['index.css']}" in body
+        assert f"/assets/{manifest.files['images/Jane.jpg']}" in body
+        assert "<style>" not in body
+
+    def test_asset_is_immutable_and_gzipped(self, client, app):
+        url = f"/assets/{app.extensions['assets'].files['base.css']}"
+
+        response = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.mimetype == "text/css"
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+        plain = client.get(url)
+        assert "Content-Encoding" not in plain.headers
+        assert plain.headers["ETag"] != response.headers["ETag"]
+
+        revalidated = client.get(url, headers={"If-None-Match": plain.headers["ETag"]})
+        assert revalidated.status_code == 304
+
+    def test_unknown_asset_is_404(self, client):
+        assert client.get("/assets/base.000000000000.css").status_code == 404
+        assert client.get("/assets/manifest.json").status_code == 404
+
+
+class TestAdminRoutes:
+    def test_subscribers_list_is_paginated(self, admin_client, app, clean_db):
+        from app.data.repositories.subscriber_repository import SubscriberRepository
+        with app.app_context():
+            repo = SubscriberRepository()
+            for i in range(3):
+                repo.save(f"admin{i}@example.com", f"Admin {i}", {})
+
+        response = admin_client.get("/admin/subscribers?sort=email_asc&per_page=2")
+        assert response.status_code == 200
+        assert b"3 subscribers total" in response.data
+        assert b"admin0@example.com" in response.data
+        assert b"admin2@example.com" not in response.data
+        assert b"Next page" in response.data
+
+    def test_subscribers_search(self, admin_client, app, clean_db):
+        from app.data.repositories.subscriber_repository import SubscriberRepository
+        with app.app_context():
+            repo = SubscriberRepository()
+            repo.save("findme@example.com", "Greta Garbo", {})
+            repo.save("other@example.com", "Someone Else", {})
+
+        response = admin_client.get("/admin/subscribers?q=garbo")
+        assert b"findme@example.com" in response.data
+        assert b"other@example.com" not in response.data
+        assert b"1 subscriber matching" in response.data
+
+        data = admin_client.get("/admin/subscribers/search?q=@example&sort=email_asc&per_page=1").get_json()
+        assert [s["email"] for s in data["subscribers"]] == ["findme@example.com"]
+        assert data["next_cursor"]
+
+    def test_subscribers_list_answers_conditional_get(self, admin_client, app, clean_db):
+        from app.data.repositories.subscriber_repository import SubscriberRepository
+        with app.app_context():
+            SubscriberRepository().save("etag@example.com", "Etag", {})
+
+        first = admin_client.get("/admin/subscribers")
+        etag = first.headers["ETag"]
+        again = admin_client.get("/admin/subscribers", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.data == b""
+
+        with app.app_context():
+            SubscriberRepository().save("etag2@example.com", "Etag Two", {})
+        changed = admin_client.get("/admin/subscribers", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert b"etag2@example.com" in changed.data
+
+    def test_subscribers_etag_expires_with_the_result_cache_ttl(self, admin_client, app, clean_db, monkeypatch):
+        import time
+        now = time.time()
+        etag = admin_client.get("/admin/subscribers").headers["ETag"]
+        assert admin_client.get("/admin/subscribers", headers={"If-None-Match": etag}).status_code == 304
+
+        monkeypatch.setattr(time, "time", lambda: now + 2 * app.config["RESULT_CACHE_TTL"])
+        aged = admin_client.get("/admin/subscribers", headers={"If-None-Match": etag})
+        assert aged.status_code == 200
+        assert aged.headers["ETag"] != etag
+
+    def test_asset_changes_invalidate_the_subscribers_etag(self, admin_client, app, clean_db, monkeypatch):
+        from app.presentation.asset_pipeline import EXTENSION_KEY, AssetManifest
+        etag = admin_client.get("/admin/subscribers").headers["ETag"]
+
+        manifest = app.extensions[EXTENSION_KEY]
+        files = {**manifest.files, "base.css": "base.000000000000.css"}
+        monkeypatch.setitem(app.extensions, EXTENSION_KEY, AssetManifest(manifest.build_dir, files))
+        changed = admin_client.get("/admin/subscribers", headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    def test_subscriber_stats_endpoint(self, admin_client, app, clean_db):
+        from app.data.repositories.subscriber_repository import SubscriberRepository
+        with app.app_context():
+            SubscriberRepository().save("statsroute@example.com", "Stats", {'jaine': True})
+
+        data = admin_client.get("/admin/stats/subscribers").get_json()
+        assert data["total"] == 1
+        assert data["newsletters"]["jaine"] == 1
+        assert data["last_24h"] == 1
+
+    def test_delete_multiple_reports_deleted_count(self, admin_client, app, clean_db):
+        from app.data.repositories.subscriber_repository import SubscriberRepository
+        with app.app_context():
+            repo = SubscriberRepository()
+            ids = [repo.save(f"delmany{i}@example.com", f"Del {i}", {}).id for i in range(3)]
+
+        response = admin_client.post(
+            "/admin/subscribers/delete-multiple",
+            json={"ids": [str(i) for i in ids[:2]] + ["99999"]},
+        )
+        assert response.get_json() == {"success": True, "deleted": 2}
+        with app.app_context():
+            assert SubscriberRepository().count() == 1
+
+    def test_import_upload_returns_report(self, admin_client, clean_db):
+        import io
+        response = admin_client.post(
+            "/admin/subscribers/import",
+            data={"file": (io.BytesIO(b"email,name\nup@example.com,Up\nbad,Bad\n"), "list.csv")},
+            content_type="multipart/form-data",
+        )
+
+        body = response.get_json()
+        assert body["success"] is True
+        assert body["imported"] == 1
+        assert body["errors"] == [{"line": 3, "email": "bad", "error": "Invalid email format"}]
+
+    @pytest.mark.parametrize("content", [
+        b"email,name\nup@example.com,Caf\xe9\n",
+        b'email,name\nup@example.com,"' + b"x" * 200000 + b'"\n',
+    ], ids=["not-utf8", "field-too-large"])
+    def test_import_upload_rejects_an_unreadable_file(self, admin_client, clean_db, content):
+        import io
+        response = admin_client.post(
+            "/admin/subscribers/import",
+            data={"file": (io.BytesIO(content), "list.csv")},
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 400
+        body = response.get_json()
+        assert body["success"] is False
+        assert body["error"].startswith("Could not read file")
+
+    def test_import_cli_writes_report(self, runner, app, clean_db, tmp_path):
+        source = tmp_path / "list.ndjson"
+        source.write_text('{"email": "cli@example.com"}\n{"email": ""}\n')
+        report = tmp_path / "errors.csv"
+
+        result = runner.invoke(args=["subscribers", "import", str(source), "--report", str(report)])
+
+        assert result.exit_code == 0, result.output
+        assert "1 imported" in result.output
+        assert report.read_text().splitlines() == ["line,email,error", "2,,Email is required"]
+
+    def test_export_streams_gzip_csv(self, admin_client, app, clean_db):
+        import gzip
+        from app.data.repositories.subscriber_repository import SubscriberRepository
+        with app.app_context():
+            SubscriberRepository().save("export@example.com", "Export", {'mindset': True})
+
+        response = admin_client.get("/admin/subscribers/export?format=csv&gzip=1")
+
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.headers["Content-Disposition"] == "attachment; filename=subscribers.csv.gz"
+        assert b"export@example.com,Export," in gzip.decompress(response.data)
+
+    def test_subscriber_table_is_gzipped_for_gzip_clients(self, admin_client, app, clean_db):
+        import gzip
+        from app.data.repositories.subscriber_repository import SubscriberRepository
+        with app.app_context():
+            SubscriberRepository().save("table@example.com", "Table", {})
+
+        response = admin_client.get("/admin/subscribers", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert b"table@example.com" in gzip.decompress(response.data)
+
+    def test_export_cli_outlook(self, runner, app, clean_db):
+        from app.data.repositories.subscriber_repository import SubscriberRepository
+        with app.app_context():
+            SubscriberRepository().save("cli1@example.com", "One", {})
+            SubscriberRepository().save("cli2@example.com", "Two", {})
+
+        result = runner.invoke(args=["subscribers", "export", "--format", "outlook", "--sort", "email_asc"])
+
+        assert result.exit_code == 0, result.output
+        assert result.output == "cli1@example.com; cli2@example.com"
+
+    def test_pool_stats_endpoint(self, admin_client):
+        response = admin_client.get("/admin/stats/pool")
+
+        body = response.get_json()
+        assert "primary" in body["engines"]
+        assert body["engines"]["primary"]["checkout_wait"]["count"] >= 0
+
+    def test_email_filter_stats_endpoint(self, admin_client):
+        body = admin_client.get("/admin/stats/email-filter").get_json()
+
+        assert body["enabled"] is True
+        assert body["memory_bytes"] > 0
+        assert "estimated_fpr" in body and "observed_fpr" in body
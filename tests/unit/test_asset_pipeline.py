@@ -0,0 +1,39 @@
+import gzip
+import json
+
+from app.presentation import asset_pipeline
+from app.presentation.asset_pipeline import build_assets, fingerprinted_name
+
+
+class TestBuild:
+    def test_outputs_are_named_by_content(self, tmp_path):
+        manifest = build_assets(str(tmp_path))
+
+        output = manifest.files["base.css"]
+        content = (tmp_path / output).read_bytes()
+        assert output == fingerprinted_name("base.css", content)
+        assert output.startswith("base.") and output.endswith(".css")
+        assert json.loads((tmp_path / "manifest.json").read_text())["base.css"] == output
+
+    def test_text_assets_get_gzip_variants(self, tmp_path):
+        manifest = build_assets(str(tmp_path))
+
+        css = manifest.files["admin/subscribers.css"]
+        assert css in manifest.gzipped
+        assert gzip.decompress((tmp_path / (css + ".gz")).read_bytes()) == (tmp_path / css).read_bytes()
+        # Images are already compressed
+        assert manifest.files["images/Jane.jpg"] not in manifest.gzipped
+
+    def test_changed_source_gets_a_new_name(self, tmp_path, monkeypatch):
+        source = tmp_path / "src"
+        (source / "css").mkdir(parents=True)
+        (source / "css" / "base.css").write_text("body { color: red; }")
+        monkeypatch.setattr(asset_pipeline, "SOURCE_DIR", str(source))
+        monkeypatch.setattr(asset_pipeline, "BUNDLES", {"base.css": ["css/base.css"]})
+        first = build_assets(str(tmp_path / "out")).files["base.css"]
+
+        (source / "css" / "base.css").write_text("body { color: blue; }")
+        second = build_assets(str(tmp_path / "out")).files["base.css"]
+
+        assert first != second
+        assert (tmp_path / "out" / first).exists() and (tmp_path / "out" / second).exists()
@@ -0,0 +1,193 @@
+import asyncio
+
+import pytest
+
+from app import create_app
+from app.business.services.subscription_queue import EXTENSION_KEY as QUEUE_KEY, SubscriptionQueue
+from app.business.services.subscription_service import AsyncSubscriptionService
+from app.config import get_async_database_uri
+from app.data.models import Subscriber, db
+from app.data.repositories.subscriber_repository import SubscriberRepository
+from app.presentation.asgi import build_environ, create_asgi_app
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "app.db"))
+    app = create_app("testing")
+    yield app
+    asyncio.run(app.extensions["async_db"].dispose())
+
+
+def run_asgi(asgi_app, method: str, path: str, body: bytes = b"", headers: list | None = None) -> dict:
+    """Send one HTTP request through an ASGI app; returns status, headers and body."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"localhost")] + (headers or []), "client": ("127.0.0.1", 5000),
+        "server": ("localhost", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(asgi_app(scope, receive, send))
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    return {
+        "status": start["status"],
+        "headers": {k.decode(): v.decode() for k, v in start["headers"]},
+        "body": b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body"),
+    }
+
+
+class TestAsyncDatabaseUri:
+    def test_sqlite_file_maps_to_aiosqlite(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "app.db"))
+        assert get_async_database_uri() == f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+
+    def test_in_memory_sqlite_has_no_async_engine(self, monkeypatch):
+        monkeypatch.delenv("SQLITE_PATH", raising=False)
+        monkeypatch.delenv("ASYNC_DATABASE_URI", raising=False)
+        monkeypatch.delenv("DB_TYPE", raising=False)
+        assert get_async_database_uri() == ""
+
+    def test_explicit_uri_wins(self, monkeypatch):
+        monkeypatch.setenv("ASYNC_DATABASE_URI", "mssql+aioodbc://u:p@dsn")
+        assert get_async_database_uri() == "mssql+aioodbc://u:p@dsn"
+
+
+class TestAsyncSubscriptionService:
+    def test_subscribe_writes_row_counters_and_search_index(self, file_app):
+        service = AsyncSubscriptionService()
+        with file_app.app_context():
+            result = asyncio.run(service.subscribe("Async@Example.com", "Ada", {"weekly": True}))
+
+            assert result.success
+            assert result.subscriber.id is not None
+            assert result.subscriber.email == "async@example.com"
+            assert db.session.get(Subscriber, result.subscriber.id).name == "Ada"
+            repository = SubscriberRepository()
+            assert repository.reconcile_counters() == {}
+            assert repository.count(search="async") == 1
+
+    def test_duplicate_email(self, file_app):
+        service = AsyncSubscriptionService()
+        with file_app.app_context():
+            assert asyncio.run(service.subscribe("dup@example.com", "One")).success
+            result = asyncio.run(service.subscribe("dup@example.com", "Two"))
+
+        assert not result.success
+        assert result.error == "Email already subscribed"
+
+    def test_concurrent_signups_on_one_loop(self, file_app):
+        service = AsyncSubscriptionService()
+
+        async def signup_many():
+            return await asyncio.gather(
+                *(service.subscribe(f"user{i}@example.com", f"User {i}") for i in range(20))
+            )
+
+        with file_app.app_context():
+            results = asyncio.run(signup_many())
+            assert all(r.success for r in results)
+            assert Subscriber.query.count() == 20
+
+    def test_invalid_email_never_reaches_the_database(self, file_app):
+        with file_app.app_context():
+            result = asyncio.run(AsyncSubscriptionService().subscribe("not-an-email", "X"))
+        assert not result.success
+        assert "email" in result.error.lower()
+
+    def test_queue_timeout_leaves_the_signup_to_commit(self, file_app, monkeypatch):
+        subscription_queue = SubscriptionQueue(file_app, batch_size=10, flush_interval_ms=300)
+        subscription_queue.start()
+        monkeypatch.setitem(file_app.extensions, QUEUE_KEY, subscription_queue)
+        monkeypatch.setitem(file_app.config, "SUBSCRIBE_RESULT_TIMEOUT", 0.01)
+        with file_app.app_context():
+            result = asyncio.run(AsyncSubscriptionService().subscribe("late@example.com", "Late"))
+        same_batch = subscription_queue.submit("next@example.com", "Next")
+        subscription_queue.stop()
+
+        assert result.success and result.pending
+        assert same_batch.result().success
+        assert subscription_queue.stats().failed == 0
+        assert subscription_queue.stats().committed == 2
+        with file_app.app_context():
+            assert Subscriber.query.filter_by(email="late@example.com").count() == 1
+
+    def test_without_async_engine_runs_the_sync_path_on_a_thread(self, monkeypatch):
+        monkeypatch.delenv("SQLITE_PATH", raising=False)
+        app = create_app("testing")
+        assert "async_db" not in app.extensions
+        with app.app_context():
+            result = asyncio.run(AsyncSubscriptionService().subscribe("thread@example.com", "T"))
+            assert result.success
+            assert Subscriber.query.filter_by(email="thread@example.com").count() == 1
+
+
+class TestAsgiApp:
+    def test_signup_post_runs_the_async_view(self, file_app):
+        asgi_app = create_asgi_app(file_app)
+        response = run_asgi(
+            asgi_app, "POST", "/subscribe/confirm", b"email=asgi%40example.com&name=Asgi",
+            [(b"content-type", b"application/x-www-form-urlencoded")],
+        )
+
+        assert response["status"] == 302
+        assert "/subscribe/thank-you" in response["headers"]["location"]
+        with file_app.app_context():
+            assert Subscriber.query.filter_by(email="asgi@example.com").count() == 1
+
+    def test_signup_errors_render_the_form(self, file_app):
+        response = run_asgi(
+            create_asgi_app(file_app), "POST", "/subscribe/confirm", b"email=bad&name=X",
+            [(b"content-type", b"application/x-www-form-urlencoded")],
+        )
+        assert response["status"] == 200
+        assert b"<form" in response["body"]
+
+    def test_other_routes_go_through_the_wsgi_app(self, file_app):
+        response = run_asgi(create_asgi_app(file_app), "GET", "/subscribe")
+        assert response["status"] == 200
+        assert b"<form" in response["body"]
+
+    def test_lifespan_shutdown_disposes_the_engine(self, file_app):
+        asgi_app = create_asgi_app(file_app)
+        async_db = file_app.extensions["async_db"]
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        async def lifespan():
+            async_db.engine
+            await asgi_app({"type": "lifespan"}, receive, send)
+
+        asyncio.run(lifespan())
+        assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+        assert async_db._engine is None
+
+    def test_build_environ_maps_headers(self):
+        environ = build_environ(
+            {
+                "method": "POST", "path": "/subscribe/confirm", "query_string": b"a=1",
+                "headers": [(b"content-type", b"text/plain"), (b"x-forwarded-for", b"1.2.3.4"), (b"content-length", b"9")],
+                "client": ("10.0.0.1", 1234),
+            },
+            b"body",
+        )
+        assert environ["CONTENT_TYPE"] == "text/plain"
+        assert environ["CONTENT_LENGTH"] == "4"
+        assert environ["HTTP_X_FORWARDED_FOR"] == "1.2.3.4"
+        assert environ["REMOTE_ADDR"] == "10.0.0.1"
+        assert environ["QUERY_STRING"] == "a=1"
+        assert environ["wsgi.input"].read() == b"body"
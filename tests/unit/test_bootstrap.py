@@ -0,0 +1,64 @@
+import logging
+
+import pytest
+from sqlalchemy import inspect
+from app import create_app
+from app.data.bootstrap import SCHEMA_VERSION, check_schema_version, current_schema_version
+from app.data.models import db
+
+
+@pytest.fixture
+def file_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "boot.db"))
+    monkeypatch.setenv("FAST_BOOT", "1")
+
+
+class TestFastBoot:
+    def test_fast_boot_skips_schema_work(self, file_db):
+        app = create_app("testing")
+
+        with app.app_context():
+            assert not inspect(db.engine).has_table("subscribers")
+            assert current_schema_version() is None
+            assert check_schema_version() is False
+        assert app.extensions["boot_stats"]["fast_boot"] is True
+
+    def test_upgrade_then_fast_boot_passes_version_check(self, file_db):
+        app = create_app("testing")
+        result = app.test_cli_runner().invoke(args=["db", "upgrade"])
+        assert result.exit_code == 0
+        assert f"version {SCHEMA_VERSION}" in result.output
+
+        app = create_app("testing")
+        with app.app_context():
+            assert inspect(db.engine).has_table("subscribers")
+            assert check_schema_version() is True
+        assert app.test_cli_runner().invoke(args=["db", "status"]).exit_code == 0
+
+    def test_upgrade_is_idempotent(self, file_db):
+        app = create_app("testing")
+        runner = app.test_cli_runner()
+        assert runner.invoke(args=["db", "upgrade"]).exit_code == 0
+        assert runner.invoke(args=["db", "upgrade"]).exit_code == 0
+
+        with app.app_context():
+            assert current_schema_version() == SCHEMA_VERSION
+
+    def test_upgrade_logs_no_warnings(self, file_db, caplog):
+        app = create_app("testing")
+        caplog.clear()
+        with caplog.at_level(logging.INFO):
+            assert app.test_cli_runner().invoke(args=["db", "upgrade"]).exit_code == 0
+
+        assert [r.getMessage() for r in caplog.records if r.levelno >= logging.WARNING] == []
+        assert "Created default admin user: admin" in [
+            r.getMessage() for r in caplog.records if r.name == "app.data.bootstrap"
+        ]
+
+    def test_in_memory_database_is_always_bootstrapped(self, monkeypatch):
+        monkeypatch.delenv("SQLITE_PATH", raising=False)
+        monkeypatch.setenv("FAST_BOOT", "1")
+        app = create_app("testing")
+
+        with app.app_context():
+            assert current_schema_version() == SCHEMA_VERSION
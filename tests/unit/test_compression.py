@@ -0,0 +1,86 @@
+import gzip
+
+from flask import Flask, Response, request, stream_with_context
+
+from app.presentation.compression import GzipMiddleware
+
+BIG = "<p>" + "hello " * 1000 + "</p>"
+
+
+def make_app(**kwargs) -> Flask:
+    app = Flask(__name__)
+    produced = []
+
+    @app.route("/big")
+    def big():
+        return BIG
+
+    @app.route("/small")
+    def small():
+        return "<p>hi</p>"
+
+    @app.route("/image")
+    def image():
+        return Response(b"\x89PNG" * 1000, mimetype="image/png")
+
+    @app.route("/stream")
+    def stream():
+        def rows():
+            for i in range(100):
+                produced.append(i)
+                yield f"{i},user{i}@example.com\n"
+        return Response(stream_with_context(rows()), mimetype="text/csv")
+
+    @app.route("/etag")
+    def etag():
+        response = Response(BIG)
+        response.set_etag("v1")
+        return response.make_conditional(request)
+
+    app.produced = produced
+    app.wsgi_app = GzipMiddleware(app.wsgi_app, **kwargs)
+    return app
+
+
+GZIP = {"Accept-Encoding": "gzip, deflate"}
+
+
+class TestGzipMiddleware:
+    def test_compresses_large_html_for_gzip_clients(self):
+        client = make_app().test_client()
+
+        response = client.get("/big", headers=GZIP)
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert gzip.decompress(response.data).decode() == BIG
+
+        plain = client.get("/big")
+        assert "Content-Encoding" not in plain.headers
+        assert plain.headers["Vary"] == "Accept-Encoding"
+
+    def test_skips_small_and_binary_responses(self):
+        client = make_app().test_client()
+
+        assert "Content-Encoding" not in client.get("/small", headers=GZIP).headers
+        assert "Content-Encoding" not in client.get("/image", headers=GZIP).headers
+        assert "Content-Encoding" not in client.get("/big", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+    def test_streamed_response_is_compressed_as_it_is_produced(self):
+        app = make_app()
+        response = app.test_client().get("/stream", headers=GZIP, buffered=False)
+        assert response.headers["Content-Encoding"] == "gzip"
+        # stream_with_context runs the generator up to its first row
+        assert len(app.produced) <= 1
+
+        body = gzip.decompress(b"".join(response.response)).decode()
+        assert body.splitlines()[99] == "99,user99@example.com"
+
+    def test_etag_revalidates_the_compressed_variant(self):
+        client = make_app().test_client()
+
+        response = client.get("/etag", headers=GZIP)
+        assert response.headers["ETag"] == '"v1-gz"'
+        revalidated = client.get("/etag", headers={**GZIP, "If-None-Match": response.headers["ETag"]})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == '"v1-gz"'
+        assert client.get("/etag", headers={"If-None-Match": '"v1"'}).status_code == 304
@@ -0,0 +1,39 @@
+import pytest
+from app.config import Config, ProductionConfig, get_engine_options
+
+
+class TestEngineOptions:
+    def test_in_memory_sqlite_skips_pool_sizing(self, monkeypatch):
+        monkeypatch.delenv("SQLITE_PATH", raising=False)
+        monkeypatch.delenv("DB_TYPE", raising=False)
+
+        assert get_engine_options() == {"pool_pre_ping": True}
+
+    def test_profile_and_overrides(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "app.db"))
+        monkeypatch.setenv("DB_POOL_PROFILE", "small")
+        monkeypatch.setenv("DB_POOL_SIZE", "7")
+        monkeypatch.setenv("DB_POOL_PRE_PING", "0")
+
+        options = get_engine_options()
+
+        assert options == {
+            "pool_pre_ping": False,
+            "pool_size": 7,
+            "max_overflow": 3,
+            "pool_timeout": 10,
+            "pool_recycle": 300,
+        }
+
+    def test_production_config_defaults_to_production_profile(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "app.db"))
+        monkeypatch.delenv("DB_POOL_PROFILE", raising=False)
+
+        assert ProductionConfig().SQLALCHEMY_ENGINE_OPTIONS["pool_size"] == 10
+        assert Config().SQLALCHEMY_ENGINE_OPTIONS["pool_size"] == 5
+
+    def test_unknown_profile_raises(self, monkeypatch):
+        monkeypatch.setenv("DB_POOL_PROFILE", "huge")
+
+        with pytest.raises(ValueError):
+            get_engine_options()
@@ -0,0 +1,124 @@
+from sqlalchemy import event
+
+from app.data import email_filter as email_filter_module
+from app.data.email_filter import CuckooFilter, EmailFilter, get_email_filter
+from app.data.models import db, Subscriber
+from app.data.repositories.subscriber_repository import SubscriberRepository
+
+
+class TestCuckooFilter:
+    def test_has_no_false_negatives(self):
+        f = CuckooFilter(20000)
+        emails = [f"user{i}@example.com" for i in range(15000)]
+        for email in emails:
+            f.add(email)
+
+        assert all(email in f for email in emails)
+        assert f.count == 15000
+
+    def test_false_positive_rate_is_low(self):
+        f = CuckooFilter(20000)
+        for i in range(15000):
+            f.add(f"user{i}@example.com")
+
+        false_positives = sum(f"other{i}@example.org" in f for i in range(50000))
+        assert false_positives / 50000 < 0.001
+        assert f.estimated_fpr() < 0.001
+
+    def test_remove_deletes_one_copy(self):
+        f = CuckooFilter(100)
+        f.add("a@example.com")
+        f.add("b@example.com")
+
+        assert f.remove("a@example.com") is True
+        assert "a@example.com" not in f
+        assert "b@example.com" in f
+        assert f.remove("a@example.com") is False
+
+    def test_memory_is_two_bytes_per_slot(self):
+        f = CuckooFilter(1000)
+        assert f.memory_bytes == 2 * f.capacity
+
+    def test_full_filter_disables_fast_path(self, monkeypatch):
+        monkeypatch.setattr(email_filter_module, "MAX_KICKS", 5)
+        wrapper = EmailFilter(capacity=8)
+        wrapper._ready = True
+        for i in range(100):
+            wrapper.add(f"user{i}@example.com")
+
+        assert wrapper.ready is False
+        assert wrapper.might_contain("anyone@example.com") is True
+
+
+class TestRepositoryFastPath:
+    def test_build_streams_existing_rows(self, app, clean_db):
+        with app.app_context():
+            db.session.add_all([Subscriber(email=f"row{i}@example.com", name="Row") for i in range(3)])
+            db.session.commit()
+            email_filter = EmailFilter(capacity=100)
+            assert email_filter.might_contain("nobody@example.com") is True
+
+            email_filter.build()
+
+            assert email_filter.ready is True
+            assert email_filter.stats().items == 3
+            assert email_filter.might_contain("row1@example.com") is True
+            assert email_filter.might_contain("nobody@example.com") is False
+
+    def test_existing_emails_skips_query_for_new_emails(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            repo.save("known@example.com", "Known", {})
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", record)
+            try:
+                found = repo.existing_emails(["fresh1@example.com", "fresh2@example.com"])
+                assert repo.exists("fresh3@example.com") is False
+            finally:
+                event.remove(db.engine, "before_cursor_execute", record)
+
+            assert found == set()
+            assert statements == []
+            assert repo.existing_emails(["known@example.com", "fresh1@example.com"]) == {"known@example.com"}
+            assert repo.exists("known@example.com") is True
+
+    def test_filter_follows_update_and_delete(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            email_filter = get_email_filter()
+            first = repo.save("before@example.com", "A", {})
+            second_id = repo.save("bulk@example.com", "B", {}).id
+
+            repo.update(first.id, "after@example.com", "A", None)
+            assert email_filter.might_contain("after@example.com") is True
+            assert email_filter.might_contain("before@example.com") is False
+
+            repo.delete(first.id)
+            repo.delete_bulk([second_id])
+            assert email_filter.might_contain("after@example.com") is False
+            assert email_filter.might_contain("bulk@example.com") is False
+
+    def test_refresh_picks_up_rows_from_other_workers(self, app, clean_db, monkeypatch):
+        with app.app_context():
+            email_filter = get_email_filter()
+            monkeypatch.setattr(email_filter, "refresh_seconds", 0)
+            repo = SubscriberRepository()
+            assert repo.existing_emails(["elsewhere@example.com"]) == set()
+            # Written behind the repository's back, as another worker would
+            db.session.add(Subscriber(email="elsewhere@example.com", name="Other"))
+            db.session.commit()
+
+            assert repo.existing_emails(["elsewhere@example.com"]) == {"elsewhere@example.com"}
+
+    def test_stats_report_memory_and_rates(self, app):
+        with app.app_context():
+            stats = get_email_filter().stats()
+
+            assert stats.ready is True
+            assert stats.memory_bytes == 2 * stats.capacity
+            assert 0 <= stats.estimated_fpr < 0.001
+            assert stats.checks >= stats.definitely_absent
@@ -0,0 +1,61 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from app.business.services.export_service import ExportService
+from app.data.repositories.subscriber_repository import SubscriberRepository
+from app.presentation.compression import gzip_chunks
+
+
+@pytest.fixture
+def three_subscribers(app, clean_db):
+    with app.app_context():
+        repo = SubscriberRepository()
+        repo.save("b@example.com", "Bee", {'kost': True})
+        repo.save("a@example.com", "Ay", {'kost': True, 'jaine': True})
+        repo.save("c@example.com", "Cee", {})
+
+
+class TestExportService:
+    def test_csv_export_respects_sort_and_filter(self, app, three_subscribers):
+        with app.app_context():
+            data = b"".join(ExportService().iter_export("csv", "email_asc", "kost")).decode()
+
+            rows = list(csv.DictReader(io.StringIO(data)))
+
+            assert [r["email"] for r in rows] == ["a@example.com", "b@example.com"]
+            assert rows[0]["newsletters"] == "kost;jaine"
+
+    def test_ndjson_export(self, app, three_subscribers):
+        with app.app_context():
+            data = b"".join(ExportService().iter_export("ndjson", "name_desc"))
+
+            rows = [json.loads(line) for line in data.splitlines()]
+
+            assert [r["name"] for r in rows] == ["Cee", "Bee", "Ay"]
+            assert rows[2]["newsletters"] == ["kost", "jaine"]
+
+    def test_outlook_export_joins_emails(self, app, three_subscribers):
+        with app.app_context():
+            data = b"".join(ExportService().iter_export("outlook", "email_desc"))
+
+            assert data == b"c@example.com; b@example.com; a@example.com"
+
+    def test_export_yields_multiple_chunks(self, app, three_subscribers, monkeypatch):
+        from app.business.services import export_service
+        monkeypatch.setattr(export_service, "EXPORT_BUFFER_SIZE", 1)
+        with app.app_context():
+            chunks = list(ExportService().iter_export("ndjson"))
+
+            assert len(chunks) == 3
+
+    def test_unknown_format_raises(self, app):
+        with app.app_context():
+            with pytest.raises(ValueError):
+                list(ExportService().iter_export("xml"))
+
+    def test_gzip_chunks_round_trip(self):
+        chunks = [b"hello ", b"", b"world"]
+
+        assert gzip.decompress(b"".join(gzip_chunks(chunks))) == b"hello world"
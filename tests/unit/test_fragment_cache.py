@@ -0,0 +1,76 @@
+import os
+import stat
+from datetime import datetime
+
+from flask import Flask
+from jinja2 import DictLoader
+
+from app.data.models import Subscriber
+from app.presentation.fragment_cache import FragmentCache, init_template_caches
+from app.presentation.routes.admin import subscriber_row
+
+
+def make_app(**config) -> Flask:
+    app = Flask(__name__)
+    app.config.update(config)
+    app.jinja_loader = DictLoader({"row.html": "<p>{{ name }}</p>"})
+    return app
+
+
+class TestFragmentCache:
+    def test_renders_once_per_key(self):
+        app = make_app()
+        cache = FragmentCache(max_entries=10)
+        with app.app_context():
+            first = cache.render("row.html", (1, "v1"), name="Anna")
+            again = cache.render("row.html", (1, "v1"), name="ignored")
+            changed = cache.render("row.html", (1, "v2"), name="Berit")
+
+        assert (first, again, changed) == ("<p>Anna</p>", "<p>Anna</p>", "<p>Berit</p>")
+        assert cache.stats().hits == 1
+        assert cache.stats().misses == 2
+
+    def test_evicts_least_recently_used(self):
+        app = make_app()
+        cache = FragmentCache(max_entries=2)
+        with app.app_context():
+            for key in (1, 2, 1, 3):
+                cache.render("row.html", key, name=str(key))
+
+        stats = cache.stats()
+        assert stats.entries == 2
+        assert stats.evictions == 1
+
+    def test_bytecode_cache_is_written_to_shared_directory(self, tmp_path):
+        app = make_app(JINJA_BYTECODE_CACHE=True, JINJA_BYTECODE_CACHE_DIR=str(tmp_path))
+        init_template_caches(app)
+        app.jinja_env.get_template("row.html")
+
+        assert len(list(tmp_path.iterdir())) == 1
+
+
+    def test_bytecode_cache_defaults_to_a_private_instance_dir(self, tmp_path):
+        app = make_app(JINJA_BYTECODE_CACHE=True, JINJA_BYTECODE_CACHE_DIR="")
+        app.instance_path = str(tmp_path / "instance")
+        init_template_caches(app)
+        app.jinja_env.get_template("row.html")
+
+        directory = tmp_path / "instance" / "jinja"
+        assert app.jinja_env.bytecode_cache.directory == str(directory)
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+        assert len(list(directory.iterdir())) == 1
+
+
+class TestSubscriberRow:
+    def test_row_is_rendered_again_when_the_subscriber_changes(self, app):
+        subscriber = Subscriber(
+            id=7, email="row@example.com", name="Before", newsletter_mask=0, subscribed_at=datetime(2024, 1, 1)
+        )
+        with app.test_request_context():
+            before = subscriber_row(subscriber)
+            assert subscriber_row(subscriber) is before
+            subscriber.name = "After"
+            after = subscriber_row(subscriber)
+
+        assert "Before" in before
+        assert "After" in after
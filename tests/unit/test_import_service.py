@@ -0,0 +1,73 @@
+import io
+import pytest
+from app.business.services.import_service import ImportService, detect_format, iter_rows, row_newsletters
+from app.data.repositories.subscriber_repository import SubscriberRepository
+
+
+class TestImportService:
+    def test_csv_import_validates_normalizes_and_dedupes(self, app, clean_db):
+        with app.app_context():
+            SubscriberRepository().save("existing@example.com", "Existing", {})
+            data = (
+                "email,name,newsletters,nl_jaine\n"
+                " New@Example.com ,New,kost;mindset,0\n"
+                "new@example.com,Again,,\n"
+                "not-an-email,Bad,,\n"
+                "existing@example.com,Existing,,\n"
+                "other@example.com,,,yes\n"
+            ).encode()
+
+            result = ImportService().import_stream(io.BytesIO(data), "csv", batch_size=2)
+
+            assert (result.total, result.imported, result.duplicates, result.invalid) == (5, 2, 2, 1)
+            assert [(e.line, e.error) for e in result.errors] == [
+                (3, "Duplicate email in file"),
+                (4, "Invalid email format"),
+                (5, "Email already subscribed"),
+            ]
+            repo = SubscriberRepository()
+            assert repo.find_by_email("new@example.com").get_newsletters() == ['kost', 'mindset']
+            other = repo.find_by_email("other@example.com")
+            assert other.name == "Subscriber"
+            assert other.get_newsletters() == ['jaine']
+
+    def test_ndjson_import_reports_bad_lines(self, app, clean_db):
+        with app.app_context():
+            data = (
+                '{"email": "a@example.com", "newsletters": ["kunskap"]}\n'
+                '\n'
+                '{broken\n'
+                '["not", "an", "object"]\n'
+                '{"email": "b@example.com", "newsletters": {"kost": true, "jaine": false}}\n'
+            ).encode()
+
+            result = ImportService().import_stream(io.BytesIO(data), "ndjson")
+
+            assert result.imported == 2
+            assert [e.line for e in result.errors] == [3, 4]
+            assert SubscriberRepository().find_by_email("b@example.com").get_newsletters() == ['kost']
+
+    def test_error_list_is_capped_but_callback_sees_all(self, app, clean_db):
+        with app.app_context():
+            data = "email\n" + "bad\n" * 5
+            seen = []
+
+            result = ImportService().import_stream(
+                io.BytesIO(data.encode()), "csv", max_errors=2, on_error=seen.append,
+            )
+
+            assert len(result.errors) == 2
+            assert result.errors_truncated is True
+            assert len(seen) == 5
+
+    def test_detect_format(self):
+        assert detect_format("list.CSV") == "csv"
+        assert detect_format("list.jsonl") == "ndjson"
+        assert detect_format(None) == "csv"
+
+    def test_iter_rows_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            list(iter_rows(io.BytesIO(b""), "xml"))
+
+    def test_row_newsletters_columns_override_list(self):
+        assert row_newsletters({"newsletters": "kost, mindset", "nl_kost": "0"}) == {'kost': False, 'mindset': True}
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+from sqlalchemy import text
+
+from app import create_app
+from app.data.models import User, db
+from app.lifecycle import after_fork, warm_pool, warm_templates
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "app.db"))
+    monkeypatch.setenv("RATE_LIMIT", "sqlite")
+    monkeypatch.setenv("RATE_LIMIT_PATH", str(tmp_path / "limits.sqlite"))
+    monkeypatch.setenv("SUBSCRIBE_WRITE_BEHIND", "1")
+    app = create_app("testing")
+    yield app
+    app.extensions["subscription_queue"].stop()
+
+
+class TestAfterFork:
+    def test_pools_are_replaced_not_closed(self, file_app):
+        with file_app.app_context():
+            db.session.execute(text("SELECT 1"))
+            db.session.remove()
+            parent_pool = db.engine.pool
+
+        after_fork(file_app)
+
+        with file_app.app_context():
+            assert db.engine.pool is not parent_pool
+            assert db.session.execute(text("SELECT 1")).scalar() == 1
+        assert file_app.extensions["boot_stats"]["pid"] == os.getpid()
+
+    def test_queue_gets_its_own_flush_thread(self, file_app):
+        queue = file_app.extensions["subscription_queue"]
+        parent_thread = queue._thread
+
+        after_fork(file_app)
+
+        assert queue.running
+        assert queue._thread is not parent_thread and queue._thread.is_alive()
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+    def test_forked_child_can_use_the_database_and_rate_limiter(self, file_app):
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            status = 1
+            try:
+                after_fork(file_app)
+                with file_app.app_context():
+                    ok = db.session.execute(text("SELECT 1")).scalar() == 1
+                ok = ok and file_app.extensions["rate_limiter"].hit("login", "10.0.0.1") == 0
+                os.write(write, b"ok" if ok else b"fail")
+                status = 0
+            finally:
+                os._exit(status)
+        os.close(write)
+        _, status = os.waitpid(pid, 0)
+
+        assert os.read(read, 10) == b"ok"
+        assert status == 0
+
+
+    def test_in_memory_database_is_bootstrapped_again(self, monkeypatch):
+        monkeypatch.delenv("SQLITE_PATH", raising=False)
+        app = create_app("testing")
+
+        after_fork(app)
+
+        response = app.test_client().post(
+            "/subscribe/confirm", data={"email": "forked@example.com", "name": "Forked"}
+        )
+        assert response.status_code == 302
+        with app.app_context():
+            assert User.query.count() == 1
+
+
+class TestWarmUp:
+    def test_pool_opens_requested_connections(self, file_app):
+        warm_pool(file_app, connections=3)
+
+        with file_app.app_context():
+            assert db.engine.pool.checkedin() == 3
+
+    def test_templates_are_loaded(self, file_app):
+        warm_templates(file_app)
+
+        loaded = {name for _, name in file_app.jinja_env.cache.keys()}
+        assert {"admin/subscribers.html", "admin/_subscriber_row.html"} <= loaded
@@ -0,0 +1,111 @@
+import pytest
+from sqlalchemy import inspect, select, text
+from app import create_app
+from app.data.migrations import HEAD, MIGRATIONS, Migration, MigrationContext, MigrationError, applied_versions, upgrade
+from app.data.migrations import backfill as backfill_module
+from app.data.migrations.backfill import backfill
+from app.data.models import db, Subscriber
+
+
+@pytest.fixture
+def legacy_app(tmp_path, monkeypatch):
+    """App on a SQLite file holding a pre-migration subscribers table."""
+    monkeypatch.setenv("SQLITE_PATH", str(tmp_path / "legacy.db"))
+    monkeypatch.setenv("FAST_BOOT", "1")
+    app = create_app("testing")
+    with app.app_context():
+        db.session.execute(text(
+            "CREATE TABLE subscribers (id INTEGER PRIMARY KEY, email VARCHAR(120) UNIQUE NOT NULL, "
+            "name VARCHAR(120) NOT NULL, subscribed_at DATETIME, nl_kost BIT NOT NULL DEFAULT 0)"
+        ))
+        for i in range(7):
+            db.session.execute(
+                text("INSERT INTO subscribers (email, name, nl_kost) VALUES (:email, 'Old', :kost)"),
+                {"email": f"old{i}@example.com", "kost": i % 2},
+            )
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+class TestMigrations:
+    def test_versions_are_contiguous(self):
+        assert [m.version for m in MIGRATIONS] == list(range(1, HEAD + 1))
+
+    def test_upgrade_legacy_table_backfills_in_chunks(self, legacy_app):
+        messages = []
+        applied = upgrade(ctx=MigrationContext(chunk_size=3, throttle_ms=0, echo=messages.append))
+
+        assert [m.version for m in applied] == list(range(1, HEAD + 1))
+        columns = {c["name"] for c in inspect(db.engine).get_columns("subscribers")}
+        assert {"nl_mindset", "nl_jaine", "newsletter_mask"} <= columns
+        masks = dict(db.session.execute(select(Subscriber.email, Subscriber.newsletter_mask)).all())
+        assert masks["old1@example.com"] == 1
+        assert masks["old2@example.com"] == 0
+        # Only the rows with a legacy flag set need a mask
+        assert "  newsletter_mask: 3 rows backfilled" in messages
+        indexes = {ix["name"] for ix in inspect(db.engine).get_indexes("subscribers")}
+        assert {"ix_subscribers_subscribed_at_id", "ix_subscribers_name_lower"} <= indexes
+        assert db.session.execute(
+            select(Subscriber.name_lower, Subscriber.email_domain).where(Subscriber.email == "old3@example.com")
+        ).one() == ("old", "example.com")
+        assert db.session.execute(text("SELECT COUNT(*) FROM subscriber_trigrams WHERE trigram = 'old'")).scalar() == 7
+
+    def test_mask_backfill_resumes_after_a_crash(self, legacy_app):
+        upgrade(target=2)
+        db.session.execute(text("ALTER TABLE subscribers ADD newsletter_mask INT NOT NULL DEFAULT 0"))
+        # old1 was backfilled before the crash; old3 also has a bit without a legacy column
+        db.session.execute(text("UPDATE subscribers SET newsletter_mask = 1 WHERE email = 'old1@example.com'"))
+        db.session.execute(text("UPDATE subscribers SET newsletter_mask = 1024 WHERE email = 'old3@example.com'"))
+        db.session.commit()
+        messages = []
+
+        upgrade(target=3, ctx=MigrationContext(chunk_size=1, throttle_ms=0, echo=messages.append))
+
+        masks = dict(db.session.execute(select(Subscriber.email, Subscriber.newsletter_mask)).all())
+        assert masks == {
+            "old0@example.com": 0, "old1@example.com": 1, "old2@example.com": 0, "old3@example.com": 1025,
+            "old4@example.com": 0, "old5@example.com": 1, "old6@example.com": 0,
+        }
+        assert "Backfilled newsletter_mask on 2 rows" in messages
+
+    def test_upgrade_only_runs_pending_migrations(self, legacy_app):
+        assert [m.version for m in upgrade(target=2)] == [1, 2]
+        assert applied_versions() == {1, 2}
+        assert [m.version for m in upgrade()] == list(range(3, HEAD + 1))
+        assert upgrade() == []
+
+    def test_failed_migration_is_not_recorded(self, legacy_app, monkeypatch):
+        def broken(ctx):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr("app.data.migrations.MIGRATIONS", [*MIGRATIONS, Migration(HEAD + 1, "broken", broken)])
+        with pytest.raises(MigrationError, match="broken failed: boom"):
+            upgrade(target=HEAD + 1)
+        assert HEAD in applied_versions()
+        assert HEAD + 1 not in applied_versions()
+
+
+class TestBackfill:
+    def test_updates_only_matching_rows_chunk_by_chunk(self, legacy_app, monkeypatch):
+        upgrade()
+        sleeps = []
+        monkeypatch.setattr(backfill_module.time, "sleep", sleeps.append)
+        table = Subscriber.__table__
+        progress = []
+
+        updated = backfill(
+            table, {"name": "Kost"}, where=table.c.nl_kost == 1,
+            chunk_size=2, throttle_ms=10, progress=progress.append,
+        )
+
+        assert updated == 3
+        assert progress == [2, 3]
+        assert sleeps == [0.01]
+        names = dict(db.session.execute(select(Subscriber.email, Subscriber.name)).all())
+        assert names["old1@example.com"] == "Kost"
+        assert names["old0@example.com"] == "Old"
+
+    def test_rejects_empty_chunks(self, legacy_app):
+        with pytest.raises(ValueError):
+            backfill(Subscriber.__table__, {"name": "x"}, chunk_size=0)
@@ -0,0 +1,72 @@
+import pytest
+from app.data.newsletters import NewsletterRegistry, newsletter_registry
+from app.data.repositories.subscriber_repository import SubscriberRepository
+
+
+class TestNewsletterRegistry:
+    def test_default_registry_keeps_legacy_order(self):
+        assert newsletter_registry.keys() == ['kost', 'mindset', 'kunskap', 'veckans_pass', 'jaine']
+        assert newsletter_registry.all_bits == 0b11111
+
+    def test_mask_round_trip(self):
+        mask = newsletter_registry.mask_for({'kost': True, 'mindset': False, 'jaine': True, 'unknown': True})
+
+        assert mask == 0b10001
+        assert newsletter_registry.keys_for(mask) == ('kost', 'jaine')
+        assert newsletter_registry.count(mask) == 2
+        assert newsletter_registry.contains(mask, 'jaine') is True
+        assert newsletter_registry.contains(mask, 'mindset') is False
+
+    def test_column_values_include_mask_and_legacy_flags(self):
+        values = newsletter_registry.column_values({'kunskap': True})
+
+        assert values['newsletter_mask'] == 0b100
+        assert values['nl_kunskap'] is True
+        assert values['nl_kost'] is False
+
+    def test_register_rejects_duplicate_key_and_bit(self):
+        registry = NewsletterRegistry()
+        registry.register('a', 0, 'A')
+
+        with pytest.raises(ValueError):
+            registry.register('a', 1, 'A again')
+        with pytest.raises(ValueError):
+            registry.register('b', 0, 'B')
+        with pytest.raises(ValueError):
+            registry.register('c', 31, 'C')
+
+    def test_configure_rejects_unknown_storage(self):
+        with pytest.raises(ValueError):
+            NewsletterRegistry().configure('json')
+
+
+class TestBitmaskStorage:
+    @pytest.fixture
+    def bitmask_storage(self, monkeypatch):
+        monkeypatch.setattr(newsletter_registry, "storage", "bitmask")
+
+    def test_filter_and_helpers_use_mask(self, app, clean_db, bitmask_storage):
+        with app.app_context():
+            repo = SubscriberRepository()
+            both = repo.save("mask1@example.com", "Mask 1", {'kost': True, 'jaine': True})
+            repo.save("mask2@example.com", "Mask 2", {'mindset': True})
+
+            filtered = repo.get_all(newsletter_filter='jaine')
+
+            assert [s.id for s in filtered] == [both.id]
+            assert both.get_newsletters() == ['kost', 'jaine']
+            assert both.get_newsletter_count() == 2
+            assert both.has_newsletter('kost') is True
+
+    def test_bulk_update_sets_and_clears_bits(self, app, clean_db, bitmask_storage):
+        with app.app_context():
+            repo = SubscriberRepository()
+            saved = repo.save("mask3@example.com", "Mask 3", {'kost': True, 'mindset': True})
+
+            repo.update_newsletters_bulk([saved.id], {'kost': False, 'kunskap': True})
+
+            refreshed = repo.find_by_id(saved.id)
+            assert refreshed.newsletter_mask == 0b110
+            assert refreshed.get_newsletters() == ['mindset', 'kunskap']
+            assert refreshed.nl_kost is False
+            assert refreshed.nl_kunskap is True
@@ -0,0 +1,128 @@
+import gzip
+
+from flask import Flask, flash, render_template
+from jinja2 import DictLoader
+
+from app.presentation.page_cache import cached_page, init_page_cache, page_slot, skip_page_cache
+
+
+def make_app(**config) -> Flask:
+    app = Flask(__name__)
+    app.config.update(SECRET_KEY="test", PAGE_CACHE=True, **config)
+    app.jinja_loader = DictLoader({"page.html": "<p>{{ count }} {{ name }}</p>"})
+    renders = []
+
+    @app.route("/")
+    @cached_page
+    def index():
+        renders.append("index")
+        return render_template("page.html", count=len(renders), name="")
+
+    @app.route("/hello")
+    @cached_page
+    def hello():
+        renders.append("hello")
+        return render_template("page.html", count=len(renders), name=page_slot("name"))
+
+    @app.route("/flash")
+    def flash_then_index():
+        flash("Saved")
+        return "ok"
+
+    @app.route("/private")
+    @cached_page
+    def private():
+        skip_page_cache()
+        renders.append("private")
+        return render_template("page.html", count=len(renders), name=page_slot("name"))
+
+    app.renders = renders
+    return app
+
+
+class TestPageCache:
+    def test_pages_are_prerendered_once(self):
+        app = make_app()
+        init_page_cache(app)
+        client = app.test_client()
+
+        assert sorted(set(app.renders)) == ["hello", "index", "private"]
+        assert client.get("/").data == client.get("/").data
+        assert app.renders.count("index") == 1
+        assert app.extensions["page_cache"].stats().hits == 2
+
+    def test_gzip_and_conditional_get(self):
+        app = make_app()
+        init_page_cache(app)
+        client = app.test_client()
+
+        plain = client.get("/")
+        zipped = client.get("/", headers={"Accept-Encoding": "gzip"})
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(zipped.data) == plain.data
+        assert "Accept-Encoding" in zipped.headers["Vary"]
+        assert plain.headers["ETag"] != zipped.headers["ETag"]
+
+        assert client.get("/", headers={"If-None-Match": plain.headers["ETag"]}).status_code == 304
+        assert client.get("/", headers={"If-Modified-Since": plain.headers["Last-Modified"]}).status_code == 304
+
+    def test_gzip_is_negotiated_like_the_middleware(self):
+        app = make_app()
+        init_page_cache(app)
+        client = app.test_client()
+
+        refused = client.get("/", headers={"Accept-Encoding": "gzip;q=0, identity"})
+        assert "Content-Encoding" not in refused.headers
+        zipped = client.get("/", headers={"Accept-Encoding": "br, *;q=0.5"})
+        assert zipped.headers["Content-Encoding"] == "gzip"
+        assert zipped.headers["ETag"] == refused.headers["ETag"][:-1] + '-gz"'
+        revalidated = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["ETag"]})
+        assert revalidated.status_code == 304
+
+    def test_slots_are_filled_and_escaped_per_response(self):
+        app = make_app()
+        init_page_cache(app)
+        client = app.test_client()
+
+        anna = client.get("/hello?name=Anna")
+        script = client.get("/hello?name=<script>")
+        assert b"Anna" in anna.data
+        assert b"&lt;script&gt;" in script.data
+        assert anna.headers["ETag"] != script.headers["ETag"]
+        assert app.renders.count("hello") == 1
+
+    def test_flashed_messages_bypass_the_cache(self):
+        app = make_app()
+        init_page_cache(app)
+        client = app.test_client()
+
+        client.get("/flash")
+        client.get("/")
+        assert app.renders.count("index") == 2
+        assert app.extensions["page_cache"].stats().bypassed == 1
+
+    def test_skipped_pages_are_rendered_every_time(self):
+        app = make_app()
+        init_page_cache(app)
+        client = app.test_client()
+
+        assert b"Berit" in client.get("/private?name=Berit").data
+        client.get("/private")
+        # Once at startup and once per request
+        assert app.renders.count("private") == 3
+        assert app.extensions["page_cache"].stats().pages == 2
+
+    def test_disabled_in_debug_mode(self):
+        app = make_app(DEBUG=True)
+        assert init_page_cache(app) is None
+        assert b"Cecilia" in app.test_client().get("/hello?name=Cecilia").data
+
+    def test_head_has_headers_but_no_body(self):
+        app = make_app()
+        init_page_cache(app)
+        client = app.test_client()
+
+        response = client.head("/")
+        assert response.status_code == 200
+        assert response.data == b""
+        assert int(response.headers["Content-Length"]) == len(client.get("/").data)
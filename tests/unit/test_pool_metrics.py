@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.data.pool_metrics import PoolMetrics
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        pool_size=1, max_overflow=1, pool_timeout=0.05, pool_pre_ping=True,
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestPoolMetrics:
+    def test_tracks_occupancy_waits_and_timeouts(self, engine):
+        metrics = PoolMetrics(engine)
+
+        first = engine.connect()
+        second = engine.connect()
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+        stats = metrics.snapshot()
+
+        assert stats["checkedout"] == 2
+        assert stats["overflow"] == 1
+        assert stats["connects"] == 2
+        assert stats["checkout_timeouts"] == 1
+        assert stats["checkout_wait"]["count"] == 3
+        assert stats["checkout_wait"]["max_ms"] >= 40
+
+        first.close()
+        second.close()
+        assert metrics.snapshot()["checkedout"] == 0
+
+    def test_times_pre_ping_on_reused_connections(self, engine):
+        metrics = PoolMetrics(engine)
+
+        for _ in range(3):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+
+        # The first checkout opens a fresh connection, which is not pinged
+        assert metrics.snapshot()["pre_ping"]["count"] == 2
+
+    def test_survives_dispose(self, engine):
+        metrics = PoolMetrics(engine)
+
+        engine.dispose()
+        with engine.connect():
+            pass
+
+        assert metrics.snapshot()["checkout_wait"]["count"] == 1
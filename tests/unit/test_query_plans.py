@@ -0,0 +1,57 @@
+import pytest
+from app.data.newsletters import newsletter_registry
+from app.data.query_plan import explain_query_plan, plan_problems, plan_uses_index
+from app.data.repositories.subscriber_repository import SORT_MODES, SubscriberRepository
+
+FILTERS = [None, *newsletter_registry.keys()]
+# Index each sort mode walks; emails use the unique constraint's index
+SORT_INDEXES = {
+    "date": "ix_subscribers_subscribed_at_id",
+    "name": "ix_subscribers_name_id",
+    "email": "sqlite_autoindex_subscribers_1",
+}
+
+
+def expected_index(sort_by: str, newsletter_filter: str | None, storage: str) -> str:
+    column = sort_by.rsplit("_", 1)[0]
+    if column == "date" and newsletter_filter and storage == "columns":
+        return f"ix_subscribers_{newsletter_registry.get(newsletter_filter).legacy_column}_date"
+    return SORT_INDEXES[column]
+
+
+class TestIndexUsage:
+    @pytest.mark.parametrize("storage", ["columns", "bitmask"])
+    @pytest.mark.parametrize("newsletter_filter", FILTERS)
+    @pytest.mark.parametrize("sort_by", list(SORT_MODES))
+    def test_get_all_uses_an_index(self, app, monkeypatch, sort_by, newsletter_filter, storage):
+        monkeypatch.setattr(newsletter_registry, "storage", storage)
+        with app.app_context():
+            query = SubscriberRepository().query_all(sort_by, newsletter_filter)
+
+            plan = explain_query_plan(query)
+
+            assert plan_problems(plan) == [], plan
+            assert plan_uses_index(plan, expected_index(sort_by, newsletter_filter, storage)), plan
+
+    @pytest.mark.parametrize("newsletter_filter", newsletter_registry.keys())
+    def test_newsletter_filter_uses_partial_index(self, app, newsletter_filter):
+        with app.app_context():
+            query = SubscriberRepository().query_all("date_desc", newsletter_filter)
+
+            plan = explain_query_plan(query)
+
+            assert plan_uses_index(plan, f"ix_subscribers_nl_{newsletter_filter}_date"), plan
+
+    def test_plan_problems_flags_full_scan_and_temp_sort(self):
+        assert plan_problems(["SCAN subscribers", "USE TEMP B-TREE FOR ORDER BY"]) == [
+            "SCAN subscribers",
+            "USE TEMP B-TREE FOR ORDER BY",
+        ]
+        assert plan_problems(["SCAN subscribers USING INDEX ix_subscribers_name_id"]) == []
+
+    def test_plan_uses_index_matches_the_index_name_exactly(self):
+        plan = ["SCAN subscribers USING INDEX ix_subscribers_name_id"]
+        assert plan_uses_index(plan, "ix_subscribers_name_id")
+        assert not plan_uses_index(plan, "ix_subscribers_name")
+        assert plan_uses_index(["SEARCH subscribers USING COVERING INDEX ix_a (x>?)"], "ix_a")
+        assert not plan_uses_index(["SCAN subscribers"], "ix_a")
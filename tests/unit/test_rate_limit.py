@@ -0,0 +1,89 @@
+import os
+import stat
+
+import pytest
+from flask import Flask
+
+from app.presentation.rate_limit import (
+    MemoryRateLimitBackend,
+    RateLimit,
+    RateLimiter,
+    SQLiteRateLimitBackend,
+    init_rate_limiter,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteRateLimitBackend(str(tmp_path / "limits.sqlite"))
+    return MemoryRateLimitBackend()
+
+
+class TestTokenBucket:
+    def test_burst_then_limited_with_retry_after(self, backend):
+        limiter = RateLimiter(backend, {"login": RateLimit(3, 60)})
+
+        assert [limiter.hit("login", "1.2.3.4", now=100) for _ in range(3)] == [0, 0, 0]
+        # One token per 20 s
+        assert limiter.hit("login", "1.2.3.4", now=100) == pytest.approx(20)
+        assert limiter.hit("login", "1.2.3.4", now=110) == pytest.approx(10)
+        assert limiter.stats().limited == 2
+
+    def test_refills_over_time(self, backend):
+        limiter = RateLimiter(backend, {"login": RateLimit(2, 10)})
+        limiter.hit("login", "ip", now=0)
+        limiter.hit("login", "ip", now=0)
+
+        assert limiter.hit("login", "ip", now=5) == 0
+        assert limiter.hit("login", "ip", now=5) > 0
+
+    def test_buckets_are_per_client_and_endpoint(self, backend):
+        limiter = RateLimiter(backend, {"login": RateLimit(1, 60), "subscribe": RateLimit(1, 60)})
+        limiter.hit("login", "a", now=0)
+
+        assert limiter.hit("login", "a", now=0) > 0
+        assert limiter.hit("login", "b", now=0) == 0
+        assert limiter.hit("subscribe", "a", now=0) == 0
+
+    def test_prune_forgets_refilled_buckets(self, backend):
+        limiter = RateLimiter(backend, {"login": RateLimit(1, 60)})
+        limiter.hit("login", "a", now=0)
+        limiter._prune(now=61)
+
+        assert limiter.hit("login", "a", now=61) == 0
+
+
+class TestSharedState:
+    def test_sqlite_buckets_are_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "limits.sqlite")
+        first = RateLimiter(SQLiteRateLimitBackend(path), {"login": RateLimit(2, 60)})
+        second = RateLimiter(SQLiteRateLimitBackend(path), {"login": RateLimit(2, 60)})
+
+        first.hit("login", "ip", now=0)
+        second.hit("login", "ip", now=0)
+
+        assert first.hit("login", "ip", now=0) > 0
+
+    def test_sqlite_backend_defaults_to_a_private_instance_dir(self, tmp_path):
+        app = Flask(__name__, instance_path=str(tmp_path / "instance"))
+        app.config.update(
+            RATE_LIMIT="sqlite", RATE_LIMIT_PATH="", RATE_LIMIT_SUBSCRIBE="10/60", RATE_LIMIT_LOGIN="10/300",
+            RATE_LIMIT_PROXY_HOPS=0,
+        )
+
+        limiter = init_rate_limiter(app)
+
+        directory = tmp_path / "instance" / "rate-limit"
+        assert limiter.backend.path == str(directory / "buckets.sqlite")
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+    def test_backend_errors_allow_the_request(self):
+        class Broken:
+            def take(self, *args):
+                raise OSError("disk full")
+
+        limiter = RateLimiter(Broken(), {"login": RateLimit(1, 60)})
+
+        assert limiter.hit("login", "ip") == 0
+        assert limiter.stats().errors == 1
@@ -0,0 +1,128 @@
+import os
+import stat
+
+import pytest
+from flask import Flask
+
+from app.business.services import result_cache
+from app.business.services.result_cache import MemoryCacheBackend, ResultCache, SQLiteCacheBackend, init_result_cache
+from app.business.services.subscription_service import SubscriptionService
+from app.data.repositories.subscriber_repository import SubscriberRepository
+from app.instance import private_instance_dir
+
+
+class TestCacheBackends:
+    def test_memory_backend_evicts_least_recently_used(self):
+        backend = MemoryCacheBackend(max_entries=2, ttl_seconds=60)
+        backend.set("a", 1)
+        backend.set("b", 2)
+        backend.get("a")
+        backend.set("c", 3)
+
+        assert backend.get("a") == 1
+        assert backend.get("b") is result_cache._MISSING
+        assert backend.evictions == 1
+
+    def test_memory_backend_expires_entries(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(result_cache.time, "monotonic", lambda: now[0])
+        backend = MemoryCacheBackend(max_entries=10, ttl_seconds=5)
+        backend.set("a", 1)
+
+        now[0] += 6
+        assert backend.get("a") is result_cache._MISSING
+        assert len(backend) == 0
+
+    def test_sqlite_backend_is_shared_between_instances(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        worker1 = SQLiteCacheBackend(path, max_entries=2, ttl_seconds=60)
+        worker2 = SQLiteCacheBackend(path, max_entries=2, ttl_seconds=60)
+
+        worker1.set("page", {"rows": [1, 2]})
+        assert worker2.get("page") == {"rows": [1, 2]}
+
+        worker2.set("b", 2)
+        worker2.set("c", 3)
+        assert len(worker1) == 2
+        assert worker1.get("page") is result_cache._MISSING
+
+
+    def test_sqlite_backend_defaults_to_a_private_instance_dir(self, tmp_path):
+        app = Flask(__name__, instance_path=str(tmp_path / "instance"))
+        app.config.update(RESULT_CACHE="sqlite", RESULT_CACHE_PATH="", RESULT_CACHE_MAX_ENTRIES=8, RESULT_CACHE_TTL=60)
+
+        cache = init_result_cache(app)
+
+        directory = tmp_path / "instance" / "cache"
+        assert cache.backend.path == str(directory / "result-cache.sqlite")
+        assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+    def test_private_dir_is_tightened_and_rejects_symlinks(self, tmp_path):
+        app = Flask(__name__, instance_path=str(tmp_path))
+        (tmp_path / "open").mkdir(mode=0o777)
+        os.chmod(tmp_path / "open", 0o777)
+        (tmp_path / "elsewhere").mkdir()
+        (tmp_path / "link").symlink_to(tmp_path / "elsewhere")
+
+        assert stat.S_IMODE(os.stat(private_instance_dir(app, "open")).st_mode) == 0o700
+        with pytest.raises(RuntimeError, match="not a directory"):
+            private_instance_dir(app, "link")
+
+
+class TestResultCache:
+    def test_caches_per_version_and_args(self):
+        cache = ResultCache(MemoryCacheBackend())
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        assert cache.get_or_compute("count", 1, ("kost",), compute) == 1
+        assert cache.get_or_compute("count", 1, ("kost",), compute) == 1
+        assert cache.get_or_compute("count", 1, ("jaine",), compute) == 2
+        assert cache.get_or_compute("count", 2, ("kost",), compute) == 3
+        assert cache.get_or_compute("count", None, ("kost",), compute) == 4
+        assert cache.stats().hits == 1
+        assert cache.stats().misses == 3
+
+    def test_repository_writes_invalidate_service_reads(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            service = SubscriptionService(repo, cache=ResultCache(MemoryCacheBackend()))
+            repo.save("cache1@example.com", "Cache One", {'kost': True})
+
+            version = service.data_version()
+            assert service.count_subscribers("kost") == 1
+            assert service.get_stats().total == 1
+
+            repo.save("cache2@example.com", "Cache Two", {'kost': True})
+
+            assert service.data_version() == version + 1
+            assert service.count_subscribers("kost") == 2
+            assert service.get_stats().total == 2
+            page = service.get_subscribers_page("email_asc", "kost")
+            assert [s.email for s in page.items] == ["cache1@example.com", "cache2@example.com"]
+
+    @pytest.mark.parametrize("backend", ["memory", "sqlite"])
+    def test_cached_pages_hold_no_session_bound_subscribers(self, app, clean_db, tmp_path, backend):
+        from sqlalchemy import inspect
+
+        if backend == "memory":
+            cache = ResultCache(MemoryCacheBackend())
+        else:
+            cache = ResultCache(SQLiteCacheBackend(str(tmp_path / "cache.sqlite"), max_entries=8, ttl_seconds=60))
+        with app.app_context():
+            saved = SubscriberRepository().save("cached@example.com", "Cached", {"kost": True})
+            service = SubscriptionService(cache=cache)
+
+            first = service.get_subscribers_page("email_asc")
+            second = service.get_subscribers_page("email_asc")
+
+            assert cache.stats().hits == 1
+            assert first.items[0] is not second.items[0]
+            for subscriber in first.items + second.items:
+                assert inspect(subscriber).transient
+                assert subscriber.id == saved.id
+                assert subscriber.get_newsletters() == ["kost"]
+                assert subscriber.row_version == saved.row_version
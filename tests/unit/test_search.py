@@ -0,0 +1,100 @@
+import pytest
+from app.data import search
+from app.data.models import Subscriber, SubscriberTrigram
+from app.data.query_plan import explain_query_plan, plan_uses_index
+from app.data.repositories.subscriber_repository import SubscriberRepository
+from app.data.search import normalize_search_term, prefix_range, search_predicate, trigrams
+
+
+def seed(repo: SubscriberRepository) -> None:
+    repo.save("anna.berg@gmail.com", "Anna Berg", {'kost': True})
+    repo.save("bertil@outlook.se", "Bertil Åkesson", {})
+    repo.save("carl_100%@gmail.com", "Carl Anders", {'kost': True})
+    repo.save_many([
+        ("dora@firma.se", "Dora Lind", {'mindset': True}),
+        ("erik@gmail.com", "Erik Annasson", {}),
+    ])
+
+
+def emails(page) -> list[str]:
+    return sorted(s.email for s in page.items)
+
+
+class TestSearchHelpers:
+    def test_trigrams_and_normalization(self):
+        assert trigrams("Anna") == {"ann", "nna"}
+        assert trigrams("ab") == set()
+        assert normalize_search_term("  Anna   BERG ") == "anna berg"
+        assert search_predicate("   ") is None
+        assert search_predicate("@") is None
+
+
+class TestSubscriberSearch:
+    @pytest.mark.parametrize("term, expected", [
+        ("an", ["anna.berg@gmail.com"]),  # short: prefix on email or name
+        ("@gmail", ["anna.berg@gmail.com", "carl_100%@gmail.com", "erik@gmail.com"]),
+        ("@fir", ["dora@firma.se"]),
+        ("ANNA", ["anna.berg@gmail.com", "erik@gmail.com"]),  # substring in name
+        ("åkess", ["bertil@outlook.se"]),
+        ("outlook.se", ["bertil@outlook.se"]),
+        ("_100%", ["carl_100%@gmail.com"]),  # LIKE wildcards are literal
+        ("zzzz", []),
+    ])
+    def test_matches(self, app, clean_db, term, expected):
+        with app.app_context():
+            repo = SubscriberRepository()
+            seed(repo)
+
+            assert emails(repo.get_page(search=term)) == expected
+            assert repo.count(search=term) == len(expected)
+
+    @pytest.mark.parametrize("term", ["gmail", "@gm"])
+    def test_common_terms_fall_back_to_scan(self, app, clean_db, monkeypatch, term):
+        monkeypatch.setattr(search, "SELECTIVE_ROWS", 1)
+        with app.app_context():
+            repo = SubscriberRepository()
+            seed(repo)
+
+            assert emails(repo.get_page(search=term)) == [
+                "anna.berg@gmail.com", "carl_100%@gmail.com", "erik@gmail.com",
+            ]
+
+    def test_combines_with_filter_and_pagination(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            seed(repo)
+
+            first = repo.get_page("email_asc", "kost", limit=1, search="gmail")
+            second = repo.get_page("email_asc", "kost", first.next_cursor, limit=1, search="gmail")
+
+            assert emails(first) == ["anna.berg@gmail.com"]
+            assert emails(second) == ["carl_100%@gmail.com"]
+            assert second.next_cursor is None
+
+    def test_writes_keep_the_index_current(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            seed(repo)
+            anna = repo.find_by_email("anna.berg@gmail.com")
+
+            repo.update(anna.id, "anna@newmail.org", "Anna Holm", None)
+            assert emails(repo.get_page(search="holm")) == ["anna@newmail.org"]
+            assert emails(repo.get_page(search="berg")) == []
+            assert emails(repo.get_page(search="@newmail")) == ["anna@newmail.org"]
+
+            anna_id = anna.id
+            dora_id = repo.find_by_email("dora@firma.se").id
+            repo.delete(anna_id)
+            repo.delete_bulk([dora_id])
+            remaining = {t.subscriber_id for t in SubscriberTrigram.query.all()}
+            assert anna_id not in remaining and dora_id not in remaining
+
+    def test_prefix_search_uses_indexes(self, app):
+        with app.app_context():
+            query = Subscriber.query.filter(prefix_range(Subscriber.name_lower, "an"))
+            plan = explain_query_plan(query)
+            assert plan_uses_index(plan, "ix_subscribers_name_lower"), plan
+
+            query = Subscriber.query.filter(search_predicate("@gma"))
+            plan = explain_query_plan(query)
+            assert plan_uses_index(plan, "ix_subscribers_email_domain"), plan
@@ -0,0 +1,126 @@
+import pytest
+from sqlalchemy import event
+
+from app.data.models import db, Subscriber, SubscriberCounter
+from app.data.repositories.subscriber_repository import DuplicateEmailError, SubscriberRepository
+
+
+def counters_match_rows(repo: SubscriberRepository) -> bool:
+    stats = repo.stats()
+    actual = repo.aggregate_stats()
+    return (stats.total, stats.newsletters, stats.no_newsletters) == (
+        actual.total, actual.newsletters, actual.no_newsletters,
+    )
+
+
+class TestSubscriberCounters:
+    @pytest.mark.parametrize("write", ["delete", "delete_bulk", "update_newsletters_bulk"])
+    def test_counter_row_is_locked_before_rows_are_read(self, app, clean_db, write):
+        with app.app_context():
+            repo = SubscriberRepository()
+            subscriber_id = repo.save("lockfirst@example.com", "Lock", {'kost': True}).id
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(" ".join(statement.split()).lower())
+
+            event.listen(db.engine, "before_cursor_execute", record)
+            try:
+                if write == "delete":
+                    repo.delete(subscriber_id)
+                elif write == "delete_bulk":
+                    repo.delete_bulk([subscriber_id])
+                else:
+                    repo.update_newsletters_bulk([subscriber_id], {'kost': False})
+            finally:
+                event.remove(db.engine, "before_cursor_execute", record)
+
+            # A concurrent writer of the same rows waits on that lock, then reads what is left
+            first_read = next(i for i, sql in enumerate(statements) if "from subscribers" in sql)
+            assert statements[0].startswith("update subscriber_counters")
+            assert first_read > 0
+            assert counters_match_rows(repo)
+
+    def test_every_write_path_keeps_counters_exact(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            a = repo.save("count1@example.com", "A", {'kost': True})
+            b = repo.save("count2@example.com", "B", {})
+            repo.save_many([
+                ("count3@example.com", "C", {'kost': True, 'jaine': True}),
+                ("count4@example.com", "D", {'mindset': True}),
+            ])
+            assert counters_match_rows(repo)
+
+            repo.update(b.id, b.email, "B2", {'mindset': True})
+            assert counters_match_rows(repo)
+
+            ids = [s.id for s in repo.get_all()]
+            repo.update_newsletters_bulk(ids, {'kost': False, 'kunskap': True})
+            assert counters_match_rows(repo)
+
+            repo.delete(a.id)
+            repo.delete_bulk([i for i in ids if i != a.id][:2] + [99999])
+            assert counters_match_rows(repo)
+            assert repo.stats().total == 1
+
+    def test_failed_delete_rolls_back(self, app, clean_db, monkeypatch):
+        with app.app_context():
+            repo = SubscriberRepository()
+            subscriber_id = repo.save("faildelete@example.com", "Fail", {'kost': True}).id
+
+            def broken_commit():
+                raise RuntimeError("connection lost")
+
+            monkeypatch.setattr(db.session, "commit", broken_commit)
+            with pytest.raises(RuntimeError):
+                repo.delete(subscriber_id)
+            monkeypatch.undo()
+
+            assert not db.session().in_transaction()
+            assert repo.find_by_id(subscriber_id) is not None
+            assert repo.stats().newsletters['kost'] == 1
+            assert counters_match_rows(repo)
+
+    def test_failed_insert_leaves_counters_alone(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            repo.save("countdup@example.com", "First", {'kost': True})
+            with pytest.raises(DuplicateEmailError):
+                repo.save("countdup@example.com", "Second", {'kost': True})
+
+            assert repo.stats().newsletters['kost'] == 1
+
+    def test_stats_reads_counters_not_rows(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            repo.save("countread@example.com", "Read", {})
+            db.session.get(SubscriberCounter, "total").value = 42
+            db.session.commit()
+
+            assert repo.stats().total == 42
+
+    def test_reconcile_reports_and_fixes_drift(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            repo.save("drift@example.com", "Drift", {'kost': True})
+            # Bypasses the repository, so the counters do not see it
+            db.session.query(Subscriber).delete()
+            db.session.commit()
+
+            drift = repo.reconcile_counters()
+
+            assert drift == {"total": (1, 0), "newsletter:kost": (1, 0)}
+            assert repo.reconcile_counters() == {}
+            assert repo.stats().total == 0
+
+    def test_reconcile_command(self, app, clean_db):
+        with app.app_context():
+            db.session.delete(db.session.get(SubscriberCounter, "total"))
+            db.session.commit()
+
+        result = app.test_cli_runner().invoke(args=["subscribers", "reconcile-counters"])
+
+        assert result.exit_code == 0
+        assert "total: stored None, actual 0" in result.output
+        assert "1 drifted" in result.output
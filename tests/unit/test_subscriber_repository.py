@@ -207,3 +207,160 @@ class TestSubscriberRepository:
             assert s1_updated.nl_kost is True
             assert s2_updated.nl_kost is True
             assert s3_unchanged.nl_kost is False
+
+    @pytest.mark.parametrize("sort_by", [
+        "date_asc", "date_desc", "name_asc", "name_desc", "email_asc", "email_desc",
+    ])
+    def test_get_page_walks_all_rows_in_get_all_order(self, app, clean_db, sort_by):
+        with app.app_context():
+            repo = SubscriberRepository()
+            for i in range(7):
+                # Duplicate names exercise the id tie-breaker
+                repo.save(f"page{i}@example.com", f"Name {i % 3}", {'kost': i % 2 == 0})
+
+            expected = [s.id for s in repo.get_all(sort_by=sort_by)]
+            seen = []
+            cursor = None
+            while True:
+                page = repo.get_page(sort_by=sort_by, cursor=cursor, limit=3)
+                seen.extend(s.id for s in page.items)
+                if not page.has_more:
+                    break
+                cursor = page.next_cursor
+
+            assert seen == expected
+
+    @pytest.mark.parametrize("limit", [1, 2])
+    @pytest.mark.parametrize("sort_by", ["date_asc", "date_desc"])
+    def test_get_page_walks_past_null_dates(self, app, clean_db, sort_by, limit):
+        from app.data.models import db
+        with app.app_context():
+            repo = SubscriberRepository()
+            saved = [repo.save(f"nulldate{i}@example.com", f"Null {i}", {}) for i in range(6)]
+            null_ids = [saved[i].id for i in (0, 2, 3)]
+            db.session.execute(
+                Subscriber.__table__.update().where(Subscriber.id.in_(null_ids)).values(subscribed_at=None)
+            )
+            db.session.commit()
+
+            expected = [s.id for s in repo.get_all(sort_by=sort_by)]
+            seen = []
+            cursor = None
+            # Bounded: a cursor that fails to decode restarts from page 1
+            for _ in range(len(saved)):
+                page = repo.get_page(sort_by=sort_by, cursor=cursor, limit=limit)
+                seen.extend(s.id for s in page.items)
+                if not page.has_more:
+                    break
+                cursor = page.next_cursor
+
+            assert seen == expected
+            assert sorted(seen) == sorted(s.id for s in saved)
+
+    def test_get_page_respects_newsletter_filter(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            for i in range(5):
+                repo.save(f"filter{i}@example.com", f"Filter {i}", {'kost': i < 3})
+
+            first = repo.get_page(newsletter_filter='kost', limit=2)
+            second = repo.get_page(newsletter_filter='kost', cursor=first.next_cursor, limit=2)
+
+            assert len(first.items) == 2
+            assert first.has_more is True
+            assert len(second.items) == 1
+            assert second.has_more is False
+            assert second.next_cursor is None
+            assert all(s.nl_kost for s in first.items + second.items)
+            assert repo.count(newsletter_filter='kost') == 3
+
+    def test_get_page_ignores_invalid_cursor(self, app, clean_db):
+        with app.app_context():
+            repo = SubscriberRepository()
+            repo.save("cursor@example.com", "Cursor", {})
+
+            page = repo.get_page(cursor="not-a-cursor")
+
+            assert [s.email for s in page.items] == ["cursor@example.com"]
+
+    def test_update_newsletters_bulk_sets_several_flags_across_chunks(self, app, clean_db, monkeypatch):
+        from app.data.repositories import subscriber_repository
+        monkeypatch.setattr(subscriber_repository, "IN_CLAUSE_CHUNK_SIZE", 2)
+        with app.app_context():
+            repo = SubscriberRepository()
+            saved = [repo.save(f"chunk{i}@example.com", f"Chunk {i}", {'mindset': True}) for i in range(5)]
+            ids = [s.id for s in saved[:4]] + [saved[0].id, 99999]
+
+            updated = repo.update_newsletters_bulk(ids, {'kost': True, 'mindset': False, 'jaine': None})
+
+            assert updated == 4
+            for s in saved[:4]:
+                refreshed = repo.find_by_id(s.id)
+                assert refreshed.nl_kost is True
+                assert refreshed.nl_mindset is False
+            untouched = repo.find_by_id(saved[4].id)
+            assert untouched.nl_kost is False
+            assert untouched.nl_mindset is True
+
+    def test_delete_bulk_removes_only_given_ids(self, app, clean_db, monkeypatch):
+        from app.data.repositories import subscriber_repository
+        monkeypatch.setattr(subscriber_repository, "IN_CLAUSE_CHUNK_SIZE", 2)
+        with app.app_context():
+            repo = SubscriberRepository()
+            saved = [repo.save(f"bulkdel{i}@example.com", f"Bulk Del {i}", {}) for i in range(4)]
+
+            deleted = repo.delete_bulk([saved[0].id, saved[1].id, saved[2].id, 99999])
+
+            assert deleted == 3
+            assert [s.id for s in repo.get_all()] == [saved[3].id]
+            assert repo.delete_bulk([]) == 0
+
+    def test_save_duplicate_raises_and_keeps_session_usable(self, app, clean_db):
+        from app.data.repositories.subscriber_repository import DuplicateEmailError
+        with app.app_context():
+            repo = SubscriberRepository()
+            repo.save("dupe@example.com", "First", {})
+
+            with pytest.raises(DuplicateEmailError):
+                repo.save("dupe@example.com", "Second", {})
+
+            assert repo.find_by_email("dupe@example.com").name == "First"
+
+    def test_save_many_duplicate_does_not_blame_the_first_row(self, app, clean_db):
+        from app.data.repositories.subscriber_repository import DuplicateEmailError
+        with app.app_context():
+            repo = SubscriberRepository()
+            repo.save("taken@example.com", "Taken", {})
+
+            with pytest.raises(DuplicateEmailError) as excinfo:
+                repo.save_many([("fresh@example.com", "Fresh", {}), ("taken@example.com", "Again", {})])
+
+            assert excinfo.value.email is None
+            assert str(excinfo.value) == "Email already subscribed"
+            assert repo.find_by_email("fresh@example.com") is None
+
+    def test_stats_counts_newsletters_and_recent_signups(self, app, clean_db):
+        from datetime import datetime, timedelta
+        from app.data.models import db
+        with app.app_context():
+            repo = SubscriberRepository()
+            repo.save("stats1@example.com", "One", {'kost': True, 'mindset': True})
+            repo.save("stats2@example.com", "Two", {'kost': True})
+            old = repo.save("stats3@example.com", "Three", {})
+            old.subscribed_at = datetime.utcnow() - timedelta(days=3)
+            db.session.commit()
+
+            stats = repo.stats()
+
+            assert stats.total == 3
+            assert stats.newsletters == {'kost': 2, 'mindset': 1, 'kunskap': 0, 'veckans_pass': 0, 'jaine': 0}
+            assert stats.no_newsletters == 1
+            assert stats.last_24h == 2
+            assert stats.last_7d == 3
+
+    def test_stats_on_empty_table(self, app, clean_db):
+        with app.app_context():
+            stats = SubscriberRepository().stats()
+            assert stats.total == 0
+            assert stats.no_newsletters == 0
+            assert stats.newsletters['kost'] == 0
@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+from app.business.services.subscription_queue import EXTENSION_KEY, QueueFull, SubscriptionQueue
+from app.business.services.subscription_service import SubscriptionService
+from app.data.repositories.subscriber_repository import DuplicateEmailError, SubscriberRepository
+
+
+@pytest.fixture
+def subscription_queue(app, clean_db):
+    subscription_queue = SubscriptionQueue(app, batch_size=10, flush_interval_ms=20)
+    subscription_queue.start()
+    yield subscription_queue
+    subscription_queue.stop()
+
+
+class TestSubscriptionQueue:
+    def test_batch_reports_duplicates(self, app, subscription_queue):
+        with app.app_context():
+            SubscriberRepository().save("existing@example.com", "Existing", {})
+
+        futures = [
+            subscription_queue.submit("q1@example.com", "Q1", {'kost': True}),
+            subscription_queue.submit("q1@example.com", "Q1 again", {}),
+            subscription_queue.submit("existing@example.com", "Existing", {}),
+            subscription_queue.submit("q2@example.com", "Q2", {}),
+        ]
+        results = [f.result(timeout=5) for f in futures]
+
+        assert [r.success for r in results] == [True, False, False, True]
+        assert results[1].error == "Email already subscribed"
+        assert results[2].error == "Email already subscribed"
+        assert results[0].subscriber.email == "q1@example.com"
+        assert results[0].subscriber.get_newsletters() == ['kost']
+        with app.app_context():
+            assert SubscriberRepository().count() == 3
+
+        stats = subscription_queue.stats()
+        assert stats.submitted == 4
+        assert stats.committed == 2
+        assert stats.duplicates == 2
+        assert stats.depth == 0
+
+    def test_stop_drains_pending_work(self, app, clean_db):
+        subscription_queue = SubscriptionQueue(app, batch_size=3, flush_interval_ms=1000)
+        subscription_queue.start()
+        futures = [subscription_queue.submit(f"drain{i}@example.com", "Drain", {}) for i in range(7)]
+
+        subscription_queue.stop()
+
+        assert all(f.done() and f.result().success for f in futures)
+        with pytest.raises(QueueFull):
+            subscription_queue.submit("late@example.com", "Late", {})
+        with app.app_context():
+            assert SubscriberRepository().count() == 7
+
+    def test_service_routes_signups_through_queue(self, app, subscription_queue, monkeypatch):
+        monkeypatch.setitem(app.extensions, EXTENSION_KEY, subscription_queue)
+        with app.app_context():
+            service = SubscriptionService()
+
+            first = service.subscribe("Queued@Example.com", "Queued", {})
+            second = service.subscribe("queued@example.com", "Again", {})
+
+        assert first.success is True
+        assert first.subscriber.email == "queued@example.com"
+        assert second.error == "Email already subscribed"
+        assert subscription_queue.stats().committed == 1
+
+    def test_service_reports_a_slow_commit_as_pending(self, app, clean_db, monkeypatch):
+        subscription_queue = SubscriptionQueue(app, batch_size=10, flush_interval_ms=300)
+        subscription_queue.start()
+        monkeypatch.setitem(app.extensions, EXTENSION_KEY, subscription_queue)
+        monkeypatch.setitem(app.config, "SUBSCRIBE_RESULT_TIMEOUT", 0.01)
+        with app.app_context():
+            result = SubscriptionService().subscribe("Slow@Example.com", "Slow", {"kost": True})
+        subscription_queue.stop()
+
+        assert result.success and result.pending
+        assert result.subscriber.email == "slow@example.com"
+        assert result.subscriber.get_newsletters() == ["kost"]
+        with app.app_context():
+            assert SubscriberRepository().exists("slow@example.com")
+
+    def test_cancelled_signups_are_dropped_without_failing_the_batch(self, app, clean_db):
+        subscription_queue = SubscriptionQueue(app, batch_size=10, flush_interval_ms=300)
+        subscription_queue.start()
+        cancelled = subscription_queue.submit("gone@example.com", "Gone", {})
+        kept = subscription_queue.submit("kept@example.com", "Kept", {})
+        assert cancelled.cancel()
+
+        subscription_queue.stop()
+
+        assert kept.result().success
+        assert subscription_queue.stats().failed == 0
+        with app.app_context():
+            assert not SubscriberRepository().exists("gone@example.com")
+            assert SubscriberRepository().exists("kept@example.com")
+
+    def test_stop_with_a_full_queue_does_not_deadlock(self, app, clean_db, monkeypatch):
+        release = threading.Event()
+        existing_emails = SubscriberRepository.existing_emails
+
+        def slow_existing_emails(self, emails):
+            release.wait(5)
+            return existing_emails(self, emails)
+
+        monkeypatch.setattr(SubscriberRepository, "existing_emails", slow_existing_emails)
+        subscription_queue = SubscriptionQueue(app, batch_size=1, flush_interval_ms=1, max_depth=2)
+        subscription_queue.start()
+        futures = [subscription_queue.submit("busy@example.com", "Busy", {})]
+        while subscription_queue.stats().depth:
+            pass
+        futures += [subscription_queue.submit(f"full{i}@example.com", "Full", {}) for i in range(2)]
+
+        stopper = threading.Thread(target=subscription_queue.stop, daemon=True)
+        stopper.start()
+        release.set()
+        stopper.join(5)
+
+        assert not stopper.is_alive()
+        assert all(f.result(timeout=1).success for f in futures)
+
+    def test_rows_committed_before_a_failed_retry_stay_successful(self, app, clean_db, monkeypatch):
+        save = SubscriberRepository.save
+
+        def save_many(self, rows):
+            raise DuplicateEmailError()
+
+        def flaky_save(self, email, name, newsletters=None):
+            if email == "broken@example.com":
+                raise RuntimeError("connection lost")
+            return save(self, email, name, newsletters)
+
+        monkeypatch.setattr(SubscriberRepository, "save_many", save_many)
+        monkeypatch.setattr(SubscriberRepository, "save", flaky_save)
+        subscription_queue = SubscriptionQueue(app, batch_size=10, flush_interval_ms=300)
+        subscription_queue.start()
+        stored = subscription_queue.submit("stored@example.com", "Stored", {})
+        broken = subscription_queue.submit("broken@example.com", "Broken", {})
+        subscription_queue.stop()
+
+        assert stored.result().success
+        with pytest.raises(RuntimeError):
+            broken.result()
+        assert subscription_queue.stats().failed == 1
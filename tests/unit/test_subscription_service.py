@@ -65,6 +65,29 @@ class TestSubscriptionService:
             assert result2.success is False
             assert result2.error == "Email already subscribed"
 
+    def test_subscribe_is_a_single_insert(self, app, clean_db):
+        from sqlalchemy import event
+        from app.data.models import db
+        with app.app_context():
+            service = SubscriptionService()
+            statements = []
+
+            def record(conn, cursor, statement, *args):
+                statements.append(statement.split()[0].upper())
+
+            event.listen(db.engine, "before_cursor_execute", record)
+            try:
+                result = service.subscribe("single@example.com", "Single", {'kost': True})
+                duplicate = service.subscribe("single@example.com", "Again", {})
+            finally:
+                event.remove(db.engine, "before_cursor_execute", record)
+
+            assert result.success is True
+            assert duplicate.error == "Email already subscribed"
+            # The counters UPDATE and search trigram INSERT share the row's
+            # transaction; a duplicate fails on the first INSERT.
+            assert statements == ["INSERT", "UPDATE", "INSERT", "INSERT"]
+
     def test_subscribe_without_newsletters(self, app, clean_db):
         with app.app_context():
             service = SubscriptionService()